@@ -0,0 +1,91 @@
+"""
+Measure recall@k of binary-quantized coarse search with exact cosine rerank, as done by
+`JournalSearchClient` with `binary_rerank`, against an exact cosine search. Runs in-process, without a
+database: candidates are the `k * multiplier` nearest by Hamming distance, as an exact scan of the bit
+index would return.
+
+Vectors are synthetic & clustered, so nearest neighbours are meaningful.
+
+Usage: python benchmarks/bench_binary_rerank.py [--rows 5000] [--queries 50] [--multipliers 1 4 8 16]
+"""
+
+import argparse
+import heapq
+import math
+import random
+import time
+
+from logseq_retriever.models.journal_pgvector import JournalDocumentBase
+
+
+def make_vectors(
+    rows: int, centers: list[list[float]], rng: random.Random
+) -> list[list[float]]:
+    vectors = []
+    for _ in range(rows):
+        center = rng.choice(centers)
+        vector = [c + rng.gauss(0, 0.5) for c in center]
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        vectors.append([x / norm for x in vector])
+    return vectors
+
+
+def to_bits(vector: list[float]) -> int:
+    return int(JournalDocumentBase.binary_quantize(vector), 2)
+
+
+def dot(a: list[float], b: list[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--clusters", type=int, default=100)
+    parser.add_argument("--dimensions", type=int, default=1024)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--multipliers", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    centers = [
+        [rng.gauss(0, 1) for _ in range(args.dimensions)] for _ in range(args.clusters)
+    ]
+    vectors = make_vectors(args.rows, centers, rng)
+    queries = make_vectors(args.queries, centers, rng)
+    bits = [to_bits(v) for v in vectors]
+    # vectors are normalized, so the nearest by cosine distance have the largest dot product
+    truth = [
+        set(heapq.nlargest(args.k, range(args.rows), key=lambda i: dot(q, vectors[i])))
+        for q in queries
+    ]
+
+    print(
+        f"{args.dimensions}-dimension vectors: {args.dimensions * 4} bytes as `vector`, "
+        f"{args.dimensions // 8} bytes as `bit`"
+    )
+    print(f"{'multiplier':>10} {'candidates':>10} {f'recall@{args.k}':>10} {'ms':>8}")
+    for multiplier in args.multipliers:
+        recall = 0.0
+        started = time.perf_counter()
+        for query, expected in zip(queries, truth):
+            query_bits = to_bits(query)
+            candidates = heapq.nsmallest(
+                args.k * multiplier,
+                range(args.rows),
+                key=lambda i: (bits[i] ^ query_bits).bit_count(),
+            )
+            reranked = heapq.nlargest(
+                args.k, candidates, key=lambda i: dot(query, vectors[i])
+            )
+            recall += len(expected.intersection(reranked)) / args.k
+        seconds = time.perf_counter() - started
+        print(
+            f"{multiplier:>10} {args.k * multiplier:>10} "
+            f"{recall / len(queries):>10.3f} {seconds / len(queries) * 1e3:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compare the memory held by `Document`s & `CompactDocument`s loaded from the same journals.
+
+Usage: python benchmarks/bench_compact_document.py [--days 365] [--sections 30]
+"""
+
+import argparse
+import gc
+import tempfile
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+from logseq_retriever.loaders.journal_filesystem_loader import (
+    LogseqJournalFilesystemLoader,
+)
+from logseq_retriever.loaders.journal_loader_input import LogseqJournalLoaderInput
+
+
+def write_journals(path: Path, days: int, sections: int) -> LogseqJournalLoaderInput:
+    start = date(2025, 1, 1)
+    for day in range(days):
+        journal_date = start + timedelta(days=day)
+        (path / journal_date.strftime("%Y_%m_%d.md")).write_text(
+            "\n".join(
+                f"- Section {i} about the #cookout. Brought the grill and some snacks"
+                for i in range(sections)
+            )
+        )
+    end = start + timedelta(days=days - 1)
+    return LogseqJournalLoaderInput(
+        journal_start_date=start.isoformat(), journal_end_date=end.isoformat()
+    )
+
+
+def measure(loader: LogseqJournalFilesystemLoader, input: LogseqJournalLoaderInput):
+    """Return the documents loaded, and the bytes still allocated to hold them."""
+    gc.collect()
+    tracemalloc.start()
+    documents = loader.load(input)
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return documents, held
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--sections", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input = write_journals(Path(temp_dir), args.days, args.sections)
+        results = {}
+        for compact in (True, False):
+            loader = LogseqJournalFilesystemLoader(temp_dir, compact_documents=compact)
+            documents, held = measure(loader, input)
+            name = "CompactDocument" if compact else "Document"
+            results[name] = held
+            print(
+                f"{name:>15}: {held / 2**20:8.2f} MiB for {len(documents)} documents, "
+                f"{held / len(documents):6.0f} B each"
+            )
+            del documents
+    print(
+        f"{'reduction':>15}: {1 - results['CompactDocument'] / results['Document']:8.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
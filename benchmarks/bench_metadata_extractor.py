@@ -0,0 +1,80 @@
+"""
+Compare the single-pass `extract_chunk_metadata` with the previous chunk metadata extraction, which
+split the chunk, scanned every word for tags, then ran a separate regex pass for anchor IDs.
+
+Both are timed in alternating rounds, so a noisy machine slows them alike; the median speedup of the
+rounds is reported, with its range.
+
+Usage: python benchmarks/bench_metadata_extractor.py [--chunk-kb 64] [--rounds 15]
+"""
+
+import argparse
+import re
+import statistics
+import timeit
+from functools import partial
+
+from logseq_retriever.parsers.metadata_extractor import extract_chunk_metadata
+
+
+def legacy_extract_chunk_metadata(content: str) -> dict:
+    split_content = content.split()
+    references = []
+    for word in split_content:
+        if word.startswith("#"):
+            ref = word.lstrip("#").rstrip("#").replace("\\", "")
+            for char in "!?,:'\"":
+                ref = ref.split(char)[0]
+            if ref:
+                references.append(ref)
+    return {
+        "chunk_len": len(content),
+        "word_count": len(split_content),
+        "references": references,
+        "anchor_ids": re.findall(r"id:: ([a-f0-9-]{36})", content),
+    }
+
+
+def make_chunk(size: int) -> str:
+    block = (
+        "- Went to the #cookout with #[[John Smith]], see [[Jul 7th, 2025]]. "
+        "Brought the grill and some snacks, it was a lot of fun!\n"
+        "  id:: 6884f1c2-1234-4abc-9def-0123456789ab\n"
+        "\t- Follow up on ((6884f1c2-5678-4abc-9def-0123456789ab)) #todo\n"
+    )
+    return (block * (size // len(block) + 1))[:size]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunk-kb", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    chunk = make_chunk(args.chunk_kb * 1024)
+    timers = {
+        "legacy": timeit.Timer(partial(legacy_extract_chunk_metadata, chunk)),
+        "single-pass": timeit.Timer(partial(extract_chunk_metadata, chunk)),
+    }
+    times: dict[str, list[float]] = {name: [] for name in timers}
+    for _ in range(args.rounds):
+        for name, timer in timers.items():
+            best = min(timer.repeat(repeat=args.repeat, number=args.number))
+            times[name].append(best / args.number)
+    for name, samples in times.items():
+        print(
+            f"{name:>12}: {min(samples) * 1e3:8.3f} ms per {args.chunk_kb} KiB chunk (best)"
+        )
+    speedups = sorted(
+        legacy / single for legacy, single in zip(times["legacy"], times["single-pass"])
+    )
+    print(
+        f"{'speedup':>12}: {statistics.median(speedups):8.2f}x median, "
+        f"{speedups[0]:.2f}x - {speedups[-1]:.2f}x over {args.rounds} rounds"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compare validated & trusted (`validate_metadata=False`) metadata construction, when parsing journals in
+the loader, and when creating chunk documents in the corpus manager.
+
+Usage: python benchmarks/bench_metadata_validation.py [--sections 2000] [--repeat 5]
+"""
+
+import argparse
+import timeit
+from functools import partial
+from unittest.mock import Mock
+
+from pgvector_template.core.embedder import BaseEmbeddingProvider
+
+from logseq_retriever.loaders.journal_filesystem_loader import (
+    LogseqJournalFilesystemLoader,
+)
+from logseq_retriever.uploaders.pgvector.journal_corpus_manager import (
+    JournalCorpusManager,
+    JournalCorpusManagerConfig,
+)
+
+
+def make_journal(sections: int) -> str:
+    return "\n".join(
+        f"- Section {i} about the #cookout with [[John Smith]]. Brought snacks!\n"
+        f"\t- Follow up #todo{i % 7}"
+        for i in range(sections)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sections", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=5)
+    args = parser.parse_args()
+
+    journal = make_journal(args.sections)
+    embedding_provider = Mock(spec=BaseEmbeddingProvider)
+    embedding_provider.get_embedding_config.return_value = {"model": "bench"}
+
+    for validate_metadata in (True, False):
+        loader_parse = partial(
+            LogseqJournalFilesystemLoader.parse_journal_markdown_file,
+            journal,
+            "2025_07_07.md",
+            True,
+            validate_metadata,
+        )
+        manager = JournalCorpusManager(
+            Mock(),
+            JournalCorpusManagerConfig(
+                embedding_provider=embedding_provider,
+                validate_metadata=validate_metadata,
+            ),
+        )
+        chunks = manager._split_corpus(journal)
+        manager_create = partial(
+            manager._create_documents,
+            "2025-07-07",
+            chunks,
+            [[]] * len(chunks),
+            {"date_str": "2025-07-07"},
+            None,
+        )
+
+        label = "validated" if validate_metadata else "trusted"
+        for name, func in (("loader", loader_parse), ("manager", manager_create)):
+            timer = timeit.Timer(func)
+            best = min(timer.repeat(repeat=args.repeat, number=args.number))
+            per_section = best / args.number / args.sections
+            print(f"{name:>8} {label:>9}: {per_section * 1e6:8.2f} us per section")
+
+
+if __name__ == "__main__":
+    main()
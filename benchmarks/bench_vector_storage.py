@@ -0,0 +1,191 @@
+"""
+Compare table size, HNSW index size, query latency & recall of embedding storage options: `vector` &
+`halfvec` columns, and int8 embeddings stored in `halfvec`, at several dimensions. Needs a Postgres
+database with pgvector; tables are created in a scratch schema, which is dropped afterwards.
+
+Vectors are synthetic & clustered, so nearest neighbours are meaningful. Recall@k is measured against an
+exact float32 search at the same dimensions.
+
+Usage: python benchmarks/bench_vector_storage.py --database-url postgresql+psycopg2://... \
+    [--rows 20000] [--queries 50] [--dimensions 1024 512 256]
+"""
+
+import argparse
+import math
+import os
+import random
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+
+from logseq_retriever.models.journal_pgvector import journal_document_cls
+
+SCHEMA = "bench_vector_storage"
+STORAGES = ("vector", "halfvec", "int8")
+
+
+def make_vectors(
+    rows: int, centers: list[list[float]], rng: random.Random
+) -> list[list[float]]:
+    vectors = []
+    for _ in range(rows):
+        center = rng.choice(centers)
+        vectors.append(normalize([c + rng.gauss(0, 0.5) for c in center]))
+    return vectors
+
+
+def normalize(vector: list[float]) -> list[float]:
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+def quantize_int8(vector: list[float]) -> list[float]:
+    """Scalar quantization, as done by embedding APIs returning int8 embeddings."""
+    scale = 127 / (max(abs(x) for x in vector) or 1.0)
+    return [float(round(x * scale)) for x in vector]
+
+
+def literal(vector: list[float]) -> str:
+    return "[" + ",".join(f"{x:.7g}" for x in vector) + "]"
+
+
+def load_table(
+    conn: Connection,
+    table: str,
+    column_type: str,
+    opclass: str,
+    vectors: list[list[float]],
+) -> float:
+    """Create & fill a table, then build its HNSW index. Return the index build time."""
+    conn.execute(
+        text(
+            f"CREATE TABLE {SCHEMA}.{table} (id int PRIMARY KEY, embedding {column_type})"
+        )
+    )
+    conn.execute(
+        text(
+            f"INSERT INTO {SCHEMA}.{table} VALUES (:id, CAST(:embedding AS {column_type}))"
+        ),
+        [{"id": i, "embedding": literal(v)} for i, v in enumerate(vectors)],
+    )
+    started = time.perf_counter()
+    conn.execute(
+        text(f"CREATE INDEX ON {SCHEMA}.{table} USING hnsw (embedding {opclass})")
+    )
+    conn.execute(text(f"ANALYZE {SCHEMA}.{table}"))
+    return time.perf_counter() - started
+
+
+def search(
+    conn: Connection, table: str, column_type: str, query: list[float], k: int
+) -> tuple[list[int], float]:
+    started = time.perf_counter()
+    ids = conn.execute(
+        text(
+            f"SELECT id FROM {SCHEMA}.{table} "
+            f"ORDER BY embedding <=> CAST(:query AS {column_type}) LIMIT :k"
+        ),
+        {"query": literal(query), "k": k},
+    ).scalars()
+    return list(ids), time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"))
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[1024, 512, 256])
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or BENCH_DATABASE_URL is required")
+
+    engine = create_engine(args.database_url)
+    with engine.connect() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        conn.commit()
+        try:
+            print(
+                f"{'storage':>8} {'dims':>5} {'table MB':>9} {'index MB':>9} "
+                f"{'build s':>8} {'query ms':>9} {f'recall@{args.k}':>10}"
+            )
+            for dimensions in args.dimensions:
+                rng = random.Random(dimensions)
+                centers = [
+                    [rng.gauss(0, 1) for _ in range(dimensions)]
+                    for _ in range(args.clusters)
+                ]
+                vectors = make_vectors(args.rows, centers, rng)
+                queries = make_vectors(args.queries, centers, rng)
+
+                # exact float32 neighbours, as ground truth
+                conn.execute(
+                    text(
+                        f"CREATE TABLE {SCHEMA}.exact (id int PRIMARY KEY, embedding vector({dimensions}))"
+                    )
+                )
+                conn.execute(
+                    text(
+                        f"INSERT INTO {SCHEMA}.exact VALUES (:id, CAST(:embedding AS vector))"
+                    ),
+                    [{"id": i, "embedding": literal(v)} for i, v in enumerate(vectors)],
+                )
+                truth = [
+                    set(search(conn, "exact", "vector", query, args.k)[0])
+                    for query in queries
+                ]
+                conn.execute(text(f"DROP TABLE {SCHEMA}.exact"))
+
+                for storage in STORAGES:
+                    document_cls = journal_document_cls(
+                        dimensions, "vector" if storage == "vector" else "halfvec"
+                    )
+                    column_type = str(
+                        document_cls.__table__.c.embedding.type.compile(engine.dialect)
+                    ).lower()
+                    opclass = f"{document_cls.vector_storage}_cosine_ops"
+                    table = f"{storage}{dimensions}"
+                    stored = (
+                        [quantize_int8(v) for v in vectors]
+                        if storage == "int8"
+                        else vectors
+                    )
+                    build_seconds = load_table(
+                        conn, table, column_type, opclass, stored
+                    )
+                    table_bytes, index_bytes = conn.execute(
+                        text(
+                            f"SELECT pg_table_size('{SCHEMA}.{table}'), "
+                            f"pg_indexes_size('{SCHEMA}.{table}')"
+                        )
+                    ).one()
+
+                    recall = latency = 0.0
+                    for query, expected in zip(queries, truth):
+                        q = quantize_int8(query) if storage == "int8" else query
+                        ids, seconds = search(
+                            conn, table, column_type.split("(")[0], q, args.k
+                        )
+                        latency += seconds
+                        recall += len(expected.intersection(ids)) / args.k
+                    conn.execute(text(f"DROP TABLE {SCHEMA}.{table}"))
+                    conn.commit()
+
+                    print(
+                        f"{storage:>8} {dimensions:>5} {table_bytes / 2**20:>9.1f} "
+                        f"{index_bytes / 2**20:>9.1f} {build_seconds:>8.1f} "
+                        f"{latency / len(queries) * 1e3:>9.2f} {recall / len(queries):>10.3f}"
+                    )
+        finally:
+            conn.rollback()
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            conn.commit()
+
+
+if __name__ == "__main__":
+    main()
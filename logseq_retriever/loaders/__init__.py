@@ -1,3 +1,7 @@
+from logseq_retriever.loaders.journal_document_cache import (
+    JournalDocumentCache,
+    JournalDocumentCacheStats,
+)
 from logseq_retriever.loaders.journal_document_metadata import (
     LogseqJournalDocumentMetadata,
 )
@@ -6,8 +10,12 @@ from logseq_retriever.loaders.journal_filesystem_loader import (
 )
 from logseq_retriever.loaders.journal_loader_input import LogseqJournalLoaderInput
 from logseq_retriever.loaders.journal_loader import LogseqJournalLoader
+from logseq_retriever.loaders.journal_persistent_cache import JournalPersistentCache
 
 __all__ = [
+    "JournalDocumentCache",
+    "JournalDocumentCacheStats",
+    "JournalPersistentCache",
     "LogseqJournalDocumentMetadata",
     "LogseqJournalFilesystemLoader",
     "LogseqJournalLoaderInput",
@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+
+from logseq_retriever.models.document import Document
+
+
+@dataclass(frozen=True)
+class JournalDocumentCacheStats:
+    """Snapshot of a `JournalDocumentCache`'s counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    """Number of journal files currently cached"""
+    max_size: int
+
+
+class JournalDocumentCache:
+    """
+    Size-bounded LRU cache of parsed journal `Document`s, keyed by file path & splitting mode.
+    Each entry is stamped with the file's `(mtime_ns, size)` when it was parsed; a lookup with a
+    different stamp is a miss, so only changed files are re-parsed.
+    Thread-safe, since files may be loaded concurrently from an executor.
+    """
+
+    def __init__(self, max_size: int):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self._entries: OrderedDict[
+            tuple[str, bool], tuple[tuple[int, int], list[Document]]
+        ] = OrderedDict()
+        self._lock = Lock()
+        self._hits = self._misses = self._evictions = 0
+
+    def get(
+        self, path: str, stamp: tuple[int, int], enable_splitting: bool
+    ) -> list[Document] | None:
+        """Return a copy of the cached `Document`s, or `None` if absent or stale."""
+        key = (path, enable_splitting)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != stamp:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return _copy_documents(entry[1])
+
+    def put(
+        self,
+        path: str,
+        stamp: tuple[int, int],
+        enable_splitting: bool,
+        documents: list[Document],
+    ) -> None:
+        """Cache a copy of `documents`, replacing any stale entry, and evict the least recently used."""
+        key = (path, enable_splitting)
+        documents = _copy_documents(documents)
+        with self._lock:
+            self._entries[key] = (stamp, documents)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> JournalDocumentCacheStats:
+        with self._lock:
+            return JournalDocumentCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                max_size=self.max_size,
+            )
+
+
+def _copy_documents(documents: list[Document]) -> list[Document]:
+    """Copy `Document`s, so callers mutating them cannot corrupt the cache."""
+    return [Document(doc.page_content, dict(doc.metadata)) for doc in documents]
@@ -1,10 +1,26 @@
+import asyncio
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import date, datetime
+from itertools import chain, repeat
 from logging import getLogger
-from pathlib import Path
+from multiprocessing import get_context
+from typing import Any
 
-from logseq_retriever.models.document import Document
+from logseq_retriever.models.document import CompactDocument, Document
+from logseq_retriever.loaders.journal_document_cache import (
+    JournalDocumentCache,
+    JournalDocumentCacheStats,
+)
 from logseq_retriever.loaders.journal_loader import LogseqJournalLoader
 from logseq_retriever.loaders.journal_loader_input import LogseqJournalLoaderInput
+from logseq_retriever.loaders.journal_persistent_cache import JournalPersistentCache
+from logseq_retriever.parsers.metadata_extractor import extract_chunk_metadata
+from logseq_retriever.parsers.outline_parser import parse_outline
+from logseq_retriever.parsers.section_splitter import resize_sections
 from logseq_retriever.loaders.journal_document_metadata import (
     LogseqJournalDocumentMetadata,
 )
@@ -23,13 +39,54 @@ class LogseqJournalFilesystemLoader(LogseqJournalLoader):
     def __init__(
         self,
         logseq_journal_path: str,
+        max_workers: int = 8,
+        cache_size: int = 0,
+        persistent_cache_path: str | None = None,
+        workers: int = 1,
+        parallel_min_files: int = 64,
+        validate_metadata: bool = True,
+        compact_documents: bool = False,
         **kwargs,
     ):
         """
         Initialize the loader with the path to the Logseq journal directory.
         `logseq_journal_path` should be contain Logesq journal files, such as `2025_03_27.md`
+        `max_workers` bounds the number of files read & parsed concurrently by `aload`/`alazy_load`.
+        `cache_size` is the number of parsed journal files to keep in an LRU cache. `0` disables caching.
+        `persistent_cache_path` is an SQLite file to store parsed journals in, across processes. Optional.
+        `workers` is the number of processes `load` parses journals with. Ranges of fewer than
+        `parallel_min_files` journals are parsed serially, since pool startup would cost more than it saves.
+        Workers are spawned, so a script using them must call `load` under `if __name__ == "__main__":`.
+        Otherwise they fail to start, and journals are parsed serially instead, with a warning.
+        `validate_metadata` builds each `Document`'s metadata through `LogseqJournalDocumentMetadata`. Set
+        it to `False` to build metadata dicts directly, skipping pydantic for trusted bulk loads.
+        `compact_documents` returns `CompactDocument`s, which share a content buffer & common metadata per
+        journal, to reduce memory when many `Document`s are held at once.
         """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if cache_size < 0:
+            raise ValueError("cache_size must not be negative")
         self.logseq_journal_path = logseq_journal_path
+        self.max_workers = max_workers
+        self.workers = workers
+        self.parallel_min_files = parallel_min_files
+        self.validate_metadata = validate_metadata
+        self.compact_documents = compact_documents
+        self.cache = JournalDocumentCache(cache_size) if cache_size else None
+        self.persistent_cache = (
+            JournalPersistentCache(persistent_cache_path)
+            if persistent_cache_path
+            else None
+        )
+        # sorted date index of journal files, as (dates, filenames); rebuilt when the directory's mtime changes.
+        # Both lists are replaced in one assignment, so concurrent loads never see a mix of old & new
+        self._index: tuple[list[date], list[str]] = ([], [])
+        self._index_mtime_ns: int | None = None
+        # set once worker processes failed to start, so later loads don't retry them
+        self._process_pool_broken = False
         self._validate_logseq_journal_path()
 
     def load(  # type: ignore[override]
@@ -38,26 +95,291 @@ class LogseqJournalFilesystemLoader(LogseqJournalLoader):
     ) -> list[Document]:
         """
         Synchronously load the documents from the Logseq journal directory, according to the input.
+        If `workers` > 1 and the range is large enough, journals are parsed in a process pool.
+        """
+        filenames = self._find_input_journals(input)
+        if (
+            self.workers > 1
+            and not self._process_pool_broken
+            and len(filenames) >= self.parallel_min_files
+        ):
+            return self._load_parallel(filenames, input)
+        return list(self._lazy_load(filenames, input))
+
+    def lazy_load(  # type: ignore[override]
+        self,
+        input: LogseqJournalLoaderInput,
+    ) -> Iterator[Document]:
+        """
+        Lazily load the documents from the Logseq journal directory, according to the input.
+        Journals are read & parsed one file at a time, and `Document`s are yielded in date order.
         """
-        # Convert dates to datetime objects once
+        # validate eagerly, rather than on the first call to `next()`
+        return self._lazy_load(self._find_input_journals(input), input)
+
+    def _find_input_journals(self, input: LogseqJournalLoaderInput) -> list[str]:
+        """Validate the input's date range, and return filenames of matching journals, in date order."""
         if input.start_date > input.end_date:
             raise ValueError("journal_end_date must be after journal_start_date")
+        return self._find_journals(input.start_date, input.end_date)
+
+    def _lazy_load(
+        self, filenames: list[str], input: LogseqJournalLoaderInput
+    ) -> Iterator[Document]:
+        for filename in filenames:
+            yield from self._load_sized_journal(filename, input)
 
-        documents: list[Document] = []
-        # TODO this glob pattern can be improved by analyzing start_date & end_date to provide fewer matches
-        for path in Path(self.logseq_journal_path).glob("*.md"):
-            filename = path.name
-            if self._match_journal(filename, input.start_date, input.end_date):
-                file_path = os.path.join(self.logseq_journal_path, filename)
-                with open(file_path, "r") as file:
-                    content = file.read()
-                    documents.extend(
-                        self.__class__.parse_journal_markdown_file(
-                            content, filename, input.enable_splitting
-                        )
+    async def aload(  # type: ignore[override]
+        self,
+        input: LogseqJournalLoaderInput,
+    ) -> list[Document]:
+        """
+        Asynchronously load the documents from the Logseq journal directory, according to the input.
+        Files are read & parsed concurrently on a bounded thread pool, so the event loop is not blocked.
+        `Document`s are returned in date order.
+        """
+        return [document async for document in self.alazy_load(input)]
+
+    def alazy_load(  # type: ignore[override]
+        self,
+        input: LogseqJournalLoaderInput,
+    ) -> AsyncIterator[Document]:
+        """
+        Asynchronously iterate over the documents from the Logseq journal directory, in date order.
+        Up to `max_workers` files are read & parsed ahead of the consumer, on a thread pool of the call's
+        own, which is shut down once iteration ends.
+        """
+        # validate eagerly, rather than on the first call to `__anext__()`
+        return self._alazy_load(self._find_input_journals(input), input)
+
+    async def _alazy_load(
+        self, filenames: list[str], input: LogseqJournalLoaderInput
+    ) -> AsyncIterator[Document]:
+        loop = asyncio.get_running_loop()
+        remaining = iter(filenames)
+        in_flight: deque[asyncio.Future[list[Document]]] = deque()
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(filenames)) or 1,
+            thread_name_prefix="logseq-journal-loader",
+        )
+
+        def submit() -> None:
+            # keep at most `max_workers` files in flight; results are awaited in submission (date) order
+            while len(in_flight) < self.max_workers:
+                if (filename := next(remaining, None)) is None:
+                    return
+                in_flight.append(
+                    loop.run_in_executor(
+                        executor, self._load_sized_journal, filename, input
                     )
+                )
+
+        submit()
+        try:
+            while in_flight:
+                documents = await in_flight.popleft()
+                submit()
+                for document in documents:
+                    yield document
+        finally:
+            for future in in_flight:
+                future.cancel()
+            # don't block the event loop on files still being parsed; their threads exit once done
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _load_sized_journal(
+        self, filename: str, input: LogseqJournalLoaderInput
+    ) -> list[Document]:
+        """Load a single journal file, with `Document`s resized according to the input."""
+        documents = self._load_journal(filename, input.enable_splitting)
+        return self._finalize_documents(
+            self._resize_documents(documents, filename, input)
+        )
+
+    def _finalize_documents(self, documents: list[Document]) -> list[Document]:
+        """Compact a journal's `Document`s, if `compact_documents` is set."""
+        if self.compact_documents:
+            return CompactDocument.from_documents(documents)  # type: ignore[return-value]
         return documents
 
+    def _resize_documents(
+        self, documents: list[Document], filename: str, input: LogseqJournalLoaderInput
+    ) -> list[Document]:
+        """
+        Split `Document`s longer than `input.max_char_length`, and merge adjacent ones shorter than
+        `input.min_char_length`. `Document`s that need no resizing are returned as-is.
+        """
+        if not input.enable_splitting or (
+            input.min_char_length == 0
+            and all(len(doc.page_content) <= input.max_char_length for doc in documents)
+        ):
+            return documents
+        return [
+            Document(
+                page_content=section,
+                metadata=self.__class__.build_journal_document_metadata(
+                    section, filename, self.validate_metadata
+                ),
+            )
+            for section in resize_sections(
+                (doc.page_content for doc in documents),
+                input.max_char_length,
+                input.min_char_length,
+            )
+        ]
+
+    def _load_journal(self, filename: str, enable_splitting: bool) -> list[Document]:
+        """
+        Read & parse a single journal file into `Document`s.
+        If caching is enabled, the file is only read & parsed if it changed since it was last cached.
+        """
+        file_path = os.path.join(self.logseq_journal_path, filename)
+        if self.cache is None and self.persistent_cache is None:
+            with open(file_path, "r") as file:
+                return _parse_journal(
+                    self.__class__,
+                    file.read(),
+                    filename,
+                    enable_splitting,
+                    self.validate_metadata,
+                )
+
+        stat = os.stat(file_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        documents = self._lookup_journal(filename, stamp, enable_splitting)
+        if documents is not None:
+            return documents
+
+        with open(file_path, "r") as file:
+            content = file.read()
+        content_hash = None
+        if self.persistent_cache is not None:
+            content_hash = self.persistent_cache.hash_content(content)
+            documents = self.persistent_cache.get_by_hash(
+                filename, stamp, content_hash, enable_splitting
+            )
+        if documents is None:
+            documents = _parse_journal(
+                self.__class__,
+                content,
+                filename,
+                enable_splitting,
+                self.validate_metadata,
+            )
+        self._store_journal(filename, stamp, content_hash, enable_splitting, documents)
+        return documents
+
+    def _lookup_journal(
+        self, filename: str, stamp: tuple[int, int], enable_splitting: bool
+    ) -> list[Document] | None:
+        """Look up a journal's parsed `Document`s by file stamp, in memory first, then on disk."""
+        file_path = os.path.join(self.logseq_journal_path, filename)
+        if self.cache is not None:
+            documents = self.cache.get(file_path, stamp, enable_splitting)
+            if documents is not None:
+                return documents
+        if self.persistent_cache is not None:
+            documents = self.persistent_cache.get(filename, stamp, enable_splitting)
+            if documents is not None and self.cache is not None:
+                self.cache.put(file_path, stamp, enable_splitting, documents)
+            return documents
+        return None
+
+    def _store_journal(
+        self,
+        filename: str,
+        stamp: tuple[int, int],
+        content_hash: str | None,
+        enable_splitting: bool,
+        documents: list[Document],
+    ) -> None:
+        """Store a journal's parsed `Document`s in the enabled caches."""
+        if self.cache is not None:
+            file_path = os.path.join(self.logseq_journal_path, filename)
+            self.cache.put(file_path, stamp, enable_splitting, documents)
+        if self.persistent_cache is not None and content_hash is not None:
+            self.persistent_cache.put(
+                filename, stamp, content_hash, enable_splitting, documents
+            )
+
+    def _load_parallel(
+        self, filenames: list[str], input: LogseqJournalLoaderInput
+    ) -> list[Document]:
+        """
+        Parse journals in a process pool, in contiguous batches, and merge the results in date order.
+        Journals that are already cached are served from the cache, rather than sent to the pool.
+        """
+        enable_splitting = input.enable_splitting
+        caching = self.cache is not None or self.persistent_cache is not None
+        results: list[list[Document] | None] = [None] * len(filenames)
+        misses: list[int] = []
+        for i, filename in enumerate(filenames):
+            if caching:
+                stat = os.stat(os.path.join(self.logseq_journal_path, filename))
+                stamp = (stat.st_mtime_ns, stat.st_size)
+                results[i] = self._lookup_journal(filename, stamp, enable_splitting)
+            if results[i] is None:
+                misses.append(i)
+
+        if misses:
+            # a few batches per worker, so one slow batch does not leave the other workers idle
+            batch_size = -(-len(misses) // (self.workers * 4))
+            batches = [
+                [filenames[i] for i in misses[start : start + batch_size]]
+                for start in range(0, len(misses), batch_size)
+            ]
+            try:
+                # spawn, not fork: this process may hold `aload` threads & an open SQLite connection
+                with ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=get_context("spawn")
+                ) as pool:
+                    parsed = pool.map(
+                        _parse_journal_batch,
+                        repeat(self.__class__),
+                        repeat(self.logseq_journal_path),
+                        batches,
+                        repeat(enable_splitting),
+                        repeat(self.persistent_cache is not None),
+                        repeat(self.validate_metadata),
+                    )
+                    for i, (stamp, content_hash, documents) in zip(
+                        misses, chain.from_iterable(parsed)
+                    ):
+                        results[i] = documents
+                        if caching:
+                            self._store_journal(
+                                filenames[i],
+                                stamp,
+                                content_hash,
+                                enable_splitting,
+                                documents,
+                            )
+            except BrokenProcessPool:
+                # e.g. the calling script lacks an `if __name__ == "__main__":` guard, so each spawned
+                # worker re-ran it, and failed to start a pool of its own
+                logger.warning(
+                    "Journal parsing processes failed to start; parsing serially instead. "
+                    'Scripts using `workers` > 1 must call `load` under `if __name__ == "__main__":`'
+                )
+                self._process_pool_broken = True
+                for i in misses:
+                    if results[i] is None:
+                        results[i] = self._load_journal(filenames[i], enable_splitting)
+
+        return [
+            document
+            for filename, documents in zip(filenames, results)
+            if documents
+            for document in self._finalize_documents(
+                self._resize_documents(documents, filename, input)
+            )
+        ]
+
+    @property
+    def cache_stats(self) -> JournalDocumentCacheStats | None:
+        """Hit, miss & eviction counters of the parsed-document cache, or `None` if caching is disabled."""
+        return self.cache.stats if self.cache is not None else None
+
     def _validate_logseq_journal_path(self):
         """
         Validate the path to the Logseq journal directory. Check that the directory exists.
@@ -74,17 +396,78 @@ class LogseqJournalFilesystemLoader(LogseqJournalLoader):
             )
 
         # verify that the directory contains files with the expected format
-        files = os.listdir(self.logseq_journal_path)
-        if len(files) == 0:
+        entry_count, md_count = self._build_index()
+        if entry_count == 0:
             logger.warning(
                 f"Logseq journal directory is empty: {self.logseq_journal_path}"
             )
-        files = Path(self.logseq_journal_path).glob("*.md")
-        if not len(list(files)) > 0:
+        if not md_count > 0:
             logger.warning(
                 f"No files with .md extension found in {self.logseq_journal_path}"
             )
 
+    def _build_index(self) -> tuple[int, int]:
+        """
+        Scan the journal directory once, and rebuild the sorted date index of journal files.
+        Return the number of directory entries, and the number of `.md` entries, found.
+        """
+        mtime_ns = os.stat(self.logseq_journal_path).st_mtime_ns
+        entry_count = md_count = 0
+        journals: list[tuple[date, str]] = []
+        with os.scandir(self.logseq_journal_path) as entries:
+            for entry in entries:
+                entry_count += 1
+                if not entry.name.endswith(".md"):
+                    continue
+                md_count += 1
+                if (file_date := self._parse_journal_filename(entry.name)) is not None:
+                    journals.append((file_date, entry.name))
+
+        journals.sort()
+        self._index = (
+            [file_date for file_date, _ in journals],
+            [filename for _, filename in journals],
+        )
+        self._index_mtime_ns = mtime_ns
+        return entry_count, md_count
+
+    def _refresh_index(self) -> None:
+        """
+        Rebuild the date index if the journal directory has changed since the last scan.
+        Adding, removing or renaming a file updates the directory's mtime; editing one does not,
+        which is fine, since the index only maps dates to filenames.
+        """
+        if os.stat(self.logseq_journal_path).st_mtime_ns != self._index_mtime_ns:
+            self._build_index()
+
+    def _find_journals(self, start_date: date, end_date: date) -> list[str]:
+        """
+        Return filenames of journals between `start_date` & `end_date` (inclusive), in date order.
+        Binary search over the date index, so cost is O(log n + k) for k matching journals.
+        """
+        self._refresh_index()
+        dates, filenames = self._index
+        lo = bisect_left(dates, start_date)
+        hi = bisect_right(dates, end_date)
+        return filenames[lo:hi]
+
+    def journal_sizes(self, start_date: date, end_date: date) -> list[tuple[date, int]]:
+        """
+        Return the date & size in bytes of each journal between `start_date` & `end_date` (inclusive), in
+        date order, e.g. to balance work across shards of a date range.
+        """
+        self._refresh_index()
+        dates, filenames = self._index
+        lo = bisect_left(dates, start_date)
+        hi = bisect_right(dates, end_date)
+        return [
+            (
+                journal_date,
+                os.path.getsize(os.path.join(self.logseq_journal_path, filename)),
+            )
+            for journal_date, filename in zip(dates[lo:hi], filenames[lo:hi])
+        ]
+
     def _match_journal(self, filename: str, start_date: date, end_date: date) -> bool:
         """
         Return `True` if journal date is between `start_date` & `end_date`.
@@ -97,45 +480,82 @@ class LogseqJournalFilesystemLoader(LogseqJournalLoader):
         Returns:
             bool: True if the file's date is within the range, False otherwise
         """
+        file_date = self._parse_journal_filename(filename)
+        return file_date is not None and start_date <= file_date <= end_date
+
+    @staticmethod
+    def _parse_journal_filename(filename: str) -> date | None:
+        """
+        Return the date of a journal filename (e.g., "2025_03_27.md"), or `None` if it is not a journal.
+        """
         if not filename.endswith(".md"):
-            return False
+            return None
 
         try:
-            # Convert filename to date object
-            file_date = datetime.strptime(filename[:-3], "%Y_%m_%d").date()
-            return start_date <= file_date <= end_date
+            return datetime.strptime(filename[:-3], "%Y_%m_%d").date()
         except ValueError:
             # If there's any issue parsing the date from filename, skip this file
-            return False
+            return None
 
     @staticmethod
     def parse_journal_markdown_file(
-        content: str, filename: str, enable_splitting: bool = True
+        content: str,
+        filename: str,
+        enable_splitting: bool = True,
+        validate_metadata: bool = True,
     ) -> list[Document]:
         """
         Generate `Document`s from a file's contents. If necessary, split content into digestible
         `Document`s, and attach metadata.
         This function can potentially be augmented by calling Logseq APIs, rather than simply parsing markdown files.
         """
-        sections = content.split("\n- ") if enable_splitting else [content]
-        docs = []
+        return list(
+            LogseqJournalFilesystemLoader.iter_journal_markdown_file(
+                content, filename, enable_splitting, validate_metadata
+            )
+        )
+
+    @staticmethod
+    def iter_journal_markdown_file(
+        content: str,
+        filename: str,
+        enable_splitting: bool = True,
+        validate_metadata: bool = True,
+    ) -> Iterator[Document]:
+        """
+        Lazy equivalent of `parse_journal_markdown_file`. Yield `Document`s one section at a time.
+        Sections are the root-level blocks of the journal's outline, each with its descendants.
+        """
+        sections = parse_outline(content).sections() if enable_splitting else [content]
         for section in sections:
             if section_content := section.strip():
-                # Create a Document
-                # first, check that the content length (char count) is acceptable
-                # if longer than acceptable, then call recursively
-                # TODO: use self.p.max_char_count below instead
+                # sections are resized to `max_char_length` by the loader, after caching
                 metadata = (
-                    LogseqJournalFilesystemLoader.parse_journal_markdown_file_metadata(
-                        section_content, filename
-                    )
-                )
-                docs.append(
-                    Document(
-                        page_content=section_content, metadata=metadata.model_dump()
+                    LogseqJournalFilesystemLoader.build_journal_document_metadata(
+                        section_content, filename, validate_metadata
                     )
                 )
-        return docs
+                yield Document(page_content=section_content, metadata=metadata)
+
+    @staticmethod
+    def build_journal_document_metadata(
+        section: str, filename: str, validate_metadata: bool = True
+    ) -> dict[str, Any]:
+        """
+        Build the metadata dict of a section's `Document`. If `validate_metadata` is set, it is validated
+        by `parse_journal_markdown_file_metadata`; otherwise, the same dict is built directly, since the
+        extracted fields are already of the right types.
+        """
+        if validate_metadata:
+            return LogseqJournalFilesystemLoader.parse_journal_markdown_file_metadata(
+                section, filename
+            ).model_dump()
+        metadata = extract_chunk_metadata(section)
+        return {
+            "journal_date": filename.replace(".md", "").replace("_", "-"),
+            "journal_tags": metadata.tags,
+            "journal_char_count": metadata.char_count,
+        }
 
     @staticmethod
     def parse_journal_markdown_file_metadata(
@@ -147,11 +567,58 @@ class LogseqJournalFilesystemLoader(LogseqJournalLoader):
         """
         # Extract date from filename
         date_str = filename.replace(".md", "").replace("_", "-")
-        char_count = len(section)
+        metadata = extract_chunk_metadata(section)
 
         return LogseqJournalDocumentMetadata(
             journal_date=date_str,
-            # TODO get tags from Document's contents
-            journal_tags=[],
-            journal_char_count=char_count,
+            journal_tags=metadata.tags,
+            journal_char_count=metadata.char_count,
+        )
+
+
+def _parse_journal(
+    loader_cls: type[LogseqJournalFilesystemLoader],
+    content: str,
+    filename: str,
+    enable_splitting: bool,
+    validate_metadata: bool,
+) -> list[Document]:
+    """
+    Parse a journal with `loader_cls.parse_journal_markdown_file`. `validate_metadata` is only passed when
+    unset, so overrides of `parse_journal_markdown_file` with the original signature keep working.
+    """
+    if validate_metadata:
+        return loader_cls.parse_journal_markdown_file(
+            content, filename, enable_splitting
+        )
+    return loader_cls.parse_journal_markdown_file(
+        content, filename, enable_splitting, validate_metadata=False
+    )
+
+
+def _parse_journal_batch(
+    loader_cls: type[LogseqJournalFilesystemLoader],
+    logseq_journal_path: str,
+    filenames: list[str],
+    enable_splitting: bool,
+    hash_content: bool,
+    validate_metadata: bool = True,
+) -> list[tuple[tuple[int, int], str | None, list[Document]]]:
+    """
+    Process pool worker for `LogseqJournalFilesystemLoader._load_parallel`. Read & parse a batch of journals.
+    Return each journal's `(mtime_ns, size)` stamp, optional content hash, and `Document`s, so the parent
+    process can cache them.
+    """
+    results = []
+    for filename in filenames:
+        with open(os.path.join(logseq_journal_path, filename), "r") as file:
+            stat = os.fstat(file.fileno())
+            content = file.read()
+        content_hash = (
+            JournalPersistentCache.hash_content(content) if hash_content else None
+        )
+        documents = _parse_journal(
+            loader_cls, content, filename, enable_splitting, validate_metadata
         )
+        results.append(((stat.st_mtime_ns, stat.st_size), content_hash, documents))
+    return results
@@ -1,4 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterator
 from typing import Any
 
 from logseq_retriever.models.document import Document
@@ -11,3 +13,23 @@ class LogseqJournalLoader(ABC):
 
     @abstractmethod
     def load(self, input: Any) -> list[Document]: ...
+
+    def lazy_load(self, input: Any) -> Iterator[Document]:
+        """
+        Lazily load `Document`s. Override this for loaders that can stream; by default, defer to `load`.
+        """
+        yield from self.load(input)
+
+    async def aload(self, input: Any) -> list[Document]:
+        """
+        Asynchronously load `Document`s. By default, run `load` in the event loop's default executor.
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self.load, input)
+
+    async def alazy_load(self, input: Any) -> AsyncIterator[Document]:
+        """
+        Asynchronously iterate over `Document`s. Override this for loaders that can stream; by default,
+        defer to `aload`.
+        """
+        for document in await self.aload(input):
+            yield document
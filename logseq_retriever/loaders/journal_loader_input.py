@@ -56,11 +56,27 @@ class LogseqJournalLoaderInput(BaseModel):
     max_char_length: Annotated[
         int,
         Field(
-            description="The maximum number of characters to include in a single `Document`.",
+            description=(
+                "The maximum number of characters to include in a single `Document`. "
+                "Longer sections are split. Only applies if `enable_splitting` is set."
+            ),
             examples=[8196, 2000],
             default=1024 * 8,
+            ge=1,
         ),
     ] = 1024 * 8
+    min_char_length: Annotated[
+        int,
+        Field(
+            description=(
+                "Adjacent sections shorter than this are merged, up to `max_char_length`, "
+                "to reduce the number of `Document`s. `0` disables merging."
+            ),
+            examples=[0, 512],
+            default=0,
+            ge=0,
+        ),
+    ] = 0
     enable_splitting: Annotated[
         bool,
         Field(
@@ -81,6 +97,12 @@ class LogseqJournalLoaderInput(BaseModel):
         self._end_date = _parse_date(self.journal_end_date)
         return self
 
+    @model_validator(mode="after")
+    def _validate_char_lengths(self) -> "LogseqJournalLoaderInput":
+        if self.min_char_length > self.max_char_length:
+            raise ValueError("min_char_length must not exceed max_char_length")
+        return self
+
     @computed_field
     @property
     def start_date(self) -> date:
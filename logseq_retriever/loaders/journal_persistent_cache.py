@@ -0,0 +1,124 @@
+import hashlib
+import json
+import sqlite3
+from threading import Lock
+
+from logseq_retriever.models.document import Document
+
+PARSER_VERSION = "3"
+"""Bump whenever parsing changes the `Document`s produced for the same file, to invalidate stored entries."""
+
+
+class JournalPersistentCache:
+    """
+    On-disk cache of parsed journal `Document`s, stored in a single SQLite file, so a new process can
+    serve loads without re-reading or re-parsing unchanged journals.
+
+    Each entry is keyed by journal filename & splitting mode, and records the file's `(mtime_ns, size)`
+    stamp and the sha256 of its content when it was parsed:
+    - if the stamp matches, the entry is served without reading the file
+    - if only the stamp changed (e.g. the file was touched, or the graph was synced), the content hash
+      is compared, and a match re-stamps the entry instead of re-parsing
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        # connections are shared with the loader's executor threads, and serialized by `_lock`
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_info (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS journal_documents (
+                    filename TEXT NOT NULL,
+                    enable_splitting INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    documents TEXT NOT NULL,
+                    PRIMARY KEY (filename, enable_splitting)
+                )
+                """
+            )
+            row = self._conn.execute(
+                "SELECT value FROM cache_info WHERE key = 'parser_version'"
+            ).fetchone()
+            if row is None or row[0] != PARSER_VERSION:
+                self._conn.execute("DELETE FROM journal_documents")
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache_info VALUES ('parser_version', ?)",
+                    (PARSER_VERSION,),
+                )
+
+    @staticmethod
+    def hash_content(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(
+        self, filename: str, stamp: tuple[int, int], enable_splitting: bool
+    ) -> list[Document] | None:
+        """Return the stored `Document`s if the file's stamp is unchanged, otherwise `None`."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT documents FROM journal_documents "
+                "WHERE filename = ? AND enable_splitting = ? AND mtime_ns = ? AND size = ?",
+                (filename, enable_splitting, *stamp),
+            ).fetchone()
+        return _decode_documents(row[0]) if row else None
+
+    def get_by_hash(
+        self,
+        filename: str,
+        stamp: tuple[int, int],
+        content_hash: str,
+        enable_splitting: bool,
+    ) -> list[Document] | None:
+        """
+        Return the stored `Document`s if the file's content is unchanged, otherwise `None`.
+        On a match, the entry is re-stamped, so the next lookup can skip reading the file.
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT documents FROM journal_documents "
+                "WHERE filename = ? AND enable_splitting = ? AND content_hash = ?",
+                (filename, enable_splitting, content_hash),
+            ).fetchone()
+            if row:
+                self._conn.execute(
+                    "UPDATE journal_documents SET mtime_ns = ?, size = ? "
+                    "WHERE filename = ? AND enable_splitting = ?",
+                    (*stamp, filename, enable_splitting),
+                )
+        return _decode_documents(row[0]) if row else None
+
+    def put(
+        self,
+        filename: str,
+        stamp: tuple[int, int],
+        content_hash: str,
+        enable_splitting: bool,
+        documents: list[Document],
+    ) -> None:
+        """Store the parsed `Document`s of a file, replacing any previous entry."""
+        encoded = json.dumps([[doc.page_content, doc.metadata] for doc in documents])
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO journal_documents VALUES (?, ?, ?, ?, ?, ?)",
+                (filename, enable_splitting, *stamp, content_hash, encoded),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _decode_documents(encoded: str) -> list[Document]:
+    return [
+        Document(page_content=page_content, metadata=metadata)
+        for page_content, metadata in json.loads(encoded)
+    ]
@@ -1,15 +1,27 @@
 from logseq_retriever.models.journal_pgvector import (
+    EmbeddingType,
     JournalDocument,
+    JournalDocumentBase,
     JournalCorpusMetadata,
     JournalDocumentMetadata,
     JournalSearchClientConfig,
     JournalSearchQuery,
+    VectorColumn,
+    VectorIndexConfig,
+    VectorStorage,
+    journal_document_cls,
 )
 
 __all__ = [
+    "EmbeddingType",
     "JournalDocument",
+    "JournalDocumentBase",
     "JournalCorpusMetadata",
     "JournalDocumentMetadata",
     "JournalSearchClientConfig",
     "JournalSearchQuery",
+    "VectorColumn",
+    "VectorIndexConfig",
+    "VectorStorage",
+    "journal_document_cls",
 ]
@@ -1,7 +1,162 @@
+from collections.abc import Sequence
 from dataclasses import dataclass, field
+from typing import Any
+
+_SHAREABLE_TYPES = (str, int, float, bool, type(None))
+"""Immutable metadata value types, which are safe to share between `CompactDocument`s"""
 
 
 @dataclass
 class Document:
     page_content: str
     metadata: dict = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class _MetadataLayout:
+    """Layout of the metadata of `CompactDocument`s, shared by the documents of a file."""
+
+    shared: dict
+    """Immutable values common to all documents"""
+    keys: tuple[str, ...]
+    """Keys of each document's own values, which are stored as a tuple"""
+    list_keys: frozenset[str]
+    """Keys whose list values are stored as tuples, and restored as lists"""
+
+
+class CompactDocument(Document):
+    """
+    Memory-compact `Document`, for holding many documents at once.
+
+    `page_content` is a `(start, end)` slice of a buffer shared by the documents of a file, and is sliced
+    on access. Metadata values common to the documents of a file are shared, and each document only stores
+    a tuple of its own values; `metadata` is materialized into a dict of its own on first access.
+    Constructed, assigned & `dataclasses.replace`d like a `Document`, and compares equal to a `Document` with
+    the same content & metadata; use `from_documents` to share buffers & metadata.
+    """
+
+    __slots__ = ("_buffer", "_end", "_layout", "_metadata", "_start")
+    _buffer: str
+    _start: int
+    _end: int
+    _layout: _MetadataLayout | None
+    _metadata: Any
+
+    def __init__(self, page_content: str, metadata: dict | None = None):
+        self.page_content = page_content
+        self.metadata = {} if metadata is None else metadata
+
+    @classmethod
+    def _from_slice(
+        cls,
+        buffer: str,
+        start: int,
+        end: int,
+        layout: _MetadataLayout,
+        values: tuple,
+    ) -> "CompactDocument":
+        """`buffer[start:end]`, with the metadata of `values` laid out by `layout`"""
+        document = cls.__new__(cls)
+        document._buffer, document._start, document._end = buffer, start, end
+        document._layout, document._metadata = layout, values
+        return document
+
+    @classmethod
+    def from_documents(cls, documents: Sequence[Document]) -> list["CompactDocument"]:
+        """
+        Compact the `Document`s of a single file: their contents are copied into one shared buffer, and
+        immutable metadata values common to all of them are shared, rather than repeated per document.
+        """
+        if not documents:
+            return []
+        shared = {
+            key: value
+            for key, value in documents[0].metadata.items()
+            if isinstance(value, _SHAREABLE_TYPES)
+            and all(
+                key in doc.metadata and doc.metadata[key] == value
+                for doc in documents[1:]
+            )
+        }
+        layouts: dict[tuple, _MetadataLayout] = {}
+        buffer = "".join(doc.page_content for doc in documents)
+        compact_documents = []
+        start = 0
+        for doc in documents:
+            keys = tuple(key for key in doc.metadata if key not in shared)
+            list_keys = frozenset(
+                key for key in keys if type(doc.metadata[key]) is list
+            )
+            layout = layouts.setdefault(
+                (keys, list_keys), _MetadataLayout(shared, keys, list_keys)
+            )
+            end = start + len(doc.page_content)
+            values = tuple(
+                tuple(doc.metadata[key]) if key in list_keys else doc.metadata[key]
+                for key in keys
+            )
+            compact_documents.append(
+                cls._from_slice(buffer, start, end, layout, values)
+            )
+            start = end
+        return compact_documents
+
+    @property
+    def page_content(self) -> str:
+        return self._buffer[self._start : self._end]
+
+    @page_content.setter
+    def page_content(self, value: str) -> None:
+        self._buffer, self._start, self._end = value, 0, len(value)
+
+    @property
+    def metadata(self) -> dict:
+        if self._layout is not None:
+            self._metadata = self._peek_metadata()
+            self._layout = None
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: dict) -> None:
+        self._metadata, self._layout = value, None
+
+    # pickle the slots as is, rather than `page_content` & `metadata`, so the buffer stays shared
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: tuple) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def to_document(self) -> Document:
+        """Return an equal `Document`, with its own copies of content & metadata."""
+        return Document(self.page_content, dict(self.metadata))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Document):
+            return NotImplemented
+        other_metadata = (
+            other._peek_metadata()
+            if isinstance(other, CompactDocument)
+            else other.metadata
+        )
+        return (
+            self.page_content == other.page_content
+            and self._peek_metadata() == other_metadata
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"CompactDocument(page_content={self.page_content!r}, metadata={self._peek_metadata()!r})"
+
+    def _peek_metadata(self) -> dict:
+        """Return the merged metadata, without materializing it."""
+        layout = self._layout
+        if layout is None:
+            return self._metadata
+        own = {
+            key: list(value) if key in layout.list_keys else value
+            for key, value in zip(layout.keys, self._metadata)
+        }
+        return layout.shared | own
@@ -1,8 +1,9 @@
-from typing import Type
+from functools import cache
+from typing import ClassVar, Literal, Type
 
-from pgvector.sqlalchemy import Vector
-from pydantic import Field
-from sqlalchemy import Column, String
+from pgvector.sqlalchemy import BIT, HALFVEC, Vector
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from sqlalchemy import Column, Date, Index, String
 
 from pgvector_template.core import (
     BaseDocument,
@@ -15,19 +16,185 @@ from pgvector_template.models.search import (
 )
 
 
-class JournalDocument(BaseDocument):
+VectorStorage = Literal["vector", "halfvec"]
+"""pgvector column type of embeddings: 4-byte `vector`, or 2-byte `halfvec` floats per dimension"""
+EmbeddingType = Literal["float", "int8"]
+"""Type of embeddings returned by the provider: full-precision `float`s, or scalar-quantized `int8`s"""
+VectorColumn = Literal["embedding", "embedding_bits"]
+"""Column an ANN index can be built on"""
+
+
+class VectorIndexConfig(BaseModel):
+    """Method & build parameters of the ANN indexes on `embedding` & `embedding_bits`. Defaults are pgvector's."""
+
+    model_config = ConfigDict(frozen=True)
+
+    method: Literal["hnsw", "ivfflat"] = "hnsw"
+    """HNSW: better speed-recall tradeoff. IVFFlat: faster to build & smaller, but build it after loading data"""
+    m: int = Field(default=16, ge=2, le=100)
+    """HNSW: max connections per layer. Higher improves recall, at the cost of build time & size"""
+    ef_construction: int = Field(default=64, ge=4, le=1000)
+    """HNSW: size of the candidate list while building. Higher improves recall, at the cost of build time"""
+    lists: int = Field(default=100, ge=1, le=32768)
+    """IVFFlat: number of clusters. pgvector suggests rows / 1000, up to 1M rows"""
+    columns: tuple[VectorColumn, ...] = Field(
+        default=("embedding", "embedding_bits"), min_length=1
+    )
+    """Columns given an ANN index. `("embedding_bits",)` suits `binary_rerank` searches, which never scan
+    the `embedding` index, and saves its memory & build time"""
+
+    @model_validator(mode="after")
+    def _check_ef_construction(self) -> "VectorIndexConfig":
+        if self.method == "hnsw" and self.ef_construction < 2 * self.m:
+            raise ValueError("ef_construction must be at least 2 * m")
+        return self
+
+    @property
+    def storage_parameters(self) -> dict[str, int]:
+        """`WITH (...)` parameters of `CREATE INDEX`"""
+        if self.method == "hnsw":
+            return {"m": self.m, "ef_construction": self.ef_construction}
+        return {"lists": self.lists}
+
+
+class JournalDocumentBase(BaseDocument):
     """
+    Columns shared by every `JournalDocument` table, whichever the embedding dimensions & storage.
     Each `Corpus` is the entire entry for a given date. A corpus may consist of 1 or more chunks of `Document`s.
     Each `Corpus` has a set of metadata, and each `Document` chunk has all of those, plus more.
     """
 
-    __abstract__ = False
-    __tablename__ = "logseq_journal"
+    __abstract__ = True
+
+    vector_storage: ClassVar[VectorStorage] = "vector"
+    """Column type of `embedding`, which selects the operator class of the embedding index"""
+    vector_index: ClassVar[VectorIndexConfig] = VectorIndexConfig()
+    """ANN indexes declared with the table. `JournalCorpusManager` can rebuild them with other parameters"""
 
     corpus_id = Column(String(len("2025-06-09")), index=True)
     """Length of ISO date string"""
+    journal_date = Column(Date, nullable=True)
+    """Date of the journal, i.e. `date_str`, typed so date-range filters can use an index"""
+
+    def __init_subclass__(cls, **kwargs):
+        # `BaseDocument` gave this abstract class table args named after its placeholder table; drop them
+        cls.__table_args__ = cls.__dict__.get("__table_args__", ())
+        if hasattr(cls, "__tablename__"):
+            cls.__table_args__ += cls.get_journal_indexes(cls.__tablename__)
+        super().__init_subclass__(**kwargs)
+
+    @classmethod
+    def get_journal_indexes(cls, table_name: str) -> tuple[Index, ...]:
+        """Indexes of every journal table, on top of `BaseDocument`'s."""
+        # b-tree rather than BRIN: re-uploading a day appends its rows, so rows don't stay in date order
+        # `BaseDocument` always declares the `embedding` index; `JournalCorpusManager` drops it if unwanted
+        return (
+            *(
+                cls.get_vector_index(table_name, cls.vector_index, column)
+                for column in cls.vector_index.columns
+                if column != "embedding"
+            ),
+            Index(f"{table_name}_journal_date_idx", "journal_date"),
+            # smaller & faster than `BaseDocument`'s GIN index for `@>`, e.g. `references`, `tags` & `anchor_ids`
+            Index(
+                f"{table_name}_metadata_path_gin_idx",
+                "document_metadata",
+                postgresql_using="gin",
+                postgresql_ops={"document_metadata": "jsonb_path_ops"},
+            ),
+        )
+
+    @classmethod
+    def get_vector_indexes(
+        cls, table_name: str, config: VectorIndexConfig
+    ) -> tuple[Index, ...]:
+        """ANN indexes on the `columns` of `config`, built as it says."""
+        return tuple(
+            cls.get_vector_index(table_name, config, column)
+            for column in config.columns
+        )
+
+    @classmethod
+    def get_vector_index(
+        cls, table_name: str, config: VectorIndexConfig, column: VectorColumn
+    ) -> Index:
+        """ANN index on `column`, built as `config` says."""
+        opclass = (
+            f"{cls.vector_storage}_cosine_ops"
+            if column == "embedding"
+            else "bit_hamming_ops"
+        )
+        return Index(
+            f"{table_name}_{column}_{config.method}_idx",
+            column,
+            postgresql_using=config.method,
+            postgresql_ops={column: opclass},
+            postgresql_with=config.storage_parameters,
+        )
+
+    @staticmethod
+    def binary_quantize(embedding: list[float]) -> str:
+        """1 bit per dimension: whether it is positive. Matches pgvector's `binary_quantize`."""
+        return "".join("1" if x > 0 else "0" for x in embedding)
+
+    @classmethod
+    def get_embedding_index(cls, table_name: str) -> Index:
+        return cls.get_vector_index(table_name, cls.vector_index, "embedding")
+
+
+class JournalDocument(JournalDocumentBase):
+    """Logseq journal chunks, with 1024-dimension `vector` embeddings. See `journal_document_cls`."""
+
+    __abstract__ = False
+    __tablename__ = "logseq_journal"
+
     embedding = Column(Vector(1024))
     """Embedding vector"""
+    embedding_bits = Column(BIT(1024), nullable=True)
+    """`embedding`, binary-quantized, for coarse Hamming-distance search. See `JournalSearchClient`"""
+
+
+@cache
+def journal_document_cls(
+    dimensions: int = 1024,
+    vector_storage: VectorStorage = "vector",
+    embedding_type: EmbeddingType = "float",
+) -> type[JournalDocumentBase]:
+    """
+    Return the document class storing `embedding_type` embeddings of `dimensions` as `vector_storage`.
+    The defaults return `JournalDocument`; other combinations each get their own table, e.g.
+    `logseq_journal_halfvec512` or `logseq_journal_halfvec512_int8`, since vectors of different sizes
+    or types can't share a column, and float & int8 embeddings aren't comparable.
+
+    `halfvec` halves the size of the table & embedding index, at a negligible loss of recall. It also
+    stores int8 embeddings exactly, so it pairs with providers returning quantized embeddings.
+    """
+    if vector_storage not in ("vector", "halfvec"):
+        raise ValueError(f"Unknown vector storage: {vector_storage}")
+    if embedding_type not in ("float", "int8"):
+        raise ValueError(f"Unknown embedding type: {embedding_type}")
+    if dimensions < 1:
+        raise ValueError("dimensions must be at least 1")
+    if (dimensions, vector_storage, embedding_type) == (1024, "vector", "float"):
+        return JournalDocument
+    # float embeddings keep the table names from before int8 support
+    suffix = "" if embedding_type == "float" else f"_{embedding_type}"
+    column_type = (
+        HALFVEC(dimensions) if vector_storage == "halfvec" else Vector(dimensions)
+    )
+    return type(
+        f"JournalDocument{vector_storage.title()}{dimensions}{suffix.title()[1:]}",
+        (JournalDocumentBase,),
+        {
+            "__module__": __name__,
+            "__doc__": f"Logseq journal chunks, with {dimensions}-dimension `{embedding_type}` embeddings "
+            f"stored as `{vector_storage}`.",
+            "__tablename__": f"logseq_journal_{vector_storage}{dimensions}{suffix}",
+            "vector_storage": vector_storage,
+            "embedding": Column(column_type),
+            "embedding_bits": Column(BIT(dimensions), nullable=True),
+        },
+    )
 
 
 class JournalCorpusMetadata(BaseDocumentMetadata):
@@ -38,9 +205,13 @@ class JournalCorpusMetadata(BaseDocumentMetadata):
         pattern=r"^\d{4}-\d{2}-\d{2}$",
         description="Date in ISO format, e.g. `2025-04-20`",
     )
+    corpus_hash: str | None = Field(
+        default=None,
+        description="sha256 of the corpus' content, to detect changed journals when syncing",
+    )
     # defaults
     document_type: str = Field(default="logseq_journal")
-    schema_version: str = Field(default="2026-06-02")
+    schema_version: str = Field(default="2026-10-16")
 
 
 class JournalDocumentMetadata(JournalCorpusMetadata):
@@ -52,7 +223,9 @@ class JournalDocumentMetadata(JournalCorpusMetadata):
     word_count: int | None = Field()
     """Length of the content in words"""
     references: list[str] = Field(default=[])
-    """List of references to other Logseq documents, or journal dates"""
+    """References to other Logseq pages, or journal dates: `#tag`s, then `[[page links]]`"""
+    tags: list[str] = Field(default=[])
+    """The `#tag` references, without page links. Every tag is also in `references`"""
     anchor_ids: list[str] = Field(default=[])
     """Blocks in the document can have UUID anchors, which are referenced elsewhere. This is a list of all present"""
 
@@ -65,6 +238,20 @@ class JournalSearchClientConfig(BaseSearchClientConfig):
     document_metadata_cls: Type[BaseDocumentMetadata] = JournalDocumentMetadata
     """The document metadata type to use for the search client."""
     # embedding_provider
+    binary_rerank: bool = False
+    """
+    Search in 2 stages: pick candidates by Hamming distance of `embedding_bits`, then rerank them by exact
+    cosine distance. Trades a little recall for much less index memory & faster scans on large tables.
+    """
+    rerank_multiplier: int = Field(default=8, ge=1)
+    """Number of coarse candidates per requested result, when `binary_rerank` is enabled"""
+    ef_search: int | None = Field(default=None, ge=1, le=1000)
+    """
+    HNSW: size of the candidate list while searching. Higher improves recall, at the cost of latency.
+    `None` keeps pgvector's default (40), raised as needed to return as many rows as requested.
+    """
+    probes: int | None = Field(default=None, ge=1)
+    """IVFFlat: number of clusters searched. Higher improves recall, at the cost of latency"""
 
 
 class JournalSearchQuery(SearchQuery):
@@ -100,6 +287,7 @@ class JournalSearchQuery(SearchQuery):
     """
     List of metadata conditions that must be matched.
     Refer to `metadata_schema` for the expected schema, as it exists in the database.
+    For date ranges, filter `date_str` with ISO dates, e.g. `gte` & `lte`; these are matched against an indexed date column.
     """
 
     limit: int = Field(20, ge=3)
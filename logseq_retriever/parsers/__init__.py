@@ -0,0 +1,25 @@
+from logseq_retriever.parsers.metadata_extractor import (
+    ChunkMetadata,
+    extract_chunk_metadata,
+)
+from logseq_retriever.parsers.outline_parser import (
+    LogseqBlock,
+    LogseqOutline,
+    parse_outline,
+)
+from logseq_retriever.parsers.section_splitter import (
+    merge_sections,
+    resize_sections,
+    split_section,
+)
+
+__all__ = [
+    "ChunkMetadata",
+    "LogseqBlock",
+    "LogseqOutline",
+    "extract_chunk_metadata",
+    "merge_sections",
+    "parse_outline",
+    "resize_sections",
+    "split_section",
+]
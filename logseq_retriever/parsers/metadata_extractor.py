@@ -0,0 +1,80 @@
+import re
+from dataclasses import dataclass, field
+
+_TOKEN_PATTERN = re.compile(
+    # every alternative starts with a literal, so the scan can skip ahead to candidate chars;
+    # `(?<!\S#)` then checks that a `#` starts at whitespace
+    r"#(?<!\S#)#*\[\[(?P<tag_page>[^\]\n]+)\]\]"  # #[[multi word]] tag
+    r"|#(?<!\S#)(?P<tag>\S+)"  # #tag, up to the next whitespace
+    r"|\[\[(?P<page_link>[^\]\n]+)\]\]"  # [[page link]]
+    r"|\(\((?P<block_ref>[0-9a-f-]{36})\)\)"  # ((block ref))
+    r"|id:: (?P<anchor_id>[a-f0-9-]{36})"  # id:: anchor
+)
+"""Every structural token of a Logseq block, as one alternation, so they are all found in a single scan.
+`extract_chunk_metadata` unpacks its groups by position, so keep them in this order"""
+
+_TAG_BREAK_PATTERN = re.compile(r"""[!?,:'"]""")
+"""Special chars that end a `#tag`"""
+
+
+@dataclass(slots=True)
+class ChunkMetadata:
+    """Metadata extracted from a chunk of Logseq markdown by `extract_chunk_metadata`."""
+
+    char_count: int
+    word_count: int
+    tags: list[str] = field(default_factory=list)
+    """`#tag` and `#[[multi word]]` tags, in order of appearance"""
+    page_links: list[str] = field(default_factory=list)
+    """`[[page link]]` references, in order of appearance"""
+    block_refs: list[str] = field(default_factory=list)
+    """UUIDs of `((block ref))` references to other blocks"""
+    anchor_ids: list[str] = field(default_factory=list)
+    """UUIDs of `id::` anchors of blocks in the chunk, which may be referenced elsewhere"""
+
+    @property
+    def references(self) -> list[str]:
+        """All references to other Logseq pages (including journal dates): tags, then page links."""
+        return self.tags + self.page_links
+
+
+def extract_chunk_metadata(content: str) -> ChunkMetadata:
+    """
+    Extract word count, tags, page links, block refs & anchor IDs from a chunk of Logseq markdown.
+    All tokens are found in a single regex scan; the word count is a separate C-level `str.split`.
+
+    `#tag`s start at whitespace, and run up to the next whitespace. Leading & trailing `#`s are dropped,
+    `\\` is ignored, and any of `!?,:'"` end the tag, e.g. `#script's` is the tag `script`.
+    """
+    tags: list[str] = []
+    page_links: list[str] = []
+    block_refs: list[str] = []
+    anchor_ids: list[str] = []
+    # `findall` builds every match's groups in C; a `Match` object per token costs more than the scan
+    for tag_page, tag, page_link, block_ref, anchor_id in _TOKEN_PATTERN.findall(
+        content
+    ):
+        if tag:
+            tag = tag.strip("#")
+            if "\\" in tag:
+                tag = tag.replace("\\", "")
+            if match := _TAG_BREAK_PATTERN.search(tag):
+                tag = tag[: match.start()]
+            if tag:
+                tags.append(tag)
+        elif tag_page:
+            tags.append(tag_page)
+        elif page_link:
+            page_links.append(page_link)
+        elif block_ref:
+            block_refs.append(block_ref)
+        else:
+            anchor_ids.append(anchor_id)
+    return ChunkMetadata(
+        char_count=len(content),
+        word_count=len(content.split()),
+        tags=tags,
+        page_links=page_links,
+        block_refs=block_refs,
+        anchor_ids=anchor_ids,
+    )
@@ -0,0 +1,154 @@
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+_PROPERTY_PATTERN = re.compile(r"([\w.\-]+):: ?(.*)")
+"""Logseq block property, e.g. `id:: 686f4ac0-e43b-4a15-940a-954f55e03bea`"""
+
+_TAB_WIDTH = 4
+"""Indentation width of a tab, when comparing indentation of mixed tabs & spaces"""
+
+
+@dataclass(slots=True)
+class LogseqBlock:
+    """
+    A single bullet (block) of a Logseq outline. Offsets index into the original text, so a block's
+    content can be sliced out when needed, rather than copied while parsing.
+    """
+
+    start: int
+    """Offset of the start of the block's first line, including indentation"""
+    content_start: int
+    """Offset just past the bullet marker `-`"""
+    end: int
+    """Offset of the end of the block's own content, i.e. where its first child or next block starts"""
+    subtree_end: int
+    """Offset of the end of the block, including all of its descendants"""
+    depth: int
+    """Nesting depth. Root-level blocks have depth 0"""
+    parent: int
+    """Index of the parent block in `LogseqOutline.blocks`, or -1 for root-level blocks"""
+    properties: dict[str, str] = field(default_factory=dict)
+    """Block properties, e.g. `{"id": "686f4ac0-..."}`"""
+
+
+@dataclass(slots=True)
+class LogseqOutline:
+    """
+    Block tree of a Logseq markdown document, produced by `parse_outline`.
+    Blocks are listed in document order, so a block's descendants directly follow it.
+    """
+
+    text: str
+    """The original text"""
+    preamble_end: int
+    """Offset of the end of the text before the first block, e.g. page properties or a header"""
+    blocks: list[LogseqBlock]
+    page_properties: dict[str, str] = field(default_factory=dict)
+    """Properties in the preamble"""
+
+    def roots(self) -> Iterator[LogseqBlock]:
+        """Yield root-level blocks, in document order."""
+        return (block for block in self.blocks if block.parent == -1)
+
+    def block_content(self, block: LogseqBlock, include_children: bool = True) -> str:
+        """Return the stripped content of a block, without its bullet marker."""
+        end = block.subtree_end if include_children else block.end
+        return self.text[block.content_start : end].strip()
+
+    def section_spans(self) -> Iterator[tuple[int, int]]:
+        """
+        Yield `(start, end)` offsets of each non-empty section, with surrounding whitespace excluded.
+        Sections are the preamble, and each root-level block (without its bullet marker) with its descendants.
+        """
+        spans = [(0, self.preamble_end)]
+        spans.extend((block.content_start, block.subtree_end) for block in self.roots())
+        for start, end in spans:
+            if (span := _strip_span(self.text, start, end)) is not None:
+                yield span
+
+    def sections(self) -> Iterator[str]:
+        """Yield the stripped text of each non-empty section. See `section_spans`."""
+        for start, end in self.section_spans():
+            yield self.text[start:end]
+
+
+def parse_outline(text: str) -> LogseqOutline:
+    """
+    Parse Logseq markdown into a block tree, in a single pass over the text.
+
+    A block starts at a line whose first non-whitespace character is a bullet marker `-`, unless it is
+    part of a horizontal rule (`---`), or inside a fenced code block. Nesting is determined by indentation.
+    Any other line continues the current block; `key:: value` lines are recorded as its properties.
+    """
+    blocks: list[LogseqBlock] = []
+    # (indentation width, block index) of the current block & its ancestors
+    stack: list[tuple[int, int]] = []
+    page_properties: dict[str, str] = {}
+    preamble_end = len(text)
+    in_fence = False
+
+    line_start = 0
+    text_len = len(text)
+    while line_start < text_len:
+        line_end = text.find("\n", line_start)
+        if line_end == -1:
+            line_end = text_len
+
+        content_offset = line_start
+        while content_offset < line_end and text[content_offset] in " \t":
+            content_offset += 1
+        is_bullet = (
+            not in_fence
+            and content_offset < line_end
+            and text[content_offset] == "-"
+            and not text.startswith("-", content_offset + 1, line_end)
+        )
+
+        if is_bullet:
+            indent = len(text[line_start:content_offset].expandtabs(_TAB_WIDTH))
+            if blocks:
+                blocks[-1].end = line_start
+            else:
+                preamble_end = line_start
+            while stack and stack[-1][0] >= indent:
+                blocks[stack.pop()[1]].subtree_end = line_start
+            blocks.append(
+                LogseqBlock(
+                    start=line_start,
+                    content_start=content_offset + 1,
+                    end=text_len,
+                    subtree_end=text_len,
+                    depth=len(stack),
+                    parent=stack[-1][1] if stack else -1,
+                )
+            )
+            stack.append((indent, len(blocks) - 1))
+            content_offset += 1
+            while content_offset < line_end and text[content_offset] in " \t":
+                content_offset += 1
+        elif not in_fence and (
+            match := _PROPERTY_PATTERN.fullmatch(text, content_offset, line_end)
+        ):
+            properties = blocks[-1].properties if blocks else page_properties
+            properties[match.group(1)] = match.group(2).strip()
+
+        if text.startswith("```", content_offset, line_end):
+            in_fence = not in_fence
+        line_start = line_end + 1
+
+    return LogseqOutline(
+        text=text,
+        preamble_end=preamble_end,
+        blocks=blocks,
+        page_properties=page_properties,
+    )
+
+
+def _strip_span(text: str, start: int, end: int) -> tuple[int, int] | None:
+    """Narrow `[start, end)` to exclude surrounding whitespace. Return `None` if nothing is left."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return (start, end) if start < end else None
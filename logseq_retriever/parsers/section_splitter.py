@@ -0,0 +1,111 @@
+import re
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+
+from logseq_retriever.parsers.outline_parser import parse_outline
+
+_SENTENCE_END_PATTERN = re.compile(r"[.!?]\s|\n")
+"""A sentence ends after terminal punctuation followed by whitespace, or at a line break"""
+
+_WHITESPACE_PATTERN = re.compile(r"\s")
+
+
+def split_section(text: str, max_chars: int) -> Iterator[str]:
+    """
+    Split a section into stripped, non-empty pieces of at most `max_chars` characters each.
+
+    Each piece is cut at the last boundary that fits, preferring, in order:
+    1. the start of a nested block
+    2. the end of a sentence
+    3. whitespace
+    and only cutting mid-word if there is no boundary at all.
+    Boundaries are found in one pass over the text, so the cost is linear in its length.
+    """
+    if max_chars < 1:
+        raise ValueError("max_chars must be at least 1")
+    if len(text) <= max_chars:
+        if stripped := text.strip():
+            yield stripped
+        return
+
+    # offsets at which a new piece may start, by preference
+    block_starts = [block.start for block in parse_outline(text).blocks]
+    sentence_starts = [match.end() for match in _SENTENCE_END_PATTERN.finditer(text)]
+    whitespace_starts = [match.end() for match in _WHITESPACE_PATTERN.finditer(text)]
+
+    start = 0
+    while len(text) - start > max_chars:
+        limit = start + max_chars
+        end = limit
+        for boundaries in (block_starts, sentence_starts, whitespace_starts):
+            # rightmost boundary within (start, limit]
+            i = bisect_right(boundaries, limit) - 1
+            if i >= 0 and boundaries[i] > start:
+                end = boundaries[i]
+                break
+        if piece := text[start:end].strip():
+            yield piece
+        start = end
+    if piece := text[start:].strip():
+        yield piece
+
+
+def merge_sections(
+    sections: Iterable[str], min_chars: int, max_chars: int, separator: str = "\n- "
+) -> Iterator[str]:
+    """
+    Merge adjacent sections shorter than `min_chars`, joined by `separator`, as long as the merged
+    section does not exceed `max_chars`. Sections are otherwise passed through unchanged.
+    The default `separator` restores the root-level bullet marker between sections of a journal.
+    """
+    return _merge_pieces(
+        ((section, False) for section in sections), min_chars, max_chars, separator
+    )
+
+
+def _merge_pieces(
+    pieces: Iterable[tuple[str, bool]], min_chars: int, max_chars: int, separator: str
+) -> Iterator[str]:
+    """
+    `merge_sections` over `(piece, continues)` pairs. A piece that `continues` the section of the previous
+    one, i.e. was split off it by `split_section`, is joined to it by a line break rather than `separator`,
+    so no bullet marker is added mid-block.
+    """
+    buffer: str | None = None
+    for piece, continues in pieces:
+        joiner = "\n" if continues else separator
+        if buffer is None:
+            buffer = piece
+        elif (
+            len(buffer) < min_chars
+            and len(buffer) + len(joiner) + len(piece) <= max_chars
+        ):
+            buffer = f"{buffer}{joiner}{piece}"
+        else:
+            yield buffer
+            buffer = piece
+    if buffer is not None:
+        yield buffer
+
+
+def resize_sections(
+    sections: Iterable[str], max_chars: int, min_chars: int = 0
+) -> Iterator[str]:
+    """
+    Split sections longer than `max_chars` with `split_section`, then, if `min_chars` is set, merge tiny
+    adjacent sections with `merge_sections`. Lazy, so only one section is held at a time.
+    """
+    if min_chars > 0:
+        return _merge_pieces(
+            (
+                (piece, i > 0)
+                for section in sections
+                for i, piece in enumerate(split_section(section, max_chars))
+            ),
+            min_chars,
+            max_chars,
+            "\n- ",
+        )
+    return (
+        piece for section in sections for piece in split_section(section, max_chars)
+    )
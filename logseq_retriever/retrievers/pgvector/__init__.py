@@ -0,0 +1,5 @@
+from logseq_retriever.retrievers.pgvector.journal_search_client import (
+    JournalSearchClient,
+)
+
+__all__ = ["JournalSearchClient"]
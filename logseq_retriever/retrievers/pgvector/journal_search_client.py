@@ -0,0 +1,158 @@
+import operator
+from datetime import date
+from logging import getLogger
+from typing import Any
+
+from pgvector_template.core import BaseSearchClient
+from pgvector_template.models.search import MetadataFilter, RetrievalResult, SearchQuery
+from sqlalchemy import ColumnElement, exists, select, text
+from sqlalchemy.orm import Session
+
+from logseq_retriever.models.journal_pgvector import (
+    JournalDocumentBase,
+    JournalSearchClientConfig,
+)
+
+HNSW_DEFAULT_EF_SEARCH = 40
+"""pgvector's default `hnsw.ef_search`. An HNSW index scan returns at most this many rows"""
+DATE_COMPARISONS = {
+    "eq": operator.eq,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+"""`MetadataFilter` conditions on `date_str` pushed down to `journal_date`"""
+
+logger = getLogger(__name__)
+
+
+class JournalSearchClient(BaseSearchClient):
+    """
+    Searches Logseq journal `Document`s. With `binary_rerank` set in the config, semantic searches run in
+    2 stages: `limit * rerank_multiplier` candidates are picked by Hamming distance over the ANN index of
+    `embedding_bits`, then reranked by the exact cosine distance of their full-precision `embedding`.
+    Rows without `embedding_bits`, e.g. uploaded before the column existed, could never be candidates, so
+    until `JournalCorpusManager.backfill_embedding_bits` has filled them in, searches skip the first stage.
+
+    `ef_search` & `probes` in the config tune the index scans of semantic searches, for the current transaction.
+
+    Metadata filters on `date_str` are applied to the typed, indexed `journal_date` column instead, and
+    `contains` filters, e.g. on `references`, `tags` or `anchor_ids`, test containment in the whole
+    `document_metadata`, which its GIN indexes support.
+    """
+
+    def __init__(self, session: Session, config: JournalSearchClientConfig):
+        super().__init__(session, config)
+        self._all_bits: bool | None = None
+        """Whether every embedded row has `embedding_bits`. `None` until checked"""
+
+    @property
+    def config(self) -> JournalSearchClientConfig:
+        return self._cfg  # ty: ignore[invalid-return-type]
+
+    def search(self, query: SearchQuery) -> list[RetrievalResult]:
+        if not query.text:
+            return super().search(query)
+        cls = self.config.document_cls
+        if self.config.binary_rerank and not hasattr(cls, "embedding_bits"):
+            raise ValueError(
+                f"{cls.__name__} has no `embedding_bits` for binary rerank"
+            )
+        if not self.config.binary_rerank or not self._has_all_bits():
+            self._tune_index_scan(query.limit)
+            return super().search(query)
+
+        query_embedding = self.embedding_provider.embed_text(query.text)
+        query_bits = JournalDocumentBase.binary_quantize(query_embedding)
+        # the exact distance is computed for the candidates only, in a derived table: ordering the
+        # outer query by `embedding <=> ...` would let the planner scan the `embedding` index instead
+        candidates = select(
+            cls.id,
+            cls.embedding.cosine_distance(query_embedding).label("_score_distance"),
+        ).order_by(
+            cls.embedding_bits.hamming_distance(query_bits)  # ty: ignore[unresolved-attribute]
+        )
+        candidates = self._apply_keyword_search(candidates, query)
+        candidates = self._apply_metadata_filters(candidates, query)
+        candidate_count = query.limit * self.config.rerank_multiplier
+        candidates = candidates.limit(candidate_count).subquery("candidates")
+
+        db_query = (
+            select(cls, candidates.c._score_distance)
+            .join(candidates, cls.id == candidates.c.id)
+            .order_by(candidates.c._score_distance)
+            .limit(query.limit)
+        )
+        self._tune_index_scan(candidate_count)
+        rows = self.session.execute(db_query).all()
+        return self._convert_to_retrieval_results(rows)
+
+    def _has_all_bits(self) -> bool:
+        """Check whether every embedded row has `embedding_bits`, until it's true: new rows always do."""
+        if self._all_bits:
+            return True
+        cls = self.config.document_cls
+        missing = self.session.scalar(
+            select(
+                exists().where(
+                    cls.embedding_bits.is_(None),  # ty: ignore[unresolved-attribute]
+                    cls.embedding.is_not(None),
+                )
+            )
+        )
+        if missing and self._all_bits is None:
+            logger.warning(
+                f"Rows of {cls.__tablename__} have no `embedding_bits`; searching without binary rerank "
+                "until `backfill_embedding_bits` has filled them in"
+            )
+        self._all_bits = not missing
+        return self._all_bits
+
+    def _build_metadata_filter_where_condition(
+        self, filter_obj: MetadataFilter
+    ) -> ColumnElement[bool]:
+        if filter_obj.condition == "contains":
+            return self._build_containment_condition(filter_obj)
+        if filter_obj.field_name != "date_str" or filter_obj.condition == "exists":
+            return super()._build_metadata_filter_where_condition(filter_obj)
+        journal_date = self.config.document_cls.journal_date  # ty: ignore[unresolved-attribute]
+        try:
+            if filter_obj.condition == "in":
+                return journal_date.in_(
+                    [date.fromisoformat(v) for v in filter_obj.value]
+                )
+            compare = DATE_COMPARISONS[filter_obj.condition]
+            return compare(journal_date, date.fromisoformat(filter_obj.value))
+        except (KeyError, TypeError, ValueError):
+            # not an ISO date, or not a comparison; match the metadata as usual
+            return super()._build_metadata_filter_where_condition(filter_obj)
+
+    def _build_containment_condition(
+        self, filter_obj: MetadataFilter
+    ) -> ColumnElement[bool]:
+        """
+        `document_metadata @> '{"references": ["cookout"]}'`, rather than the equivalent
+        `document_metadata -> 'references' @> '["cookout"]'`, which no index on the column can serve.
+        """
+        contained: Any = [filter_obj.value]
+        for part in reversed(filter_obj.field_name.split(".")):
+            contained = {part: contained}
+        return self.config.document_cls.document_metadata.contains(contained)
+
+    def _tune_index_scan(self, rows: int) -> None:
+        """Set the index search parameters of the current transaction, to return up to `rows` rows."""
+        settings = {}
+        ef_search = self.config.ef_search
+        if ef_search is not None or rows > HNSW_DEFAULT_EF_SEARCH:
+            settings["hnsw.ef_search"] = min(
+                max(ef_search or HNSW_DEFAULT_EF_SEARCH, rows), 1000
+            )
+        if self.config.probes is not None:
+            settings["ivfflat.probes"] = self.config.probes
+        for name, value in settings.items():
+            # `SET LOCAL` takes no bind parameters; `set_config(..., true)` is its equivalent
+            self.session.execute(
+                text("SELECT set_config(:name, :value, true)"),
+                {"name": name, "value": str(value)},
+            )
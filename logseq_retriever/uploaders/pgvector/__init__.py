@@ -1,9 +1,33 @@
+from logseq_retriever.uploaders.pgvector.cached_embedding_provider import (
+    CachedEmbeddingProvider,
+    EmbeddingCacheStats,
+)
 from logseq_retriever.uploaders.pgvector.journal_corpus_manager import (
+    JournalBulkInsertResult,
+    JournalCorpus,
     JournalCorpusManagerConfig,
     JournalCorpusManager,
+    JournalShard,
+    JournalShardedResult,
+    JournalSyncResult,
+)
+from logseq_retriever.uploaders.pgvector.journal_ingestion_pipeline import (
+    JournalIngestionPipeline,
+    JournalIngestionPipelineConfig,
 )
+from logseq_retriever.uploaders.pgvector.upload_checkpoint import UploadCheckpoint
 
 __all__ = [
+    "CachedEmbeddingProvider",
+    "EmbeddingCacheStats",
+    "JournalBulkInsertResult",
+    "JournalCorpus",
     "JournalCorpusManagerConfig",
     "JournalCorpusManager",
+    "JournalIngestionPipeline",
+    "JournalIngestionPipelineConfig",
+    "JournalShard",
+    "JournalShardedResult",
+    "JournalSyncResult",
+    "UploadCheckpoint",
 ]
@@ -0,0 +1,222 @@
+import hashlib
+import json
+import sqlite3
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+
+from pgvector_template.core.embedder import BaseEmbeddingProvider
+
+
+@dataclass(frozen=True)
+class EmbeddingCacheStats:
+    """Snapshot of a `CachedEmbeddingProvider`'s counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    """Number of embeddings currently stored"""
+    max_entries: int | None
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CachedEmbeddingProvider(BaseEmbeddingProvider):
+    """
+    Wraps any `BaseEmbeddingProvider` with a persistent, content-addressed cache of embeddings, stored in
+    a single SQLite file, so re-embedding byte-identical text is free across runs.
+
+    Entries are keyed by the provider's whole `get_embedding_config()`, its dimensions & the sha256 of the
+    text, so e.g. `float` & `int8` embeddings of the same model never mix. Vectors are stored as float32
+    blobs, the precision pgvector stores them at. If `max_entries` is set, the least recently used entries
+    are evicted beyond it. Other tables of the file are left alone.
+
+    Misses of an `embed_batch` call are embedded `batch_size` at a time, by default the wrapped provider's
+    `max_batch_texts` (about 1 request), up to `max_concurrency` sub-batches at once. Each sub-batch is
+    stored as soon as it returns, so an error part-way through loses only the sub-batches in flight.
+    """
+
+    def __init__(
+        self,
+        provider: BaseEmbeddingProvider,
+        db_path: str,
+        max_entries: int | None = None,
+        batch_size: int | None = None,
+        max_concurrency: int = 1,
+        **kwargs,
+    ):
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        super().__init__(model_id=provider.model_id, **kwargs)
+        self.provider = provider
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.batch_size: int | None = batch_size or getattr(
+            provider, "max_batch_texts", None
+        )
+        self.max_concurrency = max_concurrency
+        self._config_key = json.dumps(
+            {
+                "model": provider.model_id,
+                "dimensions": provider.get_dimensions(),
+                **provider.get_embedding_config(),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        self._hits = self._misses = self._evictions = 0
+        # connections are shared across threads, and serialized by `_lock`
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embedding_cache (
+                    config_key TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (config_key, text_hash)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS embedding_cache_last_used_idx "
+                "ON embedding_cache (last_used)"
+            )
+
+    def get_embedding_config(self) -> dict[str, Any]:
+        return self.provider.get_embedding_config()
+
+    def get_dimensions(self) -> int:
+        return self.provider.get_dimensions()
+
+    def embed_text(self, text: str) -> list[float]:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        hashes = [_hash_text(text) for text in texts]
+        vectors = self._lookup(set(hashes))
+        # identical texts within the batch are embedded once
+        miss_texts = {h: text for h, text in zip(hashes, texts) if h not in vectors}
+        with self._lock:
+            self._hits += len(texts) - len(miss_texts)
+            self._misses += len(miss_texts)
+        if miss_texts:
+            vectors.update(self._embed_misses(miss_texts))
+        return [vectors[h] for h in hashes]
+
+    def _embed_misses(self, texts: dict[str, str]) -> dict[str, list[float]]:
+        """Embed texts by hash, in sub-batches of `batch_size`, storing each as soon as it returns."""
+        items = list(texts.items())
+        size = self.batch_size or len(items)
+        batches = [dict(items[i : i + size]) for i in range(0, len(items), size)]
+        if self.max_concurrency > 1 and len(batches) > 1:
+            # leaving the pool waits for the other sub-batches, so they're stored even if one fails
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_concurrency, len(batches))
+            ) as pool:
+                results = list(pool.map(self._embed_and_store, batches))
+        else:
+            results = [self._embed_and_store(batch) for batch in batches]
+        return {h: vector for result in results for h, vector in result.items()}
+
+    def _embed_and_store(self, texts: dict[str, str]) -> dict[str, list[float]]:
+        vectors = self.provider.embed_batch(list(texts.values()))
+        if len(vectors) != len(texts):
+            raise ValueError("Number of embeddings does not match number of texts")
+        fresh = dict(zip(texts, vectors))
+        self._store(fresh)
+        return fresh
+
+    def _lookup(self, hashes: set[str]) -> dict[str, list[float]]:
+        """Return stored vectors by text hash, and mark them as recently used."""
+        if not hashes:
+            return {}
+        found: dict[str, list[float]] = {}
+        hash_list = list(hashes)
+        with self._lock, self._conn:
+            # stay below SQLite's limit on bound parameters
+            for start in range(0, len(hash_list), 500):
+                chunk = hash_list[start : start + 500]
+                rows = self._conn.execute(
+                    "SELECT text_hash, vector FROM embedding_cache WHERE config_key = ? "
+                    f"AND text_hash IN ({', '.join('?' * len(chunk))})",
+                    (self._config_key, *chunk),
+                ).fetchall()
+                found.update((h, _decode_vector(blob)) for h, blob in rows)
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embedding_cache SET last_used = ? "
+                    "WHERE config_key = ? AND text_hash = ?",
+                    [(now, self._config_key, h) for h in found],
+                )
+        return found
+
+    def _store(self, vectors: dict[str, list[float]]) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache VALUES (?, ?, ?, ?)",
+                [
+                    (self._config_key, h, _encode_vector(vector), now)
+                    for h, vector in vectors.items()
+                ],
+            )
+            if self.max_entries is not None:
+                (size,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM embedding_cache"
+                ).fetchone()
+                if (excess := size - self.max_entries) > 0:
+                    self._conn.execute(
+                        "DELETE FROM embedding_cache WHERE rowid IN "
+                        "(SELECT rowid FROM embedding_cache ORDER BY last_used LIMIT ?)",
+                        (excess,),
+                    )
+                    self._evictions += excess
+
+    @property
+    def stats(self) -> EmbeddingCacheStats:
+        with self._lock:
+            (size,) = self._conn.execute(
+                "SELECT COUNT(*) FROM embedding_cache"
+            ).fetchone()
+            return EmbeddingCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=size,
+                max_entries=self.max_entries,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _encode_vector(vector: list[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _decode_vector(blob: bytes) -> list[float]:
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector.tolist()
@@ -1,17 +1,53 @@
-import re
+import hashlib
+import json
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import cached_property
+from itertools import islice, pairwise
+from logging import getLogger
+from multiprocessing import get_context
 from typing import Any, Type
+from uuid import UUID
 
 from pgvector_template.core import (
     BaseCorpusManager,
     BaseCorpusManagerConfig,
     BaseDocument,
     BaseDocumentMetadata,
+    BaseDocumentOptionalProps,
 )
+from pydantic import Field
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Date,
+    Index,
+    MetaData,
+    Table,
+    Update,
+    func,
+    insert,
+    text,
+    true,
+    update,
+)
+from sqlalchemy.schema import CreateIndex, DropIndex
 
 from logseq_retriever.models.journal_pgvector import (
     JournalDocument,
+    JournalDocumentBase,
     JournalDocumentMetadata,
+    VectorIndexConfig,
 )
+from logseq_retriever.parsers.metadata_extractor import extract_chunk_metadata
+from logseq_retriever.parsers.outline_parser import parse_outline
+from logseq_retriever.parsers.section_splitter import resize_sections
+
+logger = getLogger(__name__)
 
 
 class JournalCorpusManagerConfig(BaseCorpusManagerConfig):
@@ -23,50 +59,810 @@ class JournalCorpusManagerConfig(BaseCorpusManagerConfig):
     """Class to use for the document model"""
     document_metadata_cls: Type[BaseDocumentMetadata] = JournalDocumentMetadata
     """Class to use for the document metadata model"""
+    max_chunk_length: int | None = Field(default=None, ge=1)
+    """Chunks longer than this many characters are split, to bound embedding payloads. `None` disables"""
+    min_chunk_length: int = Field(default=0, ge=0)
+    """Adjacent chunks shorter than this are merged, up to `max_chunk_length`. `0` disables"""
+    validate_metadata: bool = True
+    """Validate each chunk's metadata against `document_metadata_cls`. Disable for trusted bulk loads"""
+    vector_index: VectorIndexConfig | None = None
+    """ANN indexes built by `rebuild_vector_indexes`, and whose `columns` `ensure_indexes` keeps. `None` uses
+    the document class's `vector_index`"""
+    collection_name: str | None = None
+    """Collection whose stored corpora `sync_corpora` compares & deletes. `None` matches every collection"""
     # embedding_provider: BaseEmbeddingProvider # is still required
 
 
+@dataclass
+class JournalCorpus:
+    """A journal corpus to upload: the content of a single day, with its metadata."""
+
+    content: str
+    corpus_metadata: dict[str, Any]
+    """Metadata matching `JournalCorpusMetadata`; `date_str` is used as the corpus ID"""
+    optional_props: BaseDocumentOptionalProps | None = None
+
+    @property
+    def corpus_id(self) -> str:
+        return self.corpus_metadata["date_str"]
+
+
+@dataclass(frozen=True)
+class JournalSyncResult:
+    """Outcome of `JournalCorpusManager.sync_corpora`."""
+
+    inserted: int
+    """Corpora that were new or changed, and (re-)inserted"""
+    skipped: int
+    """Corpora whose stored hash matched, so they were neither split, embedded nor written"""
+    deleted: int
+    """Stored corpora whose journal no longer exists, or is empty, and were deleted"""
+
+
+@dataclass(frozen=True)
+class JournalBulkInsertResult:
+    """Outcome of `JournalCorpusManager.insert_corpora`."""
+
+    corpora: int
+    rows: int
+    embedded: int
+    """Chunks sent to the embedding provider"""
+    reused: int
+    """Chunks whose stored vector was reused"""
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class JournalShard:
+    """A contiguous date range of journals, uploaded by a single worker process."""
+
+    start_date: str
+    end_date: str
+    """Inclusive, format: YYYY-MM-DD"""
+    journals: int
+    bytes: int
+
+
+@dataclass(frozen=True)
+class JournalShardedResult:
+    """Outcome of `JournalCorpusManager.run_shards`: per-shard results, and errors of failed shards."""
+
+    results: dict[JournalShard, JournalBulkInsertResult]
+    errors: dict[JournalShard, str]
+    seconds: float
+
+    @property
+    def corpora(self) -> int:
+        return sum(result.corpora for result in self.results.values())
+
+    @property
+    def rows(self) -> int:
+        return sum(result.rows for result in self.results.values())
+
+
+_BULK_INSERT_COLUMNS = (
+    "corpus_id",
+    "chunk_index",
+    "content",
+    "embedding",
+    "embedding_config",
+    "content_hash",
+    "title",
+    "document_metadata",
+    "collection",
+    "origin_url",
+    "language",
+    "journal_date",
+)
+"""Columns set by `BaseDocument.from_props` & `_create_documents`; the rest are filled by column defaults"""
+
+
 class JournalCorpusManager(BaseCorpusManager):
     """
     CorpusManager declaration for Logseq journals. Each `Corpus` is the entire entry for a given date.
     """
 
-    def _split_corpus(self, content: str, **kwargs) -> list[str]:
-        """Split the journal file on root-level bullet points"""
-        split_content = content.split("\n-")
-        return [
-            cleaned_chunk
-            for chunk in split_content
-            if (cleaned_chunk := chunk.strip().removeprefix("-").removeprefix(" "))
+    @staticmethod
+    def hash_corpus(content: str, settings: str = "") -> str:
+        return hashlib.sha256(f"{settings}\0{content}".encode()).hexdigest()
+
+    def corpus_hash(self, content: str) -> str:
+        """
+        Hash of `content`, along with the settings that shape its stored chunks: the embedding config,
+        chunk lengths & metadata schema version. Changing any of them changes every `corpus_hash`, so
+        `sync_corpora` rewrites journals whose content is unchanged.
+        """
+        return self.hash_corpus(content, self._hash_settings)
+
+    @cached_property
+    def _hash_settings(self) -> str:
+        provider = self.config.embedding_provider
+        metadata_fields = self.config.document_metadata_cls.model_fields
+        return json.dumps(
+            {
+                "embedding_config": provider.get_embedding_config()
+                if provider
+                else None,
+                "max_chunk_length": self.config.max_chunk_length,
+                "min_chunk_length": self.config.min_chunk_length,
+                "schema_version": metadata_fields["schema_version"].default,
+            },
+            sort_keys=True,
+            default=str,
+        )
+
+    @staticmethod
+    def plan_shards(
+        journal_sizes: list[tuple[date, int]],
+        shard_count: int,
+        start_date: date,
+        end_date: date,
+    ) -> list[JournalShard]:
+        """
+        Partition `[start_date, end_date]` into at most `shard_count` contiguous, disjoint date ranges, so
+        that the largest shard has as few journal bytes as possible. `journal_sizes` are `(date, bytes)`
+        of the journals in range, in date order. Returns fewer shards if there are fewer journals.
+        """
+        if shard_count < 1:
+            raise ValueError("shard_count must be at least 1")
+        if not journal_sizes:
+            return []
+
+        def pack(capacity: int) -> list[int]:
+            """Greedily fill shards up to `capacity` bytes. Return the index each shard starts at."""
+            starts, filled = [0], 0
+            for i, (_, size) in enumerate(journal_sizes):
+                if filled + size > capacity and filled:
+                    starts.append(i)
+                    filled = 0
+                filled += size
+            return starts
+
+        # binary search the smallest capacity that packs into `shard_count` shards
+        sizes = [size for _, size in journal_sizes]
+        lo, hi = max(sizes), sum(sizes)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if len(pack(mid)) <= shard_count:
+                hi = mid
+            else:
+                lo = mid + 1
+        starts = pack(lo) + [len(journal_sizes)]
+
+        shards = []
+        for n, (first, stop) in enumerate(pairwise(starts)):
+            # shards tile the whole range, so journals between shards' first dates are never orphaned
+            shard_start = start_date if n == 0 else journal_sizes[first][0]
+            shard_end = (
+                end_date
+                if stop == len(journal_sizes)
+                else journal_sizes[stop][0] - timedelta(days=1)
+            )
+            shards.append(
+                JournalShard(
+                    start_date=shard_start.isoformat(),
+                    end_date=shard_end.isoformat(),
+                    journals=stop - first,
+                    bytes=sum(sizes[first:stop]),
+                )
+            )
+        return shards
+
+    @staticmethod
+    def run_shards(
+        shards: list[JournalShard],
+        upload_shard: Callable[[JournalShard], JournalBulkInsertResult],
+        processes: int,
+    ) -> JournalShardedResult:
+        """
+        Run `upload_shard` on each shard, in a pool of `processes` worker processes. `upload_shard` must be
+        picklable, e.g. a module-level function, and set up its own DB session & embedding provider.
+        A failed shard does not stop the others; its error is returned in `JournalShardedResult.errors`.
+        """
+        ordered = sorted(shards, key=lambda shard: shard.start_date)
+        for prev, shard in pairwise(ordered):
+            if shard.start_date <= prev.end_date:
+                raise ValueError(
+                    f"Shards overlap, and would upload corpora twice: {prev}, {shard}"
+                )
+
+        started = time.perf_counter()
+        results: dict[JournalShard, JournalBulkInsertResult] = {}
+        errors: dict[JournalShard, str] = {}
+        total_bytes = sum(shard.bytes for shard in shards) or 1
+        done_bytes = 0
+        # spawn, so workers never inherit the parent's DB connections or client threads
+        with ProcessPoolExecutor(
+            max_workers=processes, mp_context=get_context("spawn")
+        ) as pool:
+            futures = {pool.submit(upload_shard, shard): shard for shard in shards}
+            for future in as_completed(futures):
+                shard = futures[future]
+                done_bytes += shard.bytes
+                try:
+                    results[shard] = result = future.result()
+                    logger.info(
+                        f"Shard {shard.start_date}..{shard.end_date} done: {result.rows} rows "
+                        f"from {result.corpora} corpora ({done_bytes / total_bytes:.0%} of bytes)"
+                    )
+                except Exception as e:
+                    errors[shard] = f"{type(e).__name__}: {e}"
+                    logger.exception(
+                        f"Shard {shard.start_date}..{shard.end_date} failed"
+                    )
+
+        result = JournalShardedResult(
+            results=results, errors=errors, seconds=time.perf_counter() - started
+        )
+        logger.info(
+            f"Uploaded {result.rows} rows from {result.corpora} corpora in {len(results)} shards "
+            f"({len(errors)} failed) in {result.seconds:.1f}s"
+        )
+        return result
+
+    def sync_corpora(
+        self,
+        corpora: Iterable[JournalCorpus],
+        start_date: str | None = None,
+        end_date: str | None = None,
+        batch_size: int = 500,
+    ) -> JournalSyncResult:
+        """
+        Incrementally sync journal corpora: only corpora whose `corpus_hash` differs from the stored one
+        are split, embedded & replaced. `corpora` are streamed `batch_size` at a time, and the stored
+        hashes of each batch are loaded in a single query. Corpora left without any chunk, e.g. journals
+        emptied in place, have their stored rows deleted.
+        If `start_date` & `end_date` are set, stored corpora in that range (inclusive) that are not among
+        `corpora` are considered removed from disk, and bulk-deleted.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        corpora = iter(corpora)
+        present_ids: set[str] = set()
+        inserted = skipped = deleted = 0
+        while batch := list(islice(corpora, batch_size)):
+            present_ids.update(c.corpus_id for c in batch)
+            stored_hashes = self._load_corpus_hashes([c.corpus_id for c in batch])
+            for corpus in batch:
+                corpus_hash = self.corpus_hash(corpus.content)
+                if stored_hashes.get(corpus.corpus_id) == {corpus_hash}:
+                    skipped += 1
+                    continue
+                result = self.insert_corpus(
+                    corpus.content,
+                    corpus.corpus_metadata | {"corpus_hash": corpus_hash},
+                    corpus.optional_props,
+                    corpus_id=corpus.corpus_id,
+                )
+                if result.total:
+                    inserted += 1
+                elif corpus.corpus_id in stored_hashes:
+                    self._delete_emptied_corpus(corpus.corpus_id)
+                    deleted += 1
+
+        if start_date is not None and end_date is not None:
+            deleted += self._delete_missing_corpora(start_date, end_date, present_ids)
+        logger.info(
+            f"Synced {len(present_ids)} corpora: {inserted} inserted, {skipped} unchanged, {deleted} deleted"
+        )
+        return JournalSyncResult(inserted=inserted, skipped=skipped, deleted=deleted)
+
+    def insert_corpora(
+        self,
+        corpora: Iterable[JournalCorpus],
+        commit_every: int = 1000,
+        on_commit: Callable[[list[str]], None] | None = None,
+    ) -> JournalBulkInsertResult:
+        """
+        Bulk insert journal corpora, replacing any stored rows of the same corpus IDs. Rows are accumulated
+        across corpora, and flushed once at least `commit_every` are pending: all their chunks are embedded
+        in a single `embed_batch` call (reusing stored vectors of unchanged chunks), stored rows are deleted
+        in one statement, and new rows are written with one batched executemany `INSERT`, in a single
+        transaction. Each corpus is written whole, within a single flush.
+
+        `on_commit` is called with the IDs of the corpora each flush committed, e.g. to checkpoint progress.
+        Corpora without any chunks count as committed with the next flush.
+        """
+        if commit_every < 1:
+            raise ValueError("commit_every must be at least 1")
+        started = time.perf_counter()
+        pending: list[tuple[str, list[BaseDocument]]] = []
+        pending_ids: list[str] = []
+        pending_rows = corpus_count = rows = embedded = reused = 0
+        for corpus in corpora:
+            corpus_count += 1
+            pending_ids.append(corpus.corpus_id)
+            documents = self._prepare_corpus(corpus)
+            if not documents:
+                continue
+            pending.append((corpus.corpus_id, documents))
+            pending_rows += len(documents)
+            if pending_rows >= commit_every:
+                flushed, flushed_embedded = self._flush_corpora(pending)
+                rows += flushed
+                embedded += flushed_embedded
+                reused += flushed - flushed_embedded
+                if on_commit is not None:
+                    on_commit(pending_ids)
+                pending, pending_ids, pending_rows = [], [], 0
+                self._log_bulk_progress(rows, started)
+        if pending:
+            flushed, flushed_embedded = self._flush_corpora(pending)
+            rows += flushed
+            embedded += flushed_embedded
+            reused += flushed - flushed_embedded
+        if pending_ids and on_commit is not None:
+            on_commit(pending_ids)
+
+        result = JournalBulkInsertResult(
+            corpora=corpus_count,
+            rows=rows,
+            embedded=embedded,
+            reused=reused,
+            seconds=time.perf_counter() - started,
+        )
+        logger.info(
+            f"Bulk inserted {result.rows} rows from {result.corpora} corpora "
+            f"({result.embedded} embedded, {result.reused} reused) "
+            f"in {result.seconds:.1f}s, {result.rows_per_second:.0f} rows/s"
+        )
+        return result
+
+    def _prepare_corpus(self, corpus: JournalCorpus) -> list[BaseDocument]:
+        """Split a corpus into documents, without vectors, tagged with the corpus' `corpus_hash`."""
+        contents = self._split_corpus(corpus.content)
+        if not contents:
+            return []
+        corpus_metadata = corpus.corpus_metadata | {
+            "corpus_hash": self.corpus_hash(corpus.content)
+        }
+        return self._create_documents(
+            corpus.corpus_id,
+            contents,
+            [[]] * len(contents),
+            corpus_metadata,
+            corpus.optional_props,
+        )
+
+    def _flush_corpora(
+        self, pending: list[tuple[str, list[BaseDocument]]]
+    ) -> tuple[int, int]:
+        """Embed, delete & insert the pending corpora in one transaction. Return rows written & embedded."""
+        corpus_ids = [corpus_id for corpus_id, _ in pending]
+        documents = [doc for _, docs in pending for doc in docs]
+        contents = [doc.content for doc in documents]
+        chunk_hashes = [doc.content_hash for doc in documents]
+        try:
+            reusable = self._load_reusable_embeddings(corpus_ids, chunk_hashes)
+            embedded = self._attach_embeddings(
+                documents, contents, chunk_hashes, reusable
+            )
+        except Exception:
+            self.session.rollback()
+            raise
+        self._write_corpora(corpus_ids, documents)
+        return len(documents), embedded
+
+    def _load_reusable_embeddings(
+        self, corpus_ids: list[str], chunk_hashes: list[str]
+    ) -> dict[str, Any]:
+        """Stored vectors of the corpora, by the `content_hash` of their chunks among `chunk_hashes`."""
+        cls = self.config.document_cls
+        return dict(
+            self.session.query(cls.content_hash, cls.embedding)
+            .filter(
+                cls.corpus_id.in_(corpus_ids),
+                self._in_collection(),
+                cls.content_hash.in_(set(chunk_hashes)),
+                cls.embedding.is_not(None),
+            )
+            .all()
+        )
+
+    def _write_corpora(
+        self, corpus_ids: list[str], documents: list[BaseDocument]
+    ) -> None:
+        """Replace the stored rows of `corpus_ids` with `documents`, in one transaction."""
+        cls = self.config.document_cls
+        columns = _BULK_INSERT_COLUMNS
+        if self._quantize_documents(documents):
+            columns += ("embedding_bits",)
+        try:
+            self.session.query(cls).filter(
+                cls.corpus_id.in_(corpus_ids), self._in_collection()
+            ).delete(synchronize_session=False)
+            self.session.execute(
+                insert(cls),
+                [
+                    {column: getattr(doc, column) for column in columns}
+                    for doc in documents
+                ],
+            )
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+    def _replace_corpus(
+        self,
+        corpus_id: UUID | str,
+        documents: list[BaseDocument],
+        delete_existing: bool,
+    ) -> None:
+        self._quantize_documents(documents)
+        super()._replace_corpus(corpus_id, documents, delete_existing)
+
+    def _quantize_documents(self, documents: list[BaseDocument]) -> bool:
+        """Set the binary-quantized `embedding_bits` of documents, if the document class has them."""
+        if not hasattr(self.config.document_cls, "embedding_bits"):
+            return False
+        for doc in documents:
+            if doc.embedding is not None:
+                doc.embedding_bits = JournalDocumentBase.binary_quantize(doc.embedding)  # ty: ignore[unresolved-attribute]
+        return True
+
+    def backfill_embedding_bits(self) -> int:
+        """
+        Quantize the embeddings of rows stored without `embedding_bits`, e.g. before the column was added,
+        in one `UPDATE`. Return the number of rows updated.
+        """
+        cls = self.config.document_cls
+        bits = cls.embedding_bits  # ty: ignore[unresolved-attribute]
+        updated = self._backfill(
+            update(cls)
+            .where(bits.is_(None), cls.embedding.is_not(None))
+            .values(embedding_bits=func.binary_quantize(cls.embedding).cast(bits.type))
+        )
+        if updated:
+            logger.info(f"Quantized the embeddings of {updated} rows")
+        return updated
+
+    def backfill_journal_dates(self) -> int:
+        """
+        Set `journal_date` of rows stored without it, e.g. before the column was added, from their
+        `date_str` metadata, in one `UPDATE`. Return the number of rows updated.
+        """
+        cls = self.config.document_cls
+        updated = self._backfill(
+            update(cls)
+            .where(cls.journal_date.is_(None))  # ty: ignore[unresolved-attribute]
+            .values(journal_date=cls.document_metadata["date_str"].astext.cast(Date))
+        )
+        if updated:
+            logger.info(f"Set the journal date of {updated} rows")
+        return updated
+
+    def backfill_tags(self, batch_size: int = 1000) -> int:
+        """
+        Add `tags` to the metadata of rows stored without them, i.e. before metadata schema `2026-10-16`,
+        extracted from their content, `batch_size` rows per transaction. `references` are recomputed too,
+        since rows that old may predate page links in them. Return the number of rows updated.
+        """
+        cls = self.config.document_cls
+        metadata_fields = self.config.document_metadata_cls.model_fields
+        schema_version = metadata_fields["schema_version"].default
+        updated = 0
+        while rows := (
+            self.session.query(cls.id, cls.content, cls.document_metadata)
+            .filter(~cls.document_metadata.has_key("tags"))
+            .limit(batch_size)
+            .all()
+        ):
+            try:
+                # bulk UPDATE by primary key
+                self.session.execute(
+                    update(cls),
+                    [
+                        {
+                            "id": row_id,
+                            "document_metadata": metadata
+                            | {
+                                "references": chunk_metadata.references,
+                                "tags": chunk_metadata.tags,
+                                "schema_version": schema_version,
+                            },
+                        }
+                        for row_id, content, metadata in rows
+                        for chunk_metadata in [extract_chunk_metadata(content)]
+                    ],
+                )
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+                raise
+            updated += len(rows)
+        if updated:
+            logger.info(f"Added the tags of {updated} rows")
+        return updated
+
+    def _backfill(self, statement: Update) -> int:
+        try:
+            updated = self.session.execute(statement).rowcount
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return updated
+
+    @property
+    def vector_index(self) -> VectorIndexConfig:
+        return self.config.vector_index or self.config.document_cls.vector_index  # ty: ignore[unresolved-attribute]
+
+    @contextmanager
+    def without_vector_indexes(self) -> Iterator[None]:
+        """
+        Drop the ANN indexes for the duration of a bulk backfill, then rebuild them, even if it fails.
+        Building an index once over all rows is much faster than maintaining it on every insert.
+        """
+        self.drop_vector_indexes()
+        try:
+            yield
+        finally:
+            self.rebuild_vector_indexes()
+
+    def drop_vector_indexes(self) -> None:
+        """Drop the ANN indexes on `embedding` & `embedding_bits`, of either method."""
+        self._execute_ddl(
+            DropIndex(index, if_exists=True)
+            for index in self._vector_indexes(
+                VectorIndexConfig(method="hnsw"), VectorIndexConfig(method="ivfflat")
+            )
+        )
+
+    def rebuild_vector_indexes(self) -> None:
+        """(Re)build the ANN indexes as configured by `vector_index`, replacing existing ones."""
+        self.drop_vector_indexes()
+        started = time.perf_counter()
+        self._execute_ddl(
+            CreateIndex(index) for index in self._vector_indexes(self.vector_index)
+        )
+        logger.info(
+            f"Built {self.vector_index.method} indexes with {self.vector_index.storage_parameters} "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+    def ensure_indexes(self) -> None:
+        """
+        Create the indexes of `get_journal_indexes` missing from an existing table, e.g. one created before
+        they were declared, since `create_tables` only creates indexes along with new tables. The
+        `embedding_bits` ANN index is built as `vector_index` says, unless one of either method exists.
+        ANN indexes on columns `vector_index` leaves out are dropped. Safe to call on every run.
+        """
+        cls = self.config.document_cls
+        table = cls.__table__
+        existing = set(
+            self.session.execute(
+                text(
+                    "SELECT indexname FROM pg_indexes "
+                    "WHERE schemaname = :schema AND tablename = :table"
+                ),
+                {"schema": table.schema or "public", "table": table.name},
+            ).scalars()
+        )
+        bits_index_names = {
+            f"{table.name}_embedding_bits_{method}_idx"
+            for method in ("hnsw", "ivfflat")
+        }
+        indexes = [
+            index
+            for index in cls.get_journal_indexes(table.name)  # ty: ignore[unresolved-attribute]
+            if index.name not in bits_index_names
+        ]
+        if (
+            "embedding_bits" in self.vector_index.columns
+            and not existing & bits_index_names
+        ):
+            indexes.append(
+                cls.get_vector_index(table.name, self.vector_index, "embedding_bits")  # ty: ignore[unresolved-attribute]
+            )
+        missing = [index for index in indexes if index.name not in existing]
+        unwanted = [
+            index
+            for index in self._vector_indexes(
+                VectorIndexConfig(method="hnsw"), VectorIndexConfig(method="ivfflat")
+            )
+            if index.name in existing
+            and index.columns.keys()[0] not in self.vector_index.columns
         ]
+        if unwanted:
+            self._execute_ddl(DropIndex(index, if_exists=True) for index in unwanted)
+            logger.info(f"Dropped indexes {[index.name for index in unwanted]}")
+        if not missing:
+            return
+        started = time.perf_counter()
+        self._execute_ddl(
+            CreateIndex(index, if_not_exists=True)
+            for index in self._bind_indexes(missing)
+        )
+        logger.info(
+            f"Created indexes {[index.name for index in missing]} "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+    def _vector_indexes(self, *configs: VectorIndexConfig) -> list[Index]:
+        cls = self.config.document_cls
+        return self._bind_indexes(
+            index
+            for config in configs
+            for index in cls.get_vector_indexes(cls.__table__.name, config)  # ty: ignore[unresolved-attribute]
+        )
+
+    def _bind_indexes(self, indexes: Iterable[Index]) -> list[Index]:
+        """Bind `indexes` to a detached copy of the indexed columns, so the mapped table keeps its own."""
+        table = self.config.document_cls.__table__
+        indexes = list(indexes)
+        Table(
+            table.name,
+            MetaData(),
+            *(
+                Column(name, table.c[name].type)
+                for name in (
+                    "embedding",
+                    "embedding_bits",
+                    "journal_date",
+                    "document_metadata",
+                )
+            ),
+            *indexes,
+            schema=table.schema,
+        )
+        return indexes
+
+    def _execute_ddl(self, statements: Iterable[CreateIndex | DropIndex]) -> None:
+        try:
+            for statement in statements:
+                self.session.execute(statement)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+    @staticmethod
+    def _log_bulk_progress(rows: int, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Bulk inserted {rows} rows in {elapsed:.1f}s, {rows / elapsed if elapsed else 0:.0f} rows/s"
+        )
+
+    def _load_corpus_hashes(self, corpus_ids: list[str]) -> dict[str, set[str | None]]:
+        """Map each stored corpus ID to the distinct `corpus_hash`es of its chunks."""
+        if not corpus_ids:
+            return {}
+        cls = self.config.document_cls
+        rows = (
+            self.session.query(
+                cls.corpus_id, cls.document_metadata["corpus_hash"].astext
+            )
+            .filter(
+                cls.corpus_id.in_(corpus_ids),
+                self._in_collection(),
+                cls.is_deleted.is_(False),
+            )
+            .distinct()
+            .all()
+        )
+        hashes: dict[str, set[str | None]] = {}
+        for corpus_id, corpus_hash in rows:
+            hashes.setdefault(corpus_id, set()).add(corpus_hash)
+        return hashes
+
+    def _in_collection(self) -> ColumnElement[bool]:
+        """Condition matching rows of the configured `collection_name`, if any."""
+        if self.config.collection_name is None:
+            return true()
+        return self.config.document_cls.collection == self.config.collection_name
+
+    def _delete_existing_corpus(self, corpus_id: UUID | str) -> None:
+        """Delete the stored documents of `corpus_id`, in the configured collection only."""
+        cls = self.config.document_cls
+        self.session.query(cls).filter(
+            cls.corpus_id == corpus_id, self._in_collection()
+        ).delete(synchronize_session=False)
+
+    def _delete_emptied_corpus(self, corpus_id: str) -> None:
+        """Delete, in its own transaction, the stored documents of a corpus that no longer has any chunk."""
+        try:
+            self._delete_existing_corpus(corpus_id)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        logger.info(f"Deleted emptied corpus {corpus_id}")
+
+    def _delete_missing_corpora(
+        self, start_date: str, end_date: str, present_ids: set[str]
+    ) -> int:
+        """Delete, in one statement, stored corpora between the dates whose ID is not in `present_ids`."""
+        cls = self.config.document_cls
+        missing_ids = [
+            corpus_id
+            for (corpus_id,) in self.session.query(cls.corpus_id)
+            .filter(cls.corpus_id.between(start_date, end_date), self._in_collection())
+            .distinct()
+            .all()
+            if corpus_id not in present_ids
+        ]
+        if not missing_ids:
+            return 0
+        try:
+            self.session.query(cls).filter(
+                cls.corpus_id.in_(missing_ids), self._in_collection()
+            ).delete(synchronize_session=False)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        logger.info(f"Deleted {len(missing_ids)} removed corpora: {missing_ids}")
+        return len(missing_ids)
+
+    def _split_corpus(self, content: str, **kwargs) -> list[str]:
+        """
+        Split the journal file on root-level bullet points. If `max_chunk_length` is configured, long
+        chunks are split further, and tiny adjacent chunks are merged according to `min_chunk_length`.
+        """
+        sections = parse_outline(content).sections()
+        if (max_chunk_length := self.config.max_chunk_length) is None:
+            return list(sections)
+        return list(
+            resize_sections(sections, max_chunk_length, self.config.min_chunk_length)
+        )
+
+    def _create_documents(
+        self,
+        corpus_id: UUID | str,
+        document_contents: list[str],
+        document_embeddings: list[list[float]],
+        corpus_metadata: dict[str, Any],
+        optional_props: BaseDocumentOptionalProps | None,
+    ) -> list[BaseDocument]:
+        """
+        Create document instances from the provided data. Unless `validate_metadata` is set, the corpus
+        metadata is built once with `model_construct`, which applies defaults but skips validation, and
+        each chunk's extracted metadata is merged into a copy of it.
+        """
+        if self.config.validate_metadata:
+            documents = super()._create_documents(
+                corpus_id,
+                document_contents,
+                document_embeddings,
+                corpus_metadata,
+                optional_props,
+            )
+        else:
+            embedding_config = self.embedding_provider.get_embedding_config()
+            base_metadata = self.document_metadata_class.model_construct(
+                **corpus_metadata
+            ).model_dump()
+            documents = [
+                self.config.document_cls.from_props(
+                    corpus_id=corpus_id,
+                    chunk_index=i,
+                    content=content,
+                    embedding=embedding,
+                    embedding_config=embedding_config,
+                    metadata=base_metadata | self._extract_chunk_metadata(content),
+                    optional_props=optional_props,
+                )
+                for i, (content, embedding) in enumerate(
+                    zip(document_contents, document_embeddings)
+                )
+            ]
+        journal_date = date.fromisoformat(corpus_metadata["date_str"])
+        for document in documents:
+            document.journal_date = journal_date  # ty: ignore[unresolved-attribute]
+        return documents
 
     def _extract_chunk_metadata(self, content: str, **kwargs) -> dict[str, Any]:
         """Extract metadata from chunk content"""
-        # Add some basic metadata about the chunk
-        split_content = content.split()
+        metadata = extract_chunk_metadata(content)
         return {
-            "chunk_len": len(content),
-            "word_count": len(split_content),
-            "references": self._extract_chunk_references(split_content),
-            "anchor_ids": self._extract_anchor_ids(content),
+            "chunk_len": metadata.char_count,
+            "word_count": metadata.word_count,
+            "references": metadata.references,
+            "tags": metadata.tags,
+            "anchor_ids": metadata.anchor_ids,
         }
-
-    def _extract_chunk_references(self, split_content: list[str]) -> list[str]:
-        """
-        Extract references to other Logseq corpora, including other journals.
-        Expected to start with `#`, e.g. `#2025-07-07`, `#cookout`.
-        Special chars `!?,:'"\\` break references. `\\` is ignored.
-        """
-        references = []
-        for word in split_content:
-            if word.startswith("#"):
-                ref = word.lstrip("#").rstrip("#").replace("\\", "")
-                for char in "!?,:'\"":
-                    ref = ref.split(char)[0]
-                if ref:
-                    references.append(ref)
-        return references
-
-    def _extract_anchor_ids(self, content: str) -> list[str]:
-        """Extract Logseq anchor IDs from content (id:: <uuid>)"""
-        return re.findall(r"id:: ([a-f0-9-]{36})", content)
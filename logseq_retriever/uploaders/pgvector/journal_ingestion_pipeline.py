@@ -0,0 +1,320 @@
+import queue
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from logging import getLogger
+from threading import Event, Lock, Thread, local
+from typing import Any
+
+from pgvector_template.core import BaseDocument
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+
+from logseq_retriever.uploaders.pgvector.journal_corpus_manager import (
+    JournalBulkInsertResult,
+    JournalCorpus,
+    JournalCorpusManager,
+)
+
+logger = getLogger(__name__)
+
+_DONE = object()
+"""End-of-stream marker passed down each queue"""
+
+_POLL_SECONDS = 0.1
+"""How often blocked stages check whether the pipeline was aborted"""
+
+
+class JournalIngestionPipelineConfig(BaseModel):
+    """Configuration for `JournalIngestionPipeline`."""
+
+    queue_size: int = Field(default=8, ge=1)
+    """Capacity of each queue between stages; a full queue blocks the stage feeding it"""
+    split_workers: int = Field(default=1, ge=1)
+    """Threads splitting corpora & extracting chunk metadata"""
+    embed_workers: int = Field(default=2, ge=1)
+    """Threads sending embedding requests"""
+    write_workers: int = Field(default=1, ge=1)
+    """Threads writing to the DB. More than 1 requires a `session_factory`"""
+    embed_batch_size: int = Field(default=96, ge=1)
+    """Chunks per embedding request, batched across corpora. Corpora are never split across batches"""
+
+
+class JournalIngestionPipeline:
+    """
+    Uploads journal corpora through 4 concurrent stages, connected by bounded queues:
+    load (iterating the input) → split (`_split_corpus` & chunk metadata) → embed (batched across
+    corpora) → write (delete & bulk insert, one transaction per embedding batch).
+
+    Each stage runs on its own threads, so splitting, embedding requests & DB writes overlap. Since every
+    queue is bounded, a slow stage blocks the ones upstream of it, which bounds memory regardless of the
+    input size. The first error in any stage aborts the pipeline, and is re-raised by `run`.
+
+    As in `JournalCorpusManager.insert_corpora`, the embed stage reuses stored vectors of unchanged
+    chunks, and only embeds the rest. Without a `session_factory`, its lookups & the writes take turns on
+    the corpus manager's session.
+    """
+
+    def __init__(
+        self,
+        corpus_manager: JournalCorpusManager,
+        config: JournalIngestionPipelineConfig | None = None,
+        session_factory: Callable[[], AbstractContextManager[Session]] | None = None,
+    ):
+        self.corpus_manager = corpus_manager
+        self.config = config or JournalIngestionPipelineConfig()
+        if self.config.write_workers > 1 and session_factory is None:
+            raise ValueError("write_workers > 1 requires a session_factory")
+        self.session_factory = session_factory
+        self._local = local()
+        self._session_lock = Lock()
+
+    def run(
+        self,
+        corpora: Iterable[JournalCorpus],
+        on_commit: Callable[[list[str]], None] | None = None,
+    ) -> JournalBulkInsertResult:
+        """
+        Upload `corpora`, replacing stored rows of the same corpus IDs. Blocks until all are written.
+        `on_commit` is called, from writer threads, with the IDs of the corpora each transaction committed.
+        """
+        run = _PipelineRun(self.config.queue_size, on_commit)
+        split_queue, batch_queue, embed_queue, write_queue = (
+            run.new_queue() for _ in range(4)
+        )
+        started = time.perf_counter()
+        threads = [
+            Thread(
+                target=run.guard,
+                args=(self._load, corpora, split_queue),
+                name="ingest-load",
+            ),
+            *run.stage(
+                "split",
+                self.config.split_workers,
+                self._split,
+                split_queue,
+                batch_queue,
+            ),
+            Thread(
+                target=run.guard,
+                args=(self._batch, batch_queue, embed_queue),
+                name="ingest-batch",
+            ),
+            *run.stage(
+                "embed",
+                self.config.embed_workers,
+                self._embed,
+                embed_queue,
+                write_queue,
+                worker_context=self._worker_session,
+            ),
+            *run.stage(
+                "write",
+                self.config.write_workers,
+                self._write,
+                write_queue,
+                None,
+                worker_context=self._worker_session,
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if run.error is not None:
+            raise run.error
+
+        result = JournalBulkInsertResult(
+            corpora=run.counts["corpora"],
+            rows=run.counts["rows"],
+            embedded=run.counts["embedded"],
+            reused=run.counts["rows"] - run.counts["embedded"],
+            seconds=time.perf_counter() - started,
+        )
+        logger.info(
+            f"Pipelined {result.rows} rows from {result.corpora} corpora "
+            f"({result.embedded} embedded, {result.reused} reused) "
+            f"in {result.seconds:.1f}s, {result.rows_per_second:.0f} rows/s"
+        )
+        return result
+
+    def _load(self, run: "_PipelineRun", corpora: Iterable[JournalCorpus], outbox):
+        for corpus in corpora:
+            run.count("corpora")
+            run.put(outbox, corpus)
+        run.put(outbox, _DONE)
+
+    def _split(self, run: "_PipelineRun", corpus: JournalCorpus, outbox) -> None:
+        documents = self.corpus_manager._prepare_corpus(corpus)
+        if documents:
+            run.put(outbox, (corpus.corpus_id, documents))
+        elif run.on_commit is not None:
+            # nothing to write
+            run.on_commit([corpus.corpus_id])
+
+    def _batch(self, run: "_PipelineRun", inbox, outbox) -> None:
+        """Group split corpora into batches of at least `embed_batch_size` chunks, or the remainder."""
+        batch: list[tuple[str, list[BaseDocument]]] = []
+        size = 0
+        while (item := run.get(inbox)) is not _DONE:
+            batch.append(item)
+            size += len(item[1])
+            if size >= self.config.embed_batch_size:
+                run.put(outbox, batch)
+                batch, size = [], 0
+        if batch:
+            run.put(outbox, batch)
+        run.put(outbox, _DONE)
+
+    def _embed(
+        self, run: "_PipelineRun", batch: list[tuple[str, list[BaseDocument]]], outbox
+    ) -> None:
+        manager = self._local.manager
+        documents = [doc for _, docs in batch for doc in docs]
+        with self._shared_session():
+            reusable = manager._load_reusable_embeddings(
+                [corpus_id for corpus_id, _ in batch],
+                [doc.content_hash for doc in documents],
+            )
+            # end the read transaction, so the connection isn't held during embedding requests
+            manager.session.commit()
+        misses = [doc for doc in documents if doc.content_hash not in reusable]
+        if misses:
+            contents = [doc.content for doc in misses]
+            embeddings = manager.embedding_provider.embed_batch(contents)
+            manager._validate_inputs(contents, embeddings)
+            for doc, embedding in zip(misses, embeddings):
+                doc.embedding = embedding  # ty: ignore[invalid-assignment]
+        for doc in documents:
+            if doc.content_hash in reusable:
+                doc.embedding = reusable[doc.content_hash]
+        run.count("embedded", len(misses))
+        run.put(outbox, batch)
+
+    def _write(
+        self, run: "_PipelineRun", batch: list[tuple[str, list[BaseDocument]]], outbox
+    ) -> None:
+        documents = [doc for _, docs in batch for doc in docs]
+        with self._shared_session():
+            self._local.manager._write_corpora(
+                [corpus_id for corpus_id, _ in batch], documents
+            )
+        run.count("rows", len(documents))
+        if run.on_commit is not None:
+            run.on_commit([corpus_id for corpus_id, _ in batch])
+
+    def _shared_session(self) -> AbstractContextManager[Any]:
+        """Serialize DB access of the calling thread, if all threads share the corpus manager's session."""
+        return self._session_lock if self.session_factory is None else nullcontext()
+
+    @contextmanager
+    def _worker_session(self) -> Iterator[None]:
+        """Bind the calling worker thread to a corpus manager with its own session, if possible."""
+        if self.session_factory is None:
+            self._local.manager = self.corpus_manager
+            yield
+            return
+        with self.session_factory() as session:
+            self._local.manager = type(self.corpus_manager)(
+                session, self.corpus_manager.config
+            )
+            yield
+
+
+class _PipelineRun:
+    """Shared state of one `JournalIngestionPipeline.run`: queues, counters & the first error."""
+
+    def __init__(
+        self,
+        queue_size: int,
+        on_commit: Callable[[list[str]], None] | None = None,
+    ):
+        self.queue_size = queue_size
+        self.on_commit = on_commit
+        self.error: BaseException | None = None
+        self.counts = {"corpora": 0, "rows": 0, "embedded": 0}
+        self._aborted = Event()
+        self._lock = Lock()
+
+    def new_queue(self) -> queue.Queue:
+        return queue.Queue(maxsize=self.queue_size)
+
+    def count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.counts[key] += n
+
+    def put(self, q: queue.Queue | None, item: Any) -> None:
+        """Block until `item` is queued, or raise `_Aborted` if another stage failed."""
+        if q is None:
+            return
+        while True:
+            if self._aborted.is_set():
+                raise _Aborted()
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+    def get(self, q: queue.Queue) -> Any:
+        """Block until an item is available, or raise `_Aborted` if another stage failed."""
+        while True:
+            if self._aborted.is_set():
+                raise _Aborted()
+            try:
+                return q.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+
+    def guard(self, fn: Callable[..., None], *args) -> None:
+        """Run a stage's thread body, recording the first error & aborting the other stages."""
+        try:
+            fn(self, *args)
+        except _Aborted:
+            pass
+        except Exception as e:
+            with self._lock:
+                if self.error is None:
+                    self.error = e
+            self._aborted.set()
+            logger.exception("Ingestion pipeline aborted")
+
+    def stage(
+        self,
+        name: str,
+        workers: int,
+        fn: Callable[..., None],
+        inbox: queue.Queue,
+        outbox: queue.Queue | None,
+        worker_context: Callable[[], AbstractContextManager[Any]] = nullcontext,
+    ) -> list[Thread]:
+        """
+        Threads for a stage of `workers` workers, each calling `fn` per item within `worker_context`.
+        The last worker to see the end of the stream forwards it downstream.
+        """
+        remaining = [workers]
+
+        def body(run: "_PipelineRun", inbox, outbox) -> None:
+            with worker_context():
+                while (item := run.get(inbox)) is not _DONE:
+                    fn(run, item, outbox)
+            run.put(inbox, _DONE)  # let sibling workers finish too
+            with run._lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                run.put(outbox, _DONE)
+
+        return [
+            Thread(
+                target=self.guard,
+                args=(body, inbox, outbox),
+                name=f"ingest-{name}-{i}",
+            )
+            for i in range(workers)
+        ]
+
+
+class _Aborted(Exception):
+    """Raised in a stage's thread when another stage has failed."""
@@ -0,0 +1,112 @@
+import sqlite3
+import time
+from collections.abc import Callable, Iterable, Iterator
+from threading import Lock
+
+from pgvector_template.core.embedder import BaseEmbeddingProvider
+
+from logseq_retriever.uploaders.pgvector.cached_embedding_provider import (
+    CachedEmbeddingProvider,
+)
+from logseq_retriever.uploaders.pgvector.journal_corpus_manager import (
+    JournalCorpus,
+    JournalCorpusManager,
+)
+
+
+class UploadCheckpoint:
+    """
+    Records the progress of an upload in a SQLite file, so an interrupted upload can be resumed without
+    redoing finished work.
+
+    Corpora are recorded along with their `corpus_hash` once written & committed, and `pending` skips
+    them on later runs, unless their content changed since. Vectors are persisted by wrapping the
+    provider with `embedding_provider`, as each sub-batch of about 1 embedding request returns (see
+    `CachedEmbeddingProvider`), so chunks embedded but never written are not re-embedded either. Corpus
+    writes replace any stored rows of the same corpus ID, so replaying a partially written batch never
+    duplicates chunks.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.skipped = 0
+        self._hashes: dict[str, str] = {}
+        """Hashes of the corpora handed out by `pending`, recorded by `mark_complete`"""
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS completed_corpora (
+                    corpus_id TEXT PRIMARY KEY,
+                    corpus_hash TEXT NOT NULL,
+                    completed_at REAL NOT NULL
+                )
+                """
+            )
+
+    def embedding_provider(
+        self, provider: BaseEmbeddingProvider, **kwargs
+    ) -> CachedEmbeddingProvider:
+        """
+        Wrap `provider`, so its embeddings are persisted in the checkpoint file. `kwargs` are passed to
+        `CachedEmbeddingProvider`, e.g. `max_concurrency`.
+        """
+        if isinstance(provider, CachedEmbeddingProvider):
+            return provider
+        return CachedEmbeddingProvider(provider, self.path, **kwargs)
+
+    def pending(
+        self,
+        corpora: Iterable[JournalCorpus],
+        corpus_hash: Callable[[str], str] = JournalCorpusManager.hash_corpus,
+    ) -> Iterator[JournalCorpus]:
+        """
+        Yield the corpora not completed by a previous run, or changed since. Pass the writing manager's
+        `corpus_hash`, so corpora completed under other embedding or chunking settings are redone.
+        """
+        with self._lock:
+            completed = dict(
+                self._conn.execute(
+                    "SELECT corpus_id, corpus_hash FROM completed_corpora"
+                )
+            )
+        for corpus in corpora:
+            content_hash = corpus_hash(corpus.content)
+            if completed.get(corpus.corpus_id) == content_hash:
+                self.skipped += 1
+                continue
+            with self._lock:
+                self._hashes[corpus.corpus_id] = content_hash
+            yield corpus
+
+    def mark_complete(self, corpus_ids: Iterable[str]) -> None:
+        """Record corpora handed out by `pending` as written. Safe to call from several threads."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO completed_corpora VALUES (?, ?, ?)",
+                [
+                    (corpus_id, self._hashes.pop(corpus_id), now)
+                    for corpus_id in corpus_ids
+                    if corpus_id in self._hashes
+                ],
+            )
+
+    @property
+    def completed_count(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM completed_corpora"
+            ).fetchone()
+            return count
+
+    def reset(self) -> None:
+        """Forget completed corpora, to start a new upload. Persisted embeddings are kept."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM completed_corpora")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,27 +1,38 @@
 import argparse
 import os
-from datetime import datetime
+from contextlib import nullcontext
+from datetime import date, datetime
+from functools import partial
 from logging import getLogger
 from pathlib import Path
 
-from logseq_retriever.models.document import Document
 from pgvector_template.db import DocumentDatabaseManager
 from pgvector_template.core import BaseDocumentOptionalProps
 
 from logseq_retriever.models.journal_pgvector import (
-    JournalDocument,
     JournalCorpusMetadata,
+    JournalDocumentBase,
+    VectorIndexConfig,
+    journal_document_cls,
 )
+from logseq_retriever.models.document import Document
 from logseq_retriever.loaders import (
     LogseqJournalFilesystemLoader,
     LogseqJournalLoaderInput,
 )
 from logseq_retriever.uploaders.pgvector import (
+    CachedEmbeddingProvider,
+    JournalBulkInsertResult,
+    JournalCorpus,
     JournalCorpusManager,
     JournalCorpusManagerConfig,
+    JournalIngestionPipeline,
+    JournalIngestionPipelineConfig,
+    JournalShard,
+    UploadCheckpoint,
 )
 from pgvector_utils.db_util import database_url
-from utils.bedrock_embedder import CohereEmbeddingProvider
+from utils.bedrock_embedder import COHERE_V4_DIMENSIONS, CohereEmbeddingProvider
 from utils.logging import setup_logging
 from dotenv import load_dotenv
 
@@ -50,8 +61,123 @@ def parse_args():
     )
     parser.add_argument("from_date", help="Start date (inclusive), format: YYYY-MM-DD")
     parser.add_argument("to_date", help="End date (inclusive), format: YYYY-MM-DD")
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Only upload journals that changed, or whose embedding & chunking settings changed, since the "
+        "last upload, and delete removed ones in range",
+    )
+    parser.add_argument(
+        "--bulk",
+        type=int,
+        nargs="?",
+        const=1000,
+        metavar="ROWS",
+        help="Replace journals with bulk inserts, committed every ROWS rows (default: 1000)",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Overlap splitting, embedding & DB writes in concurrent stages",
+    )
+    parser.add_argument(
+        "--embed-workers",
+        type=int,
+        default=2,
+        help="Concurrent embedding requests with --pipeline (default: 2)",
+    )
+    parser.add_argument(
+        "--write-workers",
+        type=int,
+        default=1,
+        help="DB writers, each with its own connection, with --pipeline (default: 1)",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        help="Split the date range into this many shards, balanced by journal bytes, "
+        "and bulk upload them in parallel processes",
+    )
+    parser.add_argument(
+        "--dimensions",
+        type=int,
+        default=1024,
+        choices=COHERE_V4_DIMENSIONS,
+        help="Embedding dimensions; other than 1024, journals go to their own table (default: 1024)",
+    )
+    parser.add_argument(
+        "--vector-storage",
+        default="vector",
+        choices=("vector", "halfvec", "int8"),
+        help="Store 4-byte floats (vector), 2-byte floats (halfvec), or int8 embeddings from the API "
+        "in a halfvec column of their own table (int8) (default: vector)",
+    )
+    parser.add_argument(
+        "--rebuild-indexes",
+        action="store_true",
+        help="Drop the vector indexes before uploading, and build them once afterwards; "
+        "much faster for large backfills",
+    )
+    parser.add_argument(
+        "--index-method",
+        choices=("hnsw", "ivfflat"),
+        help="Vector index method built by --rebuild-indexes (default: hnsw)",
+    )
+    parser.add_argument(
+        "--hnsw-m", type=int, help="HNSW max connections per layer (default: 16)"
+    )
+    parser.add_argument(
+        "--hnsw-ef-construction",
+        type=int,
+        help="HNSW candidate list size while building (default: 64)",
+    )
+    parser.add_argument(
+        "--ivfflat-lists",
+        type=int,
+        help="IVFFlat number of clusters; about rows / 1000 (default: 100)",
+    )
+    parser.add_argument(
+        "--bits-index-only",
+        action="store_true",
+        help="Build only the `embedding_bits` vector index, which is all searches with binary rerank "
+        "use, and drop the `embedding` one",
+    )
+    parser.add_argument(
+        "--embedding-cache",
+        default=os.getenv("EMBEDDING_CACHE_PATH"),
+        help="SQLite file caching embeddings across runs (default: EMBEDDING_CACHE_PATH env var)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=os.getenv("UPLOAD_CHECKPOINT_PATH"),
+        help="SQLite file recording upload progress (default: UPLOAD_CHECKPOINT_PATH env var)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip journals completed by a previous run with the same --checkpoint",
+    )
 
     args = parser.parse_args()
+    if sum(map(bool, (args.sync, args.pipeline, args.shards))) > 1:
+        raise ValueError("--sync, --pipeline and --shards are mutually exclusive")
+    if args.bulk and (args.sync or args.pipeline):
+        raise ValueError("--bulk cannot be combined with --sync or --pipeline")
+    if args.shards is not None and args.shards < 1:
+        raise ValueError("--shards must be at least 1")
+    if args.resume and not args.checkpoint:
+        raise ValueError("--resume requires --checkpoint or UPLOAD_CHECKPOINT_PATH")
+    index_args = (
+        args.index_method,
+        args.hnsw_m,
+        args.hnsw_ef_construction,
+        args.ivfflat_lists,
+    )
+    if not args.rebuild_indexes and any(arg is not None for arg in index_args):
+        raise ValueError("Vector index options require --rebuild-indexes")
+    if args.sync and args.checkpoint:
+        # sync already skips unchanged journals, and must see every journal to detect removed ones
+        raise ValueError("--sync cannot be combined with --checkpoint")
 
     # Validate path
     if not args.path:
@@ -91,6 +217,62 @@ def setup_journal_filesystem_loader(args) -> LogseqJournalFilesystemLoader:
     return loader
 
 
+def setup_bedrock_embedder(args) -> CohereEmbeddingProvider:
+    return CohereEmbeddingProvider(
+        output_dimension=args.dimensions,
+        embedding_type="int8" if args.vector_storage == "int8" else "float",
+    )
+
+
+def setup_embedder(
+    bedrock_embedder: CohereEmbeddingProvider,
+    args,
+    checkpoint: UploadCheckpoint | None,
+):
+    """Wrap `bedrock_embedder` in the embedding cache & checkpoint, if enabled. The caller closes it."""
+    embedder = bedrock_embedder
+    if args.embedding_cache:
+        embedder = CachedEmbeddingProvider(embedder, args.embedding_cache)
+    if checkpoint is not None:
+        embedder = checkpoint.embedding_provider(embedder)
+    return embedder
+
+
+def setup_document_cls(args) -> type[JournalDocumentBase]:
+    if args.vector_storage == "int8":
+        # int8 embeddings are stored exactly by halfvec, apart from float embeddings
+        return journal_document_cls(args.dimensions, "halfvec", "int8")
+    return journal_document_cls(args.dimensions, args.vector_storage)
+
+
+def setup_vector_index(args) -> VectorIndexConfig | None:
+    if not (args.rebuild_indexes or args.bits_index_only):
+        return None
+    options = {
+        "method": args.index_method,
+        "m": args.hnsw_m,
+        "ef_construction": args.hnsw_ef_construction,
+        "lists": args.ivfflat_lists,
+        "columns": ("embedding_bits",) if args.bits_index_only else None,
+    }
+    return VectorIndexConfig(
+        **{name: value for name, value in options.items() if value is not None}
+    )
+
+
+def build_loader_input(start_date: str, end_date: str) -> LogseqJournalLoaderInput:
+    return LogseqJournalLoaderInput(
+        journal_start_date=start_date,
+        journal_end_date=end_date,
+        max_char_length=64 * 1024,
+        enable_splitting=False,  # disable splitting; let JournalCorpusManager handle splitting
+    )
+
+
+def journal_collection_name() -> str:
+    return f"{os.getenv('JOURNAL_COLLECTION_OWNER_NAME', 'Foo')}'s Journal Collection"
+
+
 def build_db_optional_props(
     args, collection: str, corpus_md: JournalCorpusMetadata
 ) -> BaseDocumentOptionalProps:
@@ -103,6 +285,133 @@ def build_db_optional_props(
     )
 
 
+def build_journal_corpus(args, collection: str, fs_doc: Document) -> JournalCorpus:
+    corpus_md = JournalCorpusMetadata(date_str=fs_doc.metadata["journal_date"])
+    return JournalCorpus(
+        content=fs_doc.page_content,
+        corpus_metadata=corpus_md.model_dump(),
+        optional_props=build_db_optional_props(args, collection, corpus_md),
+    )
+
+
+def upload_shard(args, shard: JournalShard) -> JournalBulkInsertResult:
+    """Bulk upload the journals of one shard, in a worker process with its own DB session & embedder."""
+    loader = setup_journal_filesystem_loader(args)
+    document_cls = setup_document_cls(args)
+    db_manager = DocumentDatabaseManager(database_url(), "logseq", [document_cls])
+    schema_name = db_manager.setup()
+    # the parent process resets the checkpoint, if needed, before starting shards
+    checkpoint = UploadCheckpoint(args.checkpoint) if args.checkpoint else None
+    bedrock_embedder = setup_bedrock_embedder(args)
+    embedder = setup_embedder(bedrock_embedder, args, checkpoint)
+
+    with bedrock_embedder, db_manager.get_session() as session:
+        corpus_manager = JournalCorpusManager(
+            session,
+            JournalCorpusManagerConfig(
+                schema_name=schema_name,
+                document_cls=document_cls,
+                embedding_provider=embedder,
+                max_chunk_length=8 * 1024,
+                collection_name=journal_collection_name(),
+            ),
+        )
+        filesystem_docs = loader.lazy_load(
+            build_loader_input(shard.start_date, shard.end_date)
+        )
+        collection_name = journal_collection_name()
+        corpora = (
+            build_journal_corpus(args, collection_name, fs_doc)
+            for fs_doc in filesystem_docs
+        )
+        if checkpoint is None:
+            return corpus_manager.insert_corpora(
+                corpora, commit_every=args.bulk or 1000
+            )
+        return corpus_manager.insert_corpora(
+            checkpoint.pending(corpora, corpus_manager.corpus_hash),
+            commit_every=args.bulk or 1000,
+            on_commit=checkpoint.mark_complete,
+        )
+
+
+def upload_sharded(args, loader: LogseqJournalFilesystemLoader) -> None:
+    start_date = date.fromisoformat(args.from_date)
+    end_date = date.fromisoformat(args.to_date)
+    shards = JournalCorpusManager.plan_shards(
+        loader.journal_sizes(start_date, end_date), args.shards, start_date, end_date
+    )
+    for shard in shards:
+        logger.info(
+            f"Shard {shard.start_date}..{shard.end_date}: "
+            f"{shard.journals} journals, {shard.bytes} bytes"
+        )
+    result = JournalCorpusManager.run_shards(
+        shards, partial(upload_shard, args), processes=len(shards) or 1
+    )
+    if result.errors:
+        raise SystemExit(
+            f"{len(result.errors)} of {len(shards)} shards failed; "
+            "rerun with --checkpoint & --resume to retry only unfinished journals"
+        )
+
+
+def upload_journals(
+    args,
+    loader: LogseqJournalFilesystemLoader,
+    db_manager: DocumentDatabaseManager,
+    corpus_manager: JournalCorpusManager,
+    checkpoint: UploadCheckpoint | None,
+) -> None:
+    # load documents using loader
+    # stream documents, so each day is uploaded as soon as it is read
+    filesystem_docs = loader.lazy_load(build_loader_input(args.from_date, args.to_date))
+
+    # process documents from the filesystem for upload
+    collection_name = journal_collection_name()
+    corpora = (
+        build_journal_corpus(args, collection_name, fs_doc)
+        for fs_doc in filesystem_docs
+    )
+    on_commit = None
+    if checkpoint is not None:
+        corpora = checkpoint.pending(corpora, corpus_manager.corpus_hash)
+        on_commit = checkpoint.mark_complete
+    if args.sync:
+        corpus_manager.sync_corpora(
+            corpora, start_date=args.from_date, end_date=args.to_date
+        )
+    elif args.pipeline:
+        pipeline = JournalIngestionPipeline(
+            corpus_manager,
+            JournalIngestionPipelineConfig(
+                embed_workers=args.embed_workers,
+                write_workers=args.write_workers,
+            ),
+            session_factory=db_manager.get_session,
+        )
+        pipeline.run(corpora, on_commit=on_commit)
+    elif args.bulk:
+        corpus_manager.insert_corpora(
+            corpora, commit_every=args.bulk, on_commit=on_commit
+        )
+    else:
+        for corpus in corpora:
+            logger.info(
+                f"Uploading corpus with metadata={corpus.corpus_metadata}\n"
+                f"\toptional_props={corpus.optional_props}\n"
+                f"\tcontent preview: '{corpus.content[:32]}'"
+            )
+            corpus_manager.insert_corpus(
+                corpus.content,
+                corpus.corpus_metadata,
+                corpus.optional_props,
+                corpus_id=corpus.corpus_id,
+            )
+            if on_commit is not None:
+                on_commit([corpus.corpus_id])
+
+
 ################################################################################
 ##### MAIN
 ################################################################################
@@ -114,46 +423,63 @@ def main():
 
     # set up clients for: Loader, DB, embedder
     loader = setup_journal_filesystem_loader(args)
-    db_manager = DocumentDatabaseManager(db_url, "logseq", [JournalDocument])
+    document_cls = setup_document_cls(args)
+    db_manager = DocumentDatabaseManager(db_url, "logseq", [document_cls])
     temp_schema_name = db_manager.setup()
-    embedder = CohereEmbeddingProvider()
+    checkpoint = None
+    if args.checkpoint:
+        checkpoint = UploadCheckpoint(args.checkpoint)
+        if not args.resume:
+            checkpoint.reset()
+    bedrock_embedder = setup_bedrock_embedder(args)
+    embedder = setup_embedder(bedrock_embedder, args, checkpoint)
 
-    with db_manager.get_session() as session:
+    with bedrock_embedder, db_manager.get_session() as session:
         corpus_manager = JournalCorpusManager(
             session,
             JournalCorpusManagerConfig(
-                schema_name=temp_schema_name, embedding_provider=embedder
+                schema_name=temp_schema_name,
+                document_cls=document_cls,
+                embedding_provider=embedder,
+                max_chunk_length=8 * 1024,
+                collection_name=journal_collection_name(),
+                vector_index=setup_vector_index(args),
             ),
         )
-
-        # load documents using loader
-        loader_input = LogseqJournalLoaderInput(
-            journal_start_date=args.from_date,
-            journal_end_date=args.to_date,
-            max_char_length=64 * 1024,
-            enable_splitting=False,  # disable splitting; let JournalCorpusManager handle splitting
+        # rows uploaded before the `journal_date` & `embedding_bits` columns, or `tags`, existed;
+        # no-ops once done
+        corpus_manager.backfill_journal_dates()
+        corpus_manager.backfill_embedding_bits()
+        corpus_manager.backfill_tags()
+        # indexes declared after the table was created, e.g. on `embedding_bits`, built once backfilled
+        corpus_manager.ensure_indexes()
+        # a single index build after the upload beats maintaining the indexes on every insert
+        indexes = (
+            corpus_manager.without_vector_indexes()
+            if args.rebuild_indexes
+            else nullcontext()
         )
-        filesystem_docs: list[Document] = loader.load(loader_input)
+        with indexes:
+            if args.shards:
+                upload_sharded(args, loader)
+            else:
+                upload_journals(args, loader, db_manager, corpus_manager, checkpoint)
 
-        # process documents from the filesystem for upload
-        collection_name = (
-            f"{os.getenv('JOURNAL_COLLECTION_OWNER_NAME', 'Foo')}'s Journal Collection"
+    if args.shards:
+        # embedding cache & checkpoint stats are kept by each shard's process
+        logger.info("Journal upload completed.")
+        return
+    if isinstance(embedder, CachedEmbeddingProvider):
+        stats = embedder.stats
+        logger.info(
+            f"Embedding cache: {stats.hits} hits, {stats.misses} misses "
+            f"({stats.hit_rate:.1%} hit rate), {stats.size} stored"
+        )
+    if checkpoint is not None:
+        logger.info(
+            f"Checkpoint: {checkpoint.skipped} journals skipped as already uploaded, "
+            f"{checkpoint.completed_count} completed in total"
         )
-        for fs_doc in filesystem_docs:
-            corpus_md = JournalCorpusMetadata(date_str=fs_doc.metadata["journal_date"])
-            optional_props = build_db_optional_props(args, collection_name, corpus_md)
-            logger.info(
-                f"Uploading corpus with metadata={corpus_md}\n"
-                f"\toptional_props={optional_props}\n"
-                f"\tcontent preview: '{fs_doc.page_content[:32]}'"
-            )
-            corpus_manager.insert_corpus(
-                fs_doc.page_content,
-                corpus_md.model_dump(),
-                optional_props,
-                corpus_id=corpus_md.date_str,
-            )
-
     logger.info("Journal upload completed.")
 
 
@@ -1,19 +1,46 @@
 import json
 from abc import ABC, abstractmethod
-from typing import Any
+from collections.abc import Iterator
+from typing import Any, Self
 
 from pgvector_template.core.embedder import BaseEmbeddingProvider
 
-from utils.api_bedrock import get_bedrock_client_from_environ
+from .api_bedrock import get_bedrock_client_from_environ
+from .rate_control import AdaptiveExecutor
 
 
 class BedrockEmbeddingProvider(BaseEmbeddingProvider, ABC):
-    """Abstract base for Bedrock embedding providers. Handles client setup and shared embed logic."""
+    """Abstract base for Bedrock embedding providers. Handles client setup and shared embed logic.
 
-    def __init__(self, model_id: str, verbose: bool = False, **kwargs):
+    With `max_concurrency` > 1, `embed_batch` sends its requests concurrently, adapting the number
+    in flight to throttling, and capped at `requests_per_second` if set. See `AdaptiveExecutor`.
+    `close` the provider, or use it as a context manager, to stop the executor's threads.
+    """
+
+    max_batch_texts: int = 1
+    """Max texts embedded per request. Models whose API takes a single text per request keep 1"""
+    max_batch_chars: int | None = None
+    """Max total characters of the texts embedded per request. `None` means no limit"""
+
+    def __init__(
+        self,
+        model_id: str,
+        verbose: bool = False,
+        max_concurrency: int = 1,
+        requests_per_second: float | None = None,
+        bedrock_client: Any = None,
+        **kwargs,
+    ):
         super().__init__(model_id=model_id, **kwargs)
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
         self.verbose = verbose
-        self.bedrock_client: Any = get_bedrock_client_from_environ()
+        self.bedrock_client: Any = bedrock_client or get_bedrock_client_from_environ()
+        self.executor = (
+            AdaptiveExecutor(max_concurrency, requests_per_second=requests_per_second)
+            if max_concurrency > 1
+            else None
+        )
 
     @abstractmethod
     def _build_payload(self, text: str) -> dict: ...
@@ -21,14 +48,43 @@ class BedrockEmbeddingProvider(BaseEmbeddingProvider, ABC):
     @abstractmethod
     def _parse_response(self, response: dict) -> list[float]: ...
 
-    def _invoke(self, text: str) -> list[float]:
+    def _invoke_model(self, payload: dict) -> dict:
         response = self.bedrock_client.invoke_model(
             modelId=self.model_id,
-            body=json.dumps(self._build_payload(text)),
+            body=json.dumps(payload),
             contentType="application/json",
             accept="application/json",
         )
-        return self._parse_response(json.loads(response["body"].read()))
+        return json.loads(response["body"].read())
+
+    def _invoke(self, text: str) -> list[float]:
+        return self._parse_response(self._invoke_model(self._build_payload(text)))
+
+    def _invoke_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed a batch from `_batch_texts`. By default, one request per text; override if the API batches."""
+        return [self._invoke(text) for text in texts]
+
+    def _batch_texts(self, texts: list[str]) -> Iterator[list[str]]:
+        """
+        Group consecutive texts into batches of at most `max_batch_texts` texts & `max_batch_chars`
+        characters. A single text longer than `max_batch_chars` is sent in a batch of its own.
+        """
+        batch: list[str] = []
+        batch_chars = 0
+        for text in texts:
+            if batch and (
+                len(batch) >= self.max_batch_texts
+                or (
+                    self.max_batch_chars is not None
+                    and batch_chars + len(text) > self.max_batch_chars
+                )
+            ):
+                yield batch
+                batch, batch_chars = [], 0
+            batch.append(text)
+            batch_chars += len(text)
+        if batch:
+            yield batch
 
     def embed_text(self, text: str) -> list[float]:
         vector = self._invoke(text)
@@ -37,7 +93,14 @@ class BedrockEmbeddingProvider(BaseEmbeddingProvider, ABC):
         return vector
 
     def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        vectors = [self._invoke(t) for t in texts]
+        batches = list(self._batch_texts(texts))
+        # single batches too, so concurrent callers, e.g. `CachedEmbeddingProvider`, share the
+        # concurrency limit & throttling retries
+        if self.executor is not None:
+            batch_vectors = self.executor.map(self._invoke_batch, batches)
+        else:
+            batch_vectors = [self._invoke_batch(batch) for batch in batches]
+        vectors = [vector for batch in batch_vectors for vector in batch]
         if self.verbose:
             for text, vector in zip(texts, vectors, strict=True):
                 print(f"Embedding vector for '{text}': {vector}")
@@ -46,6 +109,16 @@ class BedrockEmbeddingProvider(BaseEmbeddingProvider, ABC):
     def get_dimensions(self) -> int:
         return 1024
 
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
 
 class TitanEmbeddingProvider(BedrockEmbeddingProvider):
     """Embedding provider for Amazon Titan models (amazon.titan-embed-*).
@@ -64,32 +137,89 @@ class TitanEmbeddingProvider(BedrockEmbeddingProvider):
         return response["embedding"]
 
 
+COHERE_V4_DIMENSIONS = (256, 512, 1024, 1536)
+"""Output dimensions supported by Cohere Embed v4"""
+
+COHERE_EMBEDDING_TYPES = ("float", "int8")
+"""Embedding types requested from Cohere. `int8` vectors are exact in `halfvec` columns"""
+
+
 class CohereEmbeddingProvider(BedrockEmbeddingProvider):
     """Embedding provider for Cohere Embed v4 (us.cohere.embed-v4:0).
 
     Supports input_type separation: use "search_document" when embedding corpus
     content (upload pipeline), and "search_query" when embedding user queries
     (retrieval side in logseq-mcp).
+
+    `embed_batch` sends up to `max_batch_texts` texts (the API allows 96) per request,
+    capped at `max_batch_chars` characters per request.
+
+    `output_dimension` truncates embeddings (Matryoshka-style) to 256, 512, 1024 or 1536 dimensions, and
+    `embedding_type="int8"` requests scalar-quantized embeddings, to store smaller vectors.
     """
 
     def __init__(
         self,
         model_id: str = "us.cohere.embed-v4:0",
         input_type: str = "search_document",
+        max_batch_texts: int = 96,
+        max_batch_chars: int | None = 128 * 1024,
+        output_dimension: int = 1024,
+        embedding_type: str = "float",
         **kwargs,
     ):
+        if output_dimension not in COHERE_V4_DIMENSIONS:
+            raise ValueError(
+                f"output_dimension must be one of {COHERE_V4_DIMENSIONS}, got {output_dimension}"
+            )
+        if embedding_type not in COHERE_EMBEDDING_TYPES:
+            raise ValueError(
+                f"embedding_type must be one of {COHERE_EMBEDDING_TYPES}, got {embedding_type}"
+            )
         super().__init__(model_id=model_id, **kwargs)
         self.input_type = input_type
+        self.max_batch_texts = max_batch_texts
+        self.max_batch_chars = max_batch_chars
+        self.output_dimension = output_dimension
+        self.embedding_type = embedding_type
 
     def get_embedding_config(self) -> dict:
-        return {"model": self.model_id, "input_type": self.input_type}
+        config = {"model": self.model_id, "input_type": self.input_type}
+        # only non-default options, so content hashes of existing chunks stay valid
+        if self.output_dimension != 1024:
+            config["output_dimension"] = self.output_dimension
+        if self.embedding_type != "float":
+            config["embedding_type"] = self.embedding_type
+        return config
+
+    def get_dimensions(self) -> int:
+        return self.output_dimension
 
     def _build_payload(self, text: str) -> dict:
+        return self._build_batch_payload([text])
+
+    def _build_batch_payload(self, texts: list[str]) -> dict:
         return {
-            "texts": [text],
+            "texts": texts,
             "input_type": self.input_type,
-            "embedding_types": ["float"],
+            "embedding_types": [self.embedding_type],
+            "output_dimension": self.output_dimension,
         }
 
     def _parse_response(self, response: dict) -> list[float]:
-        return response["embeddings"]["float"][0]
+        return self._parse_vectors(response)[0]
+
+    def _parse_vectors(self, response: dict) -> list[list[float]]:
+        vectors = response["embeddings"][self.embedding_type]
+        if self.embedding_type == "int8":
+            return [[float(x) for x in vector] for vector in vectors]
+        return vectors
+
+    def _invoke_batch(self, texts: list[str]) -> list[list[float]]:
+        response = self._invoke_model(self._build_batch_payload(texts))
+        vectors = self._parse_vectors(response)
+        if len(vectors) != len(texts):
+            raise ValueError(
+                f"Expected {len(texts)} embeddings from {self.model_id}, got {len(vectors)}"
+            )
+        return vectors
@@ -0,0 +1,204 @@
+# concurrency & rate control for calls to throttled APIs, e.g. Bedrock `invoke_model`
+# no AWS dependencies, so it can be exercised offline against a stubbed client
+
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+from threading import Condition, Lock
+from typing import Self, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+logger = getLogger(__name__)
+
+THROTTLING_ERROR_CODES = frozenset(
+    {
+        "ThrottlingException",
+        "TooManyRequestsException",
+        "ServiceQuotaExceededException",
+    }
+)
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    """Return `True` if `error` is a botocore `ClientError` (or look-alike) caused by throttling."""
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return False
+    return response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+
+
+class TokenBucket:
+    """
+    Caps the rate of requests: `acquire` takes a token, blocking until it is available. Tokens refill
+    continuously at `rate` per second, up to `capacity`, which bounds bursts.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(1.0, rate) if capacity is None else capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = Lock()
+
+    def acquire(self) -> None:
+        # reserve the token immediately, then sleep off any debt; later callers queue behind the debt
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+
+
+class AIMDConcurrencyLimit:
+    """
+    Adaptive bound on requests in flight. Each success raises the limit by `1 / limit` (so about 1 per
+    round trip of a full window), and each throttle multiplies it by `decrease_factor`, within
+    `[min_limit, max_limit]`. Throttles are applied at most once per window, since a burst of
+    throttled responses reports a single overload.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float,
+        max_limit: int,
+        min_limit: int = 1,
+        decrease_factor: float = 0.5,
+    ):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("expecting 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._started = 0
+        self._decreased_at = -1
+        self._condition = Condition()
+        self.throttle_count = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self) -> int:
+        """Block until a request may start. Return its sequence number, to pass to `release`."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._in_flight < int(self._limit))
+            self._in_flight += 1
+            self._started += 1
+            return self._started
+
+    def release(self, sequence: int, throttled: bool = False) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self.throttle_count += throttled
+            if not throttled:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            elif sequence > self._decreased_at:
+                # requests started before this decrease were sent at the old limit
+                self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+                self._decreased_at = self._started
+                logger.info(f"Throttled, concurrency limit lowered to {self.limit}")
+            self._condition.notify_all()
+
+
+class AdaptiveExecutor:
+    """
+    Runs calls on a thread pool of `max_concurrency` threads, with the number in flight adapted by an
+    `AIMDConcurrencyLimit`, and optionally capped at `requests_per_second` by a `TokenBucket`.
+    Throttled calls are retried after an exponential backoff, up to `max_retries` times.
+    `close` it, or use it as a context manager, to stop its threads.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        initial_concurrency: int | None = None,
+        requests_per_second: float | None = None,
+        max_retries: int = 8,
+        backoff_base: float = 0.1,
+        backoff_max: float = 10.0,
+        is_throttle: Callable[[BaseException], bool] = is_throttling_error,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.limit = AIMDConcurrencyLimit(
+            initial_limit=min(
+                max_concurrency, initial_concurrency or max(1, max_concurrency // 2)
+            ),
+            max_limit=max_concurrency,
+        )
+        self.bucket = (
+            TokenBucket(requests_per_second, sleep=sleep)
+            if requests_per_second
+            else None
+        )
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.is_throttle = is_throttle
+        self._sleep = sleep
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="adaptive-executor"
+        )
+
+    @property
+    def throttle_count(self) -> int:
+        return self.limit.throttle_count
+
+    def call(self, fn: Callable[[T], R], item: T) -> R:
+        """Call `fn(item)` within the concurrency & rate limits, retrying throttled calls."""
+        attempt = 0
+        while True:
+            sequence = self.limit.acquire()
+            throttled = False
+            try:
+                if self.bucket is not None:
+                    self.bucket.acquire()
+                return fn(item)
+            except Exception as e:
+                throttled = self.is_throttle(e)
+                if not throttled or attempt == self.max_retries:
+                    raise
+            finally:
+                self.limit.release(sequence, throttled)
+            self._sleep(min(self.backoff_max, self.backoff_base * 2**attempt))
+            attempt += 1
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> list[R]:
+        """Call `fn` on each item concurrently, and return the results in order."""
+        futures = [self._pool.submit(self.call, fn, item) for item in items]
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        """Wait for calls in flight, then stop the thread pool. Later `map` calls raise `RuntimeError`."""
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,70 @@
+# offline stand-in for a boto3 `bedrock-runtime` client,
+# to exercise embedding providers without AWS
+
+import io
+import json
+import time
+from threading import Lock
+
+
+class StubThrottlingError(Exception):
+    """Mimics a botocore `ClientError` with a `ThrottlingException` code."""
+
+    def __init__(self):
+        super().__init__("ThrottlingException: Too many requests, please wait")
+        self.response = {"Error": {"Code": "ThrottlingException"}}
+
+
+class StubBedrockClient:
+    """
+    Simulates `invoke_model` for Titan (`inputText`) & Cohere (`texts`, honoring
+    `output_dimension`) payloads. Each call sleeps for `latency` seconds, and calls
+    beyond `max_in_flight` concurrent requests raise `StubThrottlingError`. Vectors
+    are deterministic: each text's vector is filled with its length.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        max_in_flight: int | None = None,
+        dimensions: int = 1024,
+    ):
+        self.latency = latency
+        self.max_in_flight = max_in_flight
+        self.dimensions = dimensions
+        self.calls = 0
+        self.throttled = 0
+        self.peak_in_flight = 0
+        self._in_flight = 0
+        self._lock = Lock()
+
+    def invoke_model(self, modelId: str, body: str, **kwargs) -> dict:
+        with self._lock:
+            self.calls += 1
+            if self.max_in_flight is not None and self._in_flight >= self.max_in_flight:
+                self.throttled += 1
+                raise StubThrottlingError()
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+        try:
+            time.sleep(self.latency)
+            payload = json.loads(body)
+            if "texts" in payload:
+                dimensions = payload.get("output_dimension", self.dimensions)
+                response = {
+                    "embeddings": {
+                        embedding_type: [
+                            self.vector(text, dimensions) for text in payload["texts"]
+                        ]
+                        for embedding_type in payload.get("embedding_types", ["float"])
+                    }
+                }
+            else:
+                response = {"embedding": self.vector(payload["inputText"])}
+            return {"body": io.BytesIO(json.dumps(response).encode("utf-8"))}
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def vector(self, text: str, dimensions: int | None = None) -> list[float]:
+        return [float(len(text))] * (dimensions or self.dimensions)
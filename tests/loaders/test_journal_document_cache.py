@@ -0,0 +1,81 @@
+import unittest
+
+from logseq_retriever.loaders.journal_document_cache import (
+    JournalDocumentCache,
+    JournalDocumentCacheStats,
+)
+from logseq_retriever.models.document import Document
+
+
+class TestJournalDocumentCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = JournalDocumentCache(max_size=2)
+        self.documents = [Document(page_content="Header", metadata={"a": 1})]
+
+    def test_get_miss_then_hit(self):
+        """Test that a lookup misses until the entry is cached, then hits."""
+        self.assertIsNone(self.cache.get("a.md", (1, 10), True))
+
+        self.cache.put("a.md", (1, 10), True, self.documents)
+
+        self.assertEqual(self.cache.get("a.md", (1, 10), True), self.documents)
+        self.assertEqual(
+            self.cache.stats,
+            JournalDocumentCacheStats(
+                hits=1, misses=1, evictions=0, size=1, max_size=2
+            ),
+        )
+
+    def test_get_stale_stamp_misses(self):
+        """Test that a changed (mtime_ns, size) stamp is a miss."""
+        self.cache.put("a.md", (1, 10), True, self.documents)
+
+        self.assertIsNone(self.cache.get("a.md", (2, 10), True))
+        self.assertIsNone(self.cache.get("a.md", (1, 11), True))
+        self.assertEqual(self.cache.stats.misses, 2)
+
+    def test_enable_splitting_is_part_of_key(self):
+        """Test that split & unsplit documents of the same file are cached separately."""
+        self.cache.put("a.md", (1, 10), True, self.documents)
+
+        self.assertIsNone(self.cache.get("a.md", (1, 10), False))
+
+    def test_put_replaces_stale_entry(self):
+        """Test that re-caching a changed file replaces its entry, rather than adding one."""
+        self.cache.put("a.md", (1, 10), True, self.documents)
+        self.cache.put("a.md", (2, 10), True, [Document(page_content="Changed")])
+
+        self.assertEqual(self.cache.stats.size, 1)
+        self.assertEqual(
+            self.cache.get("a.md", (2, 10), True), [Document(page_content="Changed")]
+        )
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted when full."""
+        self.cache.put("a.md", (1, 10), True, self.documents)
+        self.cache.put("b.md", (1, 10), True, self.documents)
+        self.cache.get("a.md", (1, 10), True)
+        self.cache.put("c.md", (1, 10), True, self.documents)
+
+        self.assertIsNone(self.cache.get("b.md", (1, 10), True))
+        self.assertIsNotNone(self.cache.get("a.md", (1, 10), True))
+        self.assertEqual(self.cache.stats.evictions, 1)
+        self.assertEqual(self.cache.stats.size, 2)
+
+    def test_returned_documents_are_copies(self):
+        """Test that mutating returned documents does not corrupt the cache."""
+        self.cache.put("a.md", (1, 10), True, self.documents)
+
+        self.cache.get("a.md", (1, 10), True)[0].metadata["a"] = 2
+        self.documents[0].metadata["a"] = 3
+
+        self.assertEqual(self.cache.get("a.md", (1, 10), True)[0].metadata["a"], 1)
+
+    def test_invalid_max_size(self):
+        """Test that a cache must hold at least 1 entry."""
+        with self.assertRaises(ValueError):
+            JournalDocumentCache(max_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from logseq_retriever.loaders.journal_filesystem_loader import (
+    LogseqJournalFilesystemLoader,
+)
+from logseq_retriever.loaders.journal_loader_input import LogseqJournalLoaderInput
+from logseq_retriever.loaders.journal_persistent_cache import JournalPersistentCache
+from logseq_retriever.models.document import Document
+
+
+class TestJournalPersistentCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "cache.sqlite")
+        self.cache = JournalPersistentCache(self.db_path)
+        self.documents = [
+            Document(page_content="Header", metadata={"journal_date": "2025-03-27"}),
+            Document(page_content="Bullet", metadata={"journal_date": "2025-03-27"}),
+        ]
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def test_get_by_stamp(self):
+        """Test that stored documents are served when the file's stamp is unchanged."""
+        self.cache.put("2025_03_27.md", (1, 10), "hash", True, self.documents)
+
+        self.assertEqual(self.cache.get("2025_03_27.md", (1, 10), True), self.documents)
+        self.assertIsNone(self.cache.get("2025_03_27.md", (2, 10), True))
+        self.assertIsNone(self.cache.get("2025_03_27.md", (1, 10), False))
+
+    def test_get_by_hash_restamps_entry(self):
+        """Test that a content-hash match re-stamps the entry, so the next stamp lookup hits."""
+        self.cache.put("2025_03_27.md", (1, 10), "hash", True, self.documents)
+
+        self.assertIsNone(
+            self.cache.get_by_hash("2025_03_27.md", (2, 10), "other", True)
+        )
+        self.assertEqual(
+            self.cache.get_by_hash("2025_03_27.md", (2, 10), "hash", True),
+            self.documents,
+        )
+        self.assertEqual(self.cache.get("2025_03_27.md", (2, 10), True), self.documents)
+
+    def test_persists_across_instances(self):
+        """Test that entries survive closing & reopening the cache file."""
+        self.cache.put("2025_03_27.md", (1, 10), "hash", True, self.documents)
+        self.cache.close()
+
+        self.cache = JournalPersistentCache(self.db_path)
+        self.assertEqual(self.cache.get("2025_03_27.md", (1, 10), True), self.documents)
+
+    def test_parser_version_change_invalidates_entries(self):
+        """Test that entries written by a different parser version are discarded."""
+        self.cache.put("2025_03_27.md", (1, 10), "hash", True, self.documents)
+        self.cache.close()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "UPDATE cache_info SET value = 'old' WHERE key = 'parser_version'"
+            )
+        conn.close()
+
+        self.cache = JournalPersistentCache(self.db_path)
+        self.assertIsNone(self.cache.get("2025_03_27.md", (1, 10), True))
+
+
+class TestLogseqJournalFilesystemLoaderPersistentCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.journal_dir = Path(self.temp_dir.name) / "journals"
+        self.journal_dir.mkdir()
+        (self.journal_dir / "2025_03_27.md").write_text("March 27\n- bullet")
+        (self.journal_dir / "2025_03_28.md").write_text("March 28")
+        self.db_path = os.path.join(self.temp_dir.name, "cache.sqlite")
+        self.input_data = LogseqJournalLoaderInput(
+            journal_start_date="2025-03-27", journal_end_date="2025-03-28"
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _new_loader(self) -> LogseqJournalFilesystemLoader:
+        loader = LogseqJournalFilesystemLoader(
+            str(self.journal_dir), persistent_cache_path=self.db_path
+        )
+        self.addCleanup(
+            lambda: loader.persistent_cache and loader.persistent_cache.close()
+        )
+        return loader
+
+    def test_new_loader_serves_unchanged_files_without_reading(self):
+        """Test that a new loader serves unchanged journals from the cache file, without opening them."""
+        expected = self._new_loader().load(self.input_data)
+
+        with patch("builtins.open", side_effect=AssertionError("file was read")):
+            self.assertEqual(self._new_loader().load(self.input_data), expected)
+
+    def test_touched_file_is_not_reparsed(self):
+        """Test that a file whose stamp changed, but content did not, is not re-parsed."""
+        self._new_loader().load(self.input_data)
+        os.utime(self.journal_dir / "2025_03_27.md", ns=(0, 0))
+
+        with patch.object(
+            LogseqJournalFilesystemLoader, "parse_journal_markdown_file"
+        ) as mock_parse:
+            self._new_loader().load(self.input_data)
+            mock_parse.assert_not_called()
+
+    def test_changed_file_is_reparsed(self):
+        """Test that a file whose content changed is re-parsed, and the cache updated."""
+        self._new_loader().load(self.input_data)
+        (self.journal_dir / "2025_03_28.md").write_text("March 28, edited")
+
+        documents = self._new_loader().load(self.input_data)
+        self.assertEqual(documents[-1].page_content, "March 28, edited")
+
+        with patch("builtins.open", side_effect=AssertionError("file was read")):
+            self.assertEqual(self._new_loader().load(self.input_data), documents)
+
+
+if __name__ == "__main__":
+    unittest.main()
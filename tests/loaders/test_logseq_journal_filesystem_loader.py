@@ -1,10 +1,16 @@
+import os
+import subprocess
+import sys
+import threading
 import unittest
+from collections.abc import Iterator
 import unittest.mock
 import tempfile
+from datetime import date
 from pathlib import Path
 from unittest.mock import patch
 
-from logseq_retriever.models.document import Document
+from logseq_retriever.models.document import CompactDocument, Document
 from logseq_retriever.loaders.journal_filesystem_loader import (
     LogseqJournalFilesystemLoader,
 )
@@ -304,6 +310,381 @@ class TestLogseqJournalFilesystemLoader(unittest.TestCase):
             for doc in documents:
                 self.assertEqual(doc.metadata["journal_date"], "2025-03-27")
 
+    ###########################################################################
+    ##### lazy_load() tests
+    ###########################################################################
+    def test_lazy_load_yields_documents_in_date_order(self):
+        """Test that lazy_load yields the same documents as load, in date order."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "2025_03_28.md").write_text("March 28\n- bullet")
+            (Path(temp_dir) / "2025_03_27.md").write_text("March 27")
+
+            loader = LogseqJournalFilesystemLoader(temp_dir)
+            input_data = LogseqJournalLoaderInput(
+                journal_start_date="2025-03-27", journal_end_date="2025-03-28"
+            )
+
+            documents = loader.lazy_load(input_data)
+            self.assertIsInstance(documents, Iterator)
+            self.assertEqual(
+                [doc.page_content for doc in documents],
+                ["March 27", "March 28", "bullet"],
+            )
+            self.assertEqual(
+                loader.load(input_data), list(loader.lazy_load(input_data))
+            )
+
+    def test_lazy_load_reads_files_on_demand(self):
+        """Test that lazy_load does not read the next file until it is needed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "2025_03_27.md").write_text("March 27")
+            (Path(temp_dir) / "2025_03_28.md").write_text("March 28")
+
+            loader = LogseqJournalFilesystemLoader(temp_dir)
+            input_data = LogseqJournalLoaderInput(
+                journal_start_date="2025-03-27", journal_end_date="2025-03-28"
+            )
+
+            with patch.object(
+                LogseqJournalFilesystemLoader,
+                "parse_journal_markdown_file",
+                side_effect=lambda content, filename, enable_splitting=True: [
+                    Document(page_content=content)
+                ],
+            ) as mock_parse:
+                documents = loader.lazy_load(input_data)
+                self.assertEqual(mock_parse.call_count, 0)
+                self.assertEqual(next(documents).page_content, "March 27")
+                self.assertEqual(mock_parse.call_count, 1)
+
+    def test_lazy_load_invalid_date_range(self):
+        """Test that lazy_load raises ValueError eagerly, before iteration."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = LogseqJournalFilesystemLoader(temp_dir)
+            input_data = LogseqJournalLoaderInput(
+                journal_start_date="2025-03-27", journal_end_date="2025-03-26"
+            )
+
+            with self.assertRaises(ValueError):
+                loader.lazy_load(input_data)
+
+    ###########################################################################
+    ##### date index tests
+    ###########################################################################
+    def test_find_journals_sorted_by_date(self):
+        """Test that the date index returns matching journals in date order."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for name in ["2025_04_15.md", "2024_12_31.md", "2025_03_27.md", "notes.md"]:
+                (Path(temp_dir) / name).write_text("Test content")
+
+            loader = LogseqJournalFilesystemLoader(temp_dir)
+
+            self.assertEqual(
+                loader._find_journals(date(2024, 1, 1), date(2025, 12, 31)),
+                ["2024_12_31.md", "2025_03_27.md", "2025_04_15.md"],
+            )
+            self.assertEqual(
+                loader._find_journals(date(2025, 3, 27), date(2025, 3, 27)),
+                ["2025_03_27.md"],
+            )
+            self.assertEqual(
+                loader._find_journals(date(2025, 3, 28), date(2025, 4, 14)), []
+            )
+
+    def test_journal_sizes(self):
+        """Test that journal sizes are returned in date order, within the range."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "2025_04_15.md").write_text("x" * 30)
+            (Path(temp_dir) / "2025_03_27.md").write_text("x" * 10)
+            (Path(temp_dir) / "2025_05_01.md").write_text("x" * 50)
+
+            loader = LogseqJournalFilesystemLoader(temp_dir)
+
+            self.assertEqual(
+                loader.journal_sizes(date(2025, 1, 1), date(2025, 4, 30)),
+                [(date(2025, 3, 27), 10), (date(2025, 4, 15), 30)],
+            )
+
+    def test_index_refreshes_when_directory_changes(self):
+        """Test that journals added after initialization are picked up by load."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "2025_03_27.md").write_text("March 27 content")
+            loader = LogseqJournalFilesystemLoader(temp_dir)
+
+            (Path(temp_dir) / "2025_03_28.md").write_text("March 28 content")
+            # force a different mtime, in case the filesystem's timestamp resolution is coarse
+            os.utime(temp_dir, ns=(0, 0))
+
+            input_data = LogseqJournalLoaderInput(
+                journal_start_date="2025-03-27", journal_end_date="2025-03-28"
+            )
+            documents = loader.load(input_data)
+            self.assertEqual(
+                [doc.page_content for doc in documents],
+                ["March 27 content", "March 28 content"],
+            )
+
+    def test_index_not_rebuilt_when_directory_unchanged(self):
+        """Test that the directory is not rescanned when its mtime is unchanged."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "2025_03_27.md").write_text("Test content")
+            loader = LogseqJournalFilesystemLoader(temp_dir)
+
+            with patch.object(loader, "_build_index") as mock_build_index:
+                loader._find_journals(date(2025, 3, 1), date(2025, 3, 31))
+                mock_build_index.assert_not_called()
+
+    ###########################################################################
+    ##### cache tests
+    ###########################################################################
+    def test_cache_disabled_by_default(self):
+        """Test that the parsed-document cache is disabled unless cache_size is set."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = LogseqJournalFilesystemLoader(temp_dir)
+
+            self.assertIsNone(loader.cache)
+            self.assertIsNone(loader.cache_stats)
+
+    def test_cache_only_reparses_changed_files(self):
+        """Test that repeated loads only re-parse files that changed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "2025_03_27.md").write_text("March 27")
+            march_28 = Path(temp_dir) / "2025_03_28.md"
+            march_28.write_text("March 28")
+
+            loader = LogseqJournalFilesystemLoader(temp_dir, cache_size=10)
+            input_data = LogseqJournalLoaderInput(
+                journal_start_date="2025-03-27", journal_end_date="2025-03-28"
+            )
+
+            with patch.object(
+                LogseqJournalFilesystemLoader,
+                "parse_journal_markdown_file",
+                wraps=LogseqJournalFilesystemLoader.parse_journal_markdown_file,
+            ) as mock_parse:
+                first = loader.load(input_data)
+                self.assertEqual(loader.load(input_data), first)
+                self.assertEqual(mock_parse.call_count, 2)
+
+                march_28.write_text("March 28, edited")
+                documents = loader.load(input_data)
+                self.assertEqual(mock_parse.call_count, 3)
+                self.assertEqual(documents[-1].page_content, "March 28, edited")
+
+            stats = loader.cache_stats
+            assert stats is not None
+            self.assertEqual((stats.hits, stats.misses), (3, 3))
+
+    ###########################################################################
+    ##### parallel load() tests
+    ###########################################################################
+    def test_load_parallel_matches_serial(self):
+        """Test that parsing in a process pool returns the same documents as serial load, in date order."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for day in range(1, 29):
+                (Path(temp_dir) / f"2025_02_{day:02}.md").write_text(
+                    f"Feb {day}\n- first\n- second"
+                )
+            input_data = LogseqJournalLoaderInput(
+                journal_start_date="2025-02-03", journal_end_date="2025-02-25"
+            )
+
+            serial = LogseqJournalFilesystemLoader(temp_dir).load(input_data)
+            loader = LogseqJournalFilesystemLoader(
+                temp_dir, workers=2, parallel_min_files=2, cache_size=100
+            )
+            with patch.object(
+                loader, "_load_parallel", wraps=loader._load_parallel
+            ) as mock_parallel:
+                self.assertEqual(loader.load(input_data), serial)
+                mock_parallel.assert_called_once()
+
+            # parsed journals are cached by the parent process
+            stats = loader.cache_stats
+            assert stats is not None
+            self.assertEqual(stats.size, 23)
+            self.assertEqual(loader.load(input_data), serial)
+            self.assertEqual(loader.cache_stats.hits, 23)  # type: ignore[union-attr]
+
+    def test_load_parallel_falls_back_without_main_guard(self):
+        """Test that a script without a `__main__` guard, whose workers can't start, still loads serially."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for day in range(1, 5):
+                (Path(temp_dir) / f"2025_02_{day:02}.md").write_text(f"Feb {day}")
+            script = Path(temp_dir) / "unguarded.py"
+            script.write_text(
+                "from logseq_retriever.loaders.journal_filesystem_loader import LogseqJournalFilesystemLoader\n"
+                "from logseq_retriever.loaders.journal_loader_input import LogseqJournalLoaderInput\n"
+                f"loader = LogseqJournalFilesystemLoader({temp_dir!r}, workers=2, parallel_min_files=2)\n"
+                "input = LogseqJournalLoaderInput(journal_start_date='2025-02-01', journal_end_date='2025-02-28')\n"
+                "print([doc.page_content for doc in loader.load(input)])\n"
+            )
+
+            result = subprocess.run(
+                [sys.executable, str(script)],
+                check=False,
+                capture_output=True,
+                text=True,
+                timeout=60,
+                env={**os.environ, "PYTHONPATH": str(Path(__file__).parents[2])},
+            )
+
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertEqual(
+                result.stdout.splitlines()[-1],
+                str([f"Feb {day}" for day in range(1, 5)]),
+            )
+            self.assertIn("parsing serially instead", result.stderr)
+
+    def test_load_small_range_is_serial(self):
+        """Test that ranges smaller than parallel_min_files are parsed without a process pool."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "2025_03_27.md").write_text("March 27")
+            loader = LogseqJournalFilesystemLoader(temp_dir, workers=4)
+            input_data = LogseqJournalLoaderInput(
+                journal_start_date="2025-03-01", journal_end_date="2025-03-31"
+            )
+
+            with patch.object(loader, "_load_parallel") as mock_parallel:
+                documents = loader.load(input_data)
+                mock_parallel.assert_not_called()
+            self.assertEqual([doc.page_content for doc in documents], ["March 27"])
+
+    ###########################################################################
+    ##### validate_metadata tests
+    ###########################################################################
+    def test_load_trusted_metadata_matches_validated(self):
+        """Test that skipping metadata validation produces the same documents, serially & in parallel."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for day in range(1, 6):
+                (Path(temp_dir) / f"2025_02_{day:02}.md").write_text(
+                    f"Feb {day} #tag{day}\n- first [[page]]\n- second " + "word " * 50
+                )
+            input_data = LogseqJournalLoaderInput(
+                journal_start_date="2025-02-01",
+                journal_end_date="2025-02-28",
+                max_char_length=100,
+            )
+
+            validated = LogseqJournalFilesystemLoader(temp_dir).load(input_data)
+            trusted = LogseqJournalFilesystemLoader(
+                temp_dir, validate_metadata=False
+            ).load(input_data)
+            parallel = LogseqJournalFilesystemLoader(
+                temp_dir, validate_metadata=False, workers=2, parallel_min_files=2
+            ).load(input_data)
+            self.assertEqual(trusted, validated)
+            self.assertEqual(parallel, validated)
+
+    def test_load_trusted_metadata_skips_model(self):
+        """Test that the trusted path never builds a LogseqJournalDocumentMetadata."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "2025_03_27.md").write_text("March 27 #tag\n- second")
+            loader = LogseqJournalFilesystemLoader(temp_dir, validate_metadata=False)
+            input_data = LogseqJournalLoaderInput(
+                journal_start_date="2025-03-27", journal_end_date="2025-03-27"
+            )
+
+            with patch.object(
+                LogseqJournalFilesystemLoader, "parse_journal_markdown_file_metadata"
+            ) as mock_metadata:
+                documents = loader.load(input_data)
+                mock_metadata.assert_not_called()
+            self.assertEqual(
+                documents[0].metadata,
+                {
+                    "journal_date": "2025-03-27",
+                    "journal_tags": ["tag"],
+                    "journal_char_count": 13,
+                },
+            )
+
+    def test_load_compact_documents_matches_default(self):
+        """Test that compact_documents returns equal CompactDocuments, serially & in parallel."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for day in range(1, 6):
+                (Path(temp_dir) / f"2025_02_{day:02}.md").write_text(
+                    f"Feb {day} #tag{day}\n- first\n- second"
+                )
+            input_data = LogseqJournalLoaderInput(
+                journal_start_date="2025-02-01", journal_end_date="2025-02-28"
+            )
+
+            default = LogseqJournalFilesystemLoader(temp_dir).load(input_data)
+            for loader in (
+                LogseqJournalFilesystemLoader(temp_dir, compact_documents=True),
+                LogseqJournalFilesystemLoader(
+                    temp_dir, compact_documents=True, workers=2, parallel_min_files=2
+                ),
+            ):
+                compact = loader.load(input_data)
+                self.assertEqual(compact, default)
+                self.assertTrue(all(isinstance(d, CompactDocument) for d in compact))
+
+    ###########################################################################
+    ##### max_char_length & min_char_length tests
+    ###########################################################################
+    def test_load_splits_sections_longer_than_max_char_length(self):
+        """Test that sections longer than max_char_length are split, and metadata recomputed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "2025_03_27.md").write_text(
+                "- short\n- long root. with a sentence\n  - child one\n  - child two"
+            )
+            loader = LogseqJournalFilesystemLoader(temp_dir)
+            input_data = LogseqJournalLoaderInput(
+                journal_start_date="2025-03-27",
+                journal_end_date="2025-03-27",
+                max_char_length=30,
+            )
+
+            documents = loader.load(input_data)
+
+            self.assertEqual(
+                [doc.page_content for doc in documents],
+                ["short", "long root. with a sentence", "- child one\n  - child two"],
+            )
+            for doc in documents:
+                self.assertLessEqual(len(doc.page_content), 30)
+                self.assertEqual(
+                    doc.metadata["journal_char_count"], len(doc.page_content)
+                )
+
+    def test_load_merges_sections_shorter_than_min_char_length(self):
+        """Test that tiny adjacent sections are merged, up to max_char_length."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "2025_03_27.md").write_text(
+                "Header\n- First bullet\n- Second bullet"
+            )
+            loader = LogseqJournalFilesystemLoader(temp_dir)
+            input_data = LogseqJournalLoaderInput(
+                journal_start_date="2025-03-27",
+                journal_end_date="2025-03-27",
+                min_char_length=64,
+            )
+
+            documents = loader.load(input_data)
+
+            self.assertEqual(len(documents), 1)
+            self.assertEqual(
+                documents[0].page_content, "Header\n- First bullet\n- Second bullet"
+            )
+
+    def test_load_without_splitting_ignores_max_char_length(self):
+        """Test that the whole file is returned when splitting is disabled."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            content = "Header\n- First bullet\n- Second bullet"
+            (Path(temp_dir) / "2025_03_27.md").write_text(content)
+            loader = LogseqJournalFilesystemLoader(temp_dir)
+            input_data = LogseqJournalLoaderInput(
+                journal_start_date="2025-03-27",
+                journal_end_date="2025-03-27",
+                max_char_length=10,
+                enable_splitting=False,
+            )
+
+            documents = loader.load(input_data)
+            self.assertEqual([doc.page_content for doc in documents], [content])
+
     ###########################################################################
     ##### parse_journal_markdown_file() tests
     ###########################################################################
@@ -357,6 +738,32 @@ class TestLogseqJournalFilesystemLoader(unittest.TestCase):
         self.assertEqual(docs[0].metadata["journal_date"], "2025-03-27")
         self.assertEqual(docs[0].metadata["journal_char_count"], len(content))
 
+    def test_iter_journal_markdown_file_sections(self):
+        """Test that iter_journal_markdown_file lazily yields one document per non-empty root-level block."""
+        filename = "2025_03_27.md"
+        test_cases = [
+            ("", True, []),
+            ("Header text", True, ["Header text"]),
+            (
+                "Header text\n- First bullet point\n- \n- Second bullet point\n- ",
+                True,
+                ["Header text", "First bullet point", "Second bullet point"],
+            ),
+            (
+                "- Leading bullet\n  - nested\n- Trailing bullet",
+                True,
+                ["Leading bullet\n  - nested", "Trailing bullet"],
+            ),
+            ("Header\n- bullet", False, ["Header\n- bullet"]),
+        ]
+
+        for content, enable_splitting, expected in test_cases:
+            docs = LogseqJournalFilesystemLoader.iter_journal_markdown_file(
+                content, filename, enable_splitting
+            )
+            self.assertIsInstance(docs, Iterator)
+            self.assertEqual([doc.page_content for doc in docs], expected)
+
     ###########################################################################
     ##### parse_journal_markdown_file_metadata() tests
     ###########################################################################
@@ -441,6 +848,86 @@ class TestLogseqJournalFilesystemLoader(unittest.TestCase):
             self.assertEqual(metadata.journal_char_count, len(content))
 
 
+class TestLogseqJournalFilesystemLoaderAsync(unittest.IsolatedAsyncioTestCase):
+    """Tests for LogseqJournalFilesystemLoader's async methods."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        for day in range(1, 11):
+            (Path(self.temp_dir.name) / f"2025_03_{day:02}.md").write_text(
+                f"March {day}\n- bullet {day}"
+            )
+        self.loader = LogseqJournalFilesystemLoader(self.temp_dir.name, max_workers=3)
+        self.input_data = LogseqJournalLoaderInput(
+            journal_start_date="2025-03-02", journal_end_date="2025-03-09"
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    async def test_aload_matches_load(self):
+        """Test that aload returns the same documents as load, in date order."""
+        documents = await self.loader.aload(self.input_data)
+
+        self.assertEqual(documents, self.loader.load(self.input_data))
+        self.assertEqual(documents[0].page_content, "March 2")
+        self.assertEqual(documents[-1].page_content, "bullet 9")
+
+    async def test_alazy_load_yields_in_date_order(self):
+        """Test that alazy_load yields documents in date order."""
+        dates = [
+            doc.metadata["journal_date"]
+            async for doc in self.loader.alazy_load(self.input_data)
+        ]
+
+        self.assertEqual(dates, sorted(dates))
+        self.assertEqual(len(dates), 16)
+
+    async def test_alazy_load_bounds_files_in_flight(self):
+        """Test that alazy_load reads no more than max_workers files ahead of the consumer."""
+        with patch.object(
+            LogseqJournalFilesystemLoader,
+            "parse_journal_markdown_file",
+            side_effect=lambda content, filename, enable_splitting=True: [
+                Document(page_content=content)
+            ],
+        ) as mock_parse:
+            documents = self.loader.alazy_load(self.input_data)
+            await anext(documents)
+            # the consumed file, plus up to max_workers files read ahead
+            self.assertLessEqual(mock_parse.call_count, 4)
+            await documents.aclose()
+
+    async def test_aload_stops_its_threads(self):
+        """Test that each aload call's thread pool is shut down once it returns."""
+
+        def loader_threads() -> list[threading.Thread]:
+            return [
+                thread
+                for thread in threading.enumerate()
+                if thread.name.startswith("logseq-journal-loader")
+            ]
+
+        await self.loader.aload(self.input_data)
+        for thread in loader_threads():
+            thread.join(timeout=5)
+        self.assertEqual(loader_threads(), [])
+
+    async def test_aload_invalid_date_range(self):
+        """Test that aload raises ValueError when end date is before start date."""
+        input_data = LogseqJournalLoaderInput(
+            journal_start_date="2025-03-27", journal_end_date="2025-03-26"
+        )
+
+        with self.assertRaises(ValueError):
+            await self.loader.aload(input_data)
+
+    def test_init_with_invalid_max_workers(self):
+        """Test that initialization raises ValueError when max_workers is less than 1."""
+        with self.assertRaises(ValueError):
+            LogseqJournalFilesystemLoader(self.temp_dir.name, max_workers=0)
+
+
 class TestLogseqJournalFilesystemLoaderWithRealFiles(unittest.TestCase):
     """Tests for LogseqJournalFilesystemLoader using real Logseq journal files."""
 
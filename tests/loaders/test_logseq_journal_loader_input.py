@@ -62,6 +62,20 @@ class TestLogseqJournalLoaderInput(unittest.TestCase):
         # Check that max_char_length is set correctly
         self.assertEqual(input_data.max_char_length, 4096)
 
+    def test_create_with_min_char_length_above_max(self):
+        """Test that min_char_length may not exceed max_char_length."""
+        with self.assertRaises(ValueError) as context:
+            LogseqJournalLoaderInput(
+                journal_start_date="2023-01-01",
+                journal_end_date="2023-12-31",
+                max_char_length=100,
+                min_char_length=101,
+            )
+
+        self.assertIn(
+            "min_char_length must not exceed max_char_length", str(context.exception)
+        )
+
     def test_create_with_invalid_start_date(self):
         """Test that creating with an invalid start date raises a validation error."""
         with self.assertRaises(ValueError) as context:
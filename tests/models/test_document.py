@@ -0,0 +1,77 @@
+import dataclasses
+import pickle
+import unittest
+import weakref
+
+from logseq_retriever.models.document import CompactDocument, Document
+
+
+class TestCompactDocument(unittest.TestCase):
+    def setUp(self):
+        self.documents = [
+            Document("first", {"journal_date": "2025-07-07", "journal_tags": ["a"]}),
+            Document("second", {"journal_date": "2025-07-07", "journal_tags": []}),
+        ]
+
+    def test_from_documents_equals_originals(self):
+        compact = CompactDocument.from_documents(self.documents)
+        self.assertEqual(compact, self.documents)
+        self.assertEqual(self.documents, compact)
+        self.assertIsInstance(compact[0], Document)
+        self.assertEqual(CompactDocument.from_documents([]), [])
+
+    def test_shares_buffer_and_common_metadata(self):
+        first, second = CompactDocument.from_documents(self.documents)
+        self.assertIs(first._buffer, second._buffer)
+        self.assertIs(first._layout, second._layout)
+        assert first._layout is not None
+        self.assertEqual(first._layout.shared, {"journal_date": "2025-07-07"})
+        # mutable values are never shared, and lists are stored as tuples
+        self.assertEqual(first._metadata, (("a",),))
+        self.assertEqual(second.metadata, self.documents[1].metadata)
+        self.assertIsNot(
+            second.metadata["journal_tags"], self.documents[1].metadata["journal_tags"]
+        )
+
+    def test_metadata_materialized_per_document(self):
+        first, second = CompactDocument.from_documents(self.documents)
+        first.metadata["journal_date"] = "changed"
+        first.metadata["journal_tags"].append("b")
+        self.assertEqual(first.metadata["journal_tags"], ["a", "b"])
+        self.assertEqual(second.metadata["journal_date"], "2025-07-07")
+
+    def test_document_contract(self):
+        document = CompactDocument(page_content="content", metadata={"key": "value"})
+        self.assertEqual(document, Document("content", {"key": "value"}))
+        self.assertEqual(CompactDocument("content").metadata, {})
+        first = CompactDocument.from_documents(self.documents)[0]
+        replaced = dataclasses.replace(first, page_content="replaced")
+        self.assertIs(type(replaced), CompactDocument)
+        self.assertEqual(replaced, Document("replaced", self.documents[0].metadata))
+        # `Document` remains a plain dataclass
+        plain = Document("content")
+        plain.extra = 1  # type: ignore[attr-defined]
+        self.assertIs(weakref.ref(plain)(), plain)
+
+    def test_assignment(self):
+        document = CompactDocument.from_documents(self.documents)[0]
+        self.assertEqual(document.page_content, "first")
+        document.page_content = "replaced"
+        document.metadata = {"key": "value"}
+        self.assertEqual(document, Document("replaced", {"key": "value"}))
+
+    def test_to_document(self):
+        compact = CompactDocument.from_documents(self.documents)
+        documents = [document.to_document() for document in compact]
+        self.assertEqual(documents, self.documents)
+        self.assertIs(type(documents[0]), Document)
+
+    def test_pickle(self):
+        compact = CompactDocument.from_documents(self.documents)
+        restored = pickle.loads(pickle.dumps(compact))
+        self.assertEqual(restored, self.documents)
+        self.assertIs(restored[0]._buffer, restored[1]._buffer)
+
+
+if __name__ == "__main__":
+    unittest.main()
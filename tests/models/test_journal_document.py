@@ -0,0 +1,149 @@
+import unittest
+
+from pgvector.sqlalchemy import HALFVEC, Vector
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from logseq_retriever.models.journal_pgvector import (
+    JournalDocument,
+    VectorIndexConfig,
+    journal_document_cls,
+)
+
+
+def compile_indexes(document_cls) -> dict[str, str]:
+    return {
+        index.name: str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        for index in document_cls.__table__.indexes
+    }
+
+
+class TestJournalDocumentCls(unittest.TestCase):
+    def test_defaults_return_journal_document(self):
+        self.assertIs(journal_document_cls(), JournalDocument)
+        self.assertIs(journal_document_cls(1024, "vector"), JournalDocument)
+
+    def test_journal_document_table(self):
+        indexes = compile_indexes(JournalDocument)
+        self.assertEqual(JournalDocument.__tablename__, "logseq_journal")
+        self.assertIn(
+            "USING hnsw (embedding vector_cosine_ops)",
+            indexes["logseq_journal_embedding_hnsw_idx"],
+        )
+        self.assertTrue(
+            all(
+                name.startswith(("logseq_journal", "ix_logseq_journal"))
+                for name in indexes
+            )
+        )
+
+    def test_embedding_bits_index(self):
+        self.assertIn(
+            "USING hnsw (embedding_bits bit_hamming_ops)",
+            compile_indexes(JournalDocument)["logseq_journal_embedding_bits_hnsw_idx"],
+        )
+        document_cls = journal_document_cls(256, "halfvec")
+        self.assertEqual(document_cls.__table__.c.embedding_bits.type.length, 256)
+        self.assertIn(
+            "logseq_journal_halfvec256_embedding_bits_hnsw_idx",
+            compile_indexes(document_cls),
+        )
+
+    def test_vector_indexes(self):
+        embedding_index, bits_index = JournalDocument.get_vector_indexes(
+            "logseq_journal", VectorIndexConfig(method="ivfflat", lists=50)
+        )
+        self.assertEqual(embedding_index.name, "logseq_journal_embedding_ivfflat_idx")
+        self.assertEqual(
+            embedding_index.dialect_options["postgresql"]["using"], "ivfflat"
+        )
+        self.assertEqual(
+            embedding_index.dialect_options["postgresql"]["with"], {"lists": 50}
+        )
+        self.assertEqual(bits_index.name, "logseq_journal_embedding_bits_ivfflat_idx")
+        self.assertIn(
+            "WITH (m = 16, ef_construction = 64)",
+            compile_indexes(JournalDocument)["logseq_journal_embedding_hnsw_idx"],
+        )
+
+    def test_vector_index_columns(self):
+        (bits_index,) = JournalDocument.get_vector_indexes(
+            "logseq_journal", VectorIndexConfig(columns=("embedding_bits",))
+        )
+        self.assertEqual(bits_index.name, "logseq_journal_embedding_bits_hnsw_idx")
+        with self.assertRaises(ValidationError):
+            VectorIndexConfig(columns=())
+
+    def test_vector_index_config_validation(self):
+        with self.assertRaises(ValidationError):
+            VectorIndexConfig(m=32, ef_construction=40)
+        # ef_construction only applies to HNSW
+        VectorIndexConfig(method="ivfflat", m=32, ef_construction=40)
+
+    def test_journal_date_index(self):
+        self.assertEqual(
+            compile_indexes(JournalDocument)["logseq_journal_journal_date_idx"],
+            "CREATE INDEX logseq_journal_journal_date_idx ON logseq_journal (journal_date)",
+        )
+        self.assertIn(
+            "logseq_journal_vector256_journal_date_idx",
+            compile_indexes(journal_document_cls(256)),
+        )
+
+    def test_metadata_path_gin_index(self):
+        self.assertEqual(
+            compile_indexes(JournalDocument)["logseq_journal_metadata_path_gin_idx"],
+            "CREATE INDEX logseq_journal_metadata_path_gin_idx ON logseq_journal "
+            "USING gin (document_metadata jsonb_path_ops)",
+        )
+
+    def test_binary_quantize(self):
+        self.assertEqual(JournalDocument.binary_quantize([0.5, -0.1, 0.0, 2.0]), "1001")
+
+    def test_halfvec_table(self):
+        document_cls = journal_document_cls(512, "halfvec")
+
+        self.assertIs(journal_document_cls(512, "halfvec"), document_cls)
+        self.assertEqual(document_cls.__tablename__, "logseq_journal_halfvec512")
+        embedding_type = document_cls.__table__.c.embedding.type
+        self.assertIsInstance(embedding_type, HALFVEC)
+        self.assertEqual(embedding_type.dim, 512)
+        self.assertIn(
+            "USING hnsw (embedding halfvec_cosine_ops)",
+            compile_indexes(document_cls)[
+                "logseq_journal_halfvec512_embedding_hnsw_idx"
+            ],
+        )
+        # the corpus ID is a date string, as in `JournalDocument`
+        self.assertEqual(document_cls.__table__.c.corpus_id.type.length, 10)
+
+    def test_vector_table_with_other_dimensions(self):
+        document_cls = journal_document_cls(256)
+        embedding_type = document_cls.__table__.c.embedding.type
+        self.assertIsInstance(embedding_type, Vector)
+        self.assertEqual(embedding_type.dim, 256)
+        self.assertEqual(document_cls.__tablename__, "logseq_journal_vector256")
+
+    def test_int8_table_apart_from_float(self):
+        document_cls = journal_document_cls(1024, "halfvec", "int8")
+
+        self.assertIsNot(document_cls, journal_document_cls(1024, "halfvec"))
+        self.assertEqual(document_cls.__tablename__, "logseq_journal_halfvec1024_int8")
+        self.assertIsInstance(document_cls.__table__.c.embedding.type, HALFVEC)
+        self.assertIn(
+            "logseq_journal_halfvec1024_int8_embedding_hnsw_idx",
+            compile_indexes(document_cls),
+        )
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            journal_document_cls(1024, "int4")  # type: ignore[arg-type]
+        with self.assertRaises(ValueError):
+            journal_document_cls(1024, "halfvec", "binary")  # type: ignore[arg-type]
+        with self.assertRaises(ValueError):
+            journal_document_cls(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from logseq_retriever.parsers.metadata_extractor import (
+    ChunkMetadata,
+    extract_chunk_metadata,
+)
+
+UUID_A = "6884f1c2-1234-4abc-9def-0123456789ab"
+UUID_B = "6884f1c2-5678-4abc-9def-0123456789ab"
+
+
+class TestExtractChunkMetadata(unittest.TestCase):
+    def test_counts(self):
+        metadata = extract_chunk_metadata("- one two\n  - three")
+        self.assertEqual(metadata.char_count, 19)
+        self.assertEqual(metadata.word_count, 5)
+
+    def test_empty_content(self):
+        self.assertEqual(
+            extract_chunk_metadata(""), ChunkMetadata(char_count=0, word_count=0)
+        )
+
+    def test_tags(self):
+        content = "#cookout with #2025-07-07, and #script's #\\escaped ##double## #"
+        metadata = extract_chunk_metadata(content)
+        self.assertEqual(
+            metadata.tags, ["cookout", "2025-07-07", "script", "escaped", "double"]
+        )
+
+    def test_tags_must_start_at_whitespace(self):
+        metadata = extract_chunk_metadata("issue#12 and url.com/#anchor")
+        self.assertEqual(metadata.tags, [])
+
+    def test_multi_word_tags_and_page_links(self):
+        content = "- met #[[John Smith]] at [[Jul 7th, 2025]] for [[cookout]]"
+        metadata = extract_chunk_metadata(content)
+        self.assertEqual(metadata.tags, ["John Smith"])
+        self.assertEqual(metadata.page_links, ["Jul 7th, 2025", "cookout"])
+        self.assertEqual(
+            metadata.references, ["John Smith", "Jul 7th, 2025", "cookout"]
+        )
+
+    def test_block_refs_and_anchor_ids(self):
+        content = f"- see (({UUID_A}))\n  id:: {UUID_B}\n- ((not-a-uuid))"
+        metadata = extract_chunk_metadata(content)
+        self.assertEqual(metadata.block_refs, [UUID_A])
+        self.assertEqual(metadata.anchor_ids, [UUID_B])
+        self.assertEqual(metadata.references, [])
+
+    def test_tokens_in_order_of_appearance(self):
+        content = "#b [[y]] #a [[x]]"
+        metadata = extract_chunk_metadata(content)
+        self.assertEqual(metadata.tags, ["b", "a"])
+        self.assertEqual(metadata.page_links, ["y", "x"])
+
+
+if __name__ == "__main__":
+    unittest.main()
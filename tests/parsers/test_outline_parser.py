@@ -0,0 +1,112 @@
+import unittest
+from pathlib import Path
+
+from logseq_retriever.parsers.outline_parser import parse_outline
+
+
+class TestParseOutline(unittest.TestCase):
+    def test_empty(self):
+        outline = parse_outline("")
+        self.assertEqual(outline.blocks, [])
+        self.assertEqual(list(outline.sections()), [])
+
+    def test_preamble_only(self):
+        outline = parse_outline("Just some text\nwithout bullets")
+        self.assertEqual(outline.blocks, [])
+        self.assertEqual(outline.preamble_end, len(outline.text))
+        self.assertEqual(list(outline.sections()), ["Just some text\nwithout bullets"])
+
+    def test_block_tree(self):
+        text = "Header\n- root 1\n  - child\n    - grandchild\n  - child 2\n- root 2"
+        outline = parse_outline(text)
+
+        self.assertEqual(outline.preamble_end, len("Header\n"))
+        self.assertEqual(
+            [(block.depth, block.parent) for block in outline.blocks],
+            [(0, -1), (1, 0), (2, 1), (1, 0), (0, -1)],
+        )
+        self.assertEqual(
+            [
+                outline.block_content(block, include_children=False)
+                for block in outline.blocks
+            ],
+            ["root 1", "child", "grandchild", "child 2", "root 2"],
+        )
+        self.assertEqual(
+            outline.block_content(outline.blocks[1]), "child\n    - grandchild"
+        )
+        self.assertEqual(
+            [outline.block_content(block) for block in outline.roots()],
+            ["root 1\n  - child\n    - grandchild\n  - child 2", "root 2"],
+        )
+
+    def test_offsets_slice_original_text(self):
+        text = "- first\n\t- nested\n- second\n"
+        outline = parse_outline(text)
+        first, nested, second = outline.blocks
+
+        self.assertEqual(text[first.start : first.subtree_end], "- first\n\t- nested\n")
+        self.assertEqual(text[first.content_start : first.end], " first\n")
+        self.assertEqual(text[nested.start : nested.end], "\t- nested\n")
+        self.assertEqual(text[second.start : second.subtree_end], "- second\n")
+        self.assertEqual(
+            [text[start:end] for start, end in outline.section_spans()],
+            ["first\n\t- nested", "second"],
+        )
+
+    def test_tab_indentation(self):
+        outline = parse_outline("- a\n\t- b\n\t\t- c\n\t- d")
+        self.assertEqual([block.depth for block in outline.blocks], [0, 1, 2, 1])
+        self.assertEqual([block.parent for block in outline.blocks], [-1, 0, 1, 0])
+
+    def test_properties(self):
+        text = (
+            "title:: My page\n"
+            "- block\n"
+            "  id:: 686f4ac0-e43b-4a15-940a-954f55e03bea\n"
+            "\t- nested\n"
+            "\t  logseq.order-list-type:: number"
+        )
+        outline = parse_outline(text)
+
+        self.assertEqual(outline.page_properties, {"title": "My page"})
+        self.assertEqual(
+            outline.blocks[0].properties,
+            {"id": "686f4ac0-e43b-4a15-940a-954f55e03bea"},
+        )
+        self.assertEqual(
+            outline.blocks[1].properties, {"logseq.order-list-type": "number"}
+        )
+
+    def test_empty_blocks_are_skipped_in_sections(self):
+        outline = parse_outline("Text\n-\n-Valid\n-  \n-\t\n-Content")
+        self.assertEqual(len(outline.blocks), 5)
+        self.assertEqual(list(outline.sections()), ["Text", "Valid", "Content"])
+
+    def test_horizontal_rule_is_not_a_block(self):
+        outline = parse_outline("- block\n---\nmore")
+        self.assertEqual(len(outline.blocks), 1)
+        self.assertEqual(list(outline.sections()), ["block\n---\nmore"])
+
+    def test_fenced_code_is_not_split(self):
+        text = "- code\n  ```\n- not a block\n  ```\n- next"
+        outline = parse_outline(text)
+        self.assertEqual(
+            list(outline.sections()), ["code\n  ```\n- not a block\n  ```", "next"]
+        )
+
+    def test_real_journal(self):
+        path = (
+            Path(__file__).parent.parent / "loaders" / "test_journals" / "2025_03_29.md"
+        )
+        outline = parse_outline(path.read_text())
+
+        sections = list(outline.sections())
+        self.assertEqual(len(sections), 3)
+        self.assertTrue(sections[0].startswith("Coding session #programming"))
+        self.assertIn("def process_data(data):", sections[0])
+        self.assertEqual(sum(block.depth == 2 for block in outline.blocks), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
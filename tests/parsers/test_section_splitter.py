@@ -0,0 +1,96 @@
+import unittest
+
+from logseq_retriever.parsers.section_splitter import (
+    merge_sections,
+    resize_sections,
+    split_section,
+)
+
+
+class TestSplitSection(unittest.TestCase):
+    def test_short_section_unchanged(self):
+        self.assertEqual(list(split_section("  short  ", 10)), ["short"])
+        self.assertEqual(list(split_section("   ", 10)), [])
+
+    def test_prefers_block_boundaries(self):
+        text = "root. More text\n  - child one\n  - child two"
+        pieces = list(split_section(text, 30))
+        self.assertEqual(pieces, ["root. More text\n  - child one", "- child two"])
+
+    def test_falls_back_to_sentence_boundaries(self):
+        text = "First sentence. Second sentence! Third one?"
+        pieces = list(split_section(text, 20))
+        self.assertEqual(pieces, ["First sentence.", "Second sentence!", "Third one?"])
+
+    def test_falls_back_to_whitespace(self):
+        text = "aaaa bbbb cccc dddd"
+        pieces = list(split_section(text, 10))
+        self.assertEqual(pieces, ["aaaa bbbb", "cccc dddd"])
+
+    def test_hard_cut_without_boundaries(self):
+        self.assertEqual(
+            list(split_section("a" * 25, 10)), ["a" * 10, "a" * 10, "a" * 5]
+        )
+
+    def test_pieces_respect_max_chars(self):
+        text = "- root\n" + "".join(
+            f"\t- child {i}. It has a sentence or two. And some words\n"
+            for i in range(200)
+        )
+        pieces = list(split_section(text, 300))
+        self.assertTrue(all(len(piece) <= 300 for piece in pieces))
+        self.assertEqual("".join(pieces).replace("\t", "").count("child"), 200)
+
+    def test_invalid_max_chars(self):
+        with self.assertRaises(ValueError):
+            list(split_section("text", 0))
+
+
+class TestMergeSections(unittest.TestCase):
+    def test_merges_tiny_sections_up_to_max(self):
+        sections = ["a", "b", "c", "dddddddd", "e"]
+        self.assertEqual(
+            list(merge_sections(sections, min_chars=5, max_chars=12, separator="|")),
+            ["a|b|c", "dddddddd", "e"],
+        )
+
+    def test_does_not_exceed_max(self):
+        sections = ["aaaa", "bbbb", "cccc"]
+        self.assertEqual(
+            list(merge_sections(sections, min_chars=100, max_chars=9, separator="|")),
+            ["aaaa|bbbb", "cccc"],
+        )
+
+    def test_default_separator_restores_bullets(self):
+        self.assertEqual(
+            list(merge_sections(["Header", "First"], min_chars=100, max_chars=100)),
+            ["Header\n- First"],
+        )
+
+    def test_empty(self):
+        self.assertEqual(list(merge_sections([], min_chars=5, max_chars=10)), [])
+
+
+class TestResizeSections(unittest.TestCase):
+    def test_split_then_merge(self):
+        sections = ["a", "b", "one two three four five"]
+        self.assertEqual(
+            list(resize_sections(sections, max_chars=15, min_chars=5)),
+            ["a\n- b", "one two three", "four five"],
+        )
+
+    def test_split_pieces_merge_without_bullet(self):
+        # pieces of one section rejoin with a line break; only the next section gets a bullet
+        sections = ["aaaa" + " " * 10 + "bbbb", "cc"]
+        self.assertEqual(list(split_section(sections[0], 14)), ["aaaa", "bbbb"])
+        self.assertEqual(
+            list(resize_sections(sections, max_chars=14, min_chars=14)),
+            ["aaaa\nbbbb\n- cc"],
+        )
+
+    def test_no_merging_by_default(self):
+        self.assertEqual(list(resize_sections(["a", "b"], max_chars=10)), ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
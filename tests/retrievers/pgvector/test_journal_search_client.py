@@ -0,0 +1,237 @@
+import unittest
+from datetime import date
+from unittest.mock import MagicMock, Mock
+
+from pgvector_template.core.embedder import BaseEmbeddingProvider
+from pgvector_template.models.search import MetadataFilter
+from sqlalchemy.dialects import postgresql
+
+from logseq_retriever.models.journal_pgvector import (
+    JournalDocument,
+    JournalSearchClientConfig,
+    JournalSearchQuery,
+)
+from logseq_retriever.retrievers.pgvector.journal_search_client import (
+    JournalSearchClient,
+)
+
+
+def compile_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestJournalSearchClient(unittest.TestCase):
+    def setUp(self):
+        self.provider = Mock(spec=BaseEmbeddingProvider)
+        self.provider.embed_text.return_value = [0.5, -0.25, 0.0, 1.0] * 256
+        self.session = MagicMock()
+        self.session.execute.return_value.all.return_value = [
+            (Mock(spec=JournalDocument), 0.5)
+        ]
+        # no rows without `embedding_bits`
+        self.session.scalar.return_value = False
+
+    def make_client(self, **config) -> JournalSearchClient:
+        return JournalSearchClient(
+            self.session,
+            JournalSearchClientConfig(embedding_provider=self.provider, **config),
+        )
+
+    def test_binary_rerank_query(self):
+        client = self.make_client(binary_rerank=True, rerank_multiplier=4)
+        results = client.search(
+            JournalSearchQuery(
+                text="garden",
+                keywords=["tomato"],
+                metadata_filters=[
+                    MetadataFilter(
+                        field_name="date_str", condition="gte", value="2025-01-01"
+                    )
+                ],
+                limit=5,
+            )
+        )
+
+        (statement,), _ = self.session.execute.call_args
+        sql = " ".join(compile_sql(statement).split())
+        outer, candidates = sql.split("JOIN (", 1)
+        candidates, outer_tail = candidates.split(") AS candidates", 1)
+        # the exact distance is computed in the derived table, & the outer query orders by it
+        self.assertNotIn("<=>", outer + outer_tail)
+        self.assertRegex(
+            candidates,
+            r"^SELECT logseq_journal.id AS id, "
+            r"logseq_journal.embedding <=> \S+ AS _score_distance FROM logseq_journal "
+            r"WHERE .* ORDER BY logseq_journal.embedding_bits <~> \S+ LIMIT \S+$",
+        )
+        self.assertIn("ILIKE", candidates)
+        self.assertIn("journal_date", candidates)
+        self.assertEqual(
+            outer_tail.strip(),
+            "ON logseq_journal.id = candidates.id "
+            "ORDER BY candidates._score_distance LIMIT %(param_2)s::INTEGER",
+        )
+        params = statement.compile().params.values()
+        self.assertEqual(sorted(v for v in params if isinstance(v, int)), [5, 5 * 4])
+        self.assertEqual(results[0].score, 0.75)
+        # the query is embedded once, for both stages
+        self.provider.embed_text.assert_called_once_with("garden")
+
+    def test_query_bits(self):
+        client = self.make_client(binary_rerank=True)
+        client.search(JournalSearchQuery(text="garden"))
+
+        (statement,), _ = self.session.execute.call_args
+        params = statement.compile(dialect=postgresql.dialect()).params
+        self.assertIn("1001" * 256, [str(value) for value in params.values()])
+
+    def test_binary_rerank_skipped_until_bits_backfilled(self):
+        self.session.scalar.return_value = True
+        client = self.make_client(binary_rerank=True)
+
+        with self.assertLogs(
+            "logseq_retriever.retrievers.pgvector.journal_search_client", "WARNING"
+        ):
+            client.search(JournalSearchQuery(text="garden"))
+        (statement,), _ = self.session.execute.call_args
+        self.assertNotIn("<~>", compile_sql(statement))
+        (check,), _ = self.session.scalar.call_args
+        self.assertIn("embedding_bits IS NULL", compile_sql(check))
+
+        self.session.scalar.return_value = False
+        client.search(JournalSearchQuery(text="garden"))
+        client.search(JournalSearchQuery(text="garden"))
+        (statement,), _ = self.session.execute.call_args
+        self.assertIn("<~>", compile_sql(statement))
+        # once every row has bits, they aren't checked again
+        self.assertEqual(self.session.scalar.call_count, 2)
+
+    def test_exact_search_without_binary_rerank(self):
+        client = self.make_client()
+        client.search(JournalSearchQuery(text="garden"))
+
+        (statement,), _ = self.session.execute.call_args
+        self.assertNotIn("<~>", compile_sql(statement))
+
+    def test_keyword_search_ignores_binary_rerank(self):
+        self.session.scalars.return_value.all.return_value = []
+        client = self.make_client(binary_rerank=True)
+        client.search(JournalSearchQuery(keywords=["tomato"]))
+
+        (statement,), _ = self.session.scalars.call_args
+        self.assertNotIn("<~>", compile_sql(statement))
+        self.provider.embed_text.assert_not_called()
+
+    def _settings(self) -> dict[str, str]:
+        return {
+            call.args[1]["name"]: call.args[1]["value"]
+            for call in self.session.execute.call_args_list
+            if "set_config" in str(call.args[0])
+        }
+
+    def test_index_scan_settings(self):
+        client = self.make_client(ef_search=100, probes=10)
+        client.search(JournalSearchQuery(text="garden"))
+
+        self.assertEqual(
+            self._settings(), {"hnsw.ef_search": "100", "ivfflat.probes": "10"}
+        )
+        # settings are applied before the search, in the same transaction
+        (statement,), _ = self.session.execute.call_args
+        self.assertIn("<=>", compile_sql(statement))
+
+    def test_default_index_scan_settings(self):
+        self.make_client().search(JournalSearchQuery(text="garden"))
+        self.assertEqual(self._settings(), {})
+
+    def test_ef_search_covers_rerank_candidates(self):
+        client = self.make_client(binary_rerank=True, rerank_multiplier=8)
+        client.search(JournalSearchQuery(text="garden", limit=20))
+        self.assertEqual(self._settings(), {"hnsw.ef_search": "160"})
+
+        self.session.execute.reset_mock()
+        client = self.make_client(binary_rerank=True, rerank_multiplier=100)
+        client.search(JournalSearchQuery(text="garden", limit=20))
+        self.assertEqual(self._settings(), {"hnsw.ef_search": "1000"})
+
+    def test_date_filters_use_journal_date(self):
+        client = self.make_client(binary_rerank=True)
+        client.search(
+            JournalSearchQuery(
+                text="garden",
+                metadata_filters=[
+                    MetadataFilter(
+                        field_name="date_str", condition="gte", value="2025-06-01"
+                    ),
+                    MetadataFilter(
+                        field_name="date_str", condition="lt", value="2025-07-01"
+                    ),
+                ],
+            )
+        )
+
+        (statement,), _ = self.session.execute.call_args
+        sql = compile_sql(statement)
+        self.assertIn("logseq_journal.journal_date >= %(journal_date_1)s::DATE", sql)
+        self.assertIn("logseq_journal.journal_date < %(journal_date_2)s::DATE", sql)
+        self.assertNotIn("date_str", sql)
+        params = statement.compile(dialect=postgresql.dialect()).params
+        self.assertEqual(params["journal_date_1"], date(2025, 6, 1))
+
+    def test_date_filter_conditions(self):
+        client = self.make_client()
+
+        def where(condition: str, value) -> str:
+            return str(
+                client._build_metadata_filter_where_condition(
+                    MetadataFilter(
+                        field_name="date_str", condition=condition, value=value
+                    )
+                ).compile(dialect=postgresql.dialect())
+            )
+
+        self.assertIn("journal_date = ", where("eq", "2025-06-01"))
+        self.assertIn("journal_date <= ", where("lte", "2025-06-01"))
+        self.assertIn("journal_date IN", where("in", ["2025-06-01", "2025-06-02"]))
+        # not ISO dates, or not comparisons: matched against the metadata
+        self.assertIn("document_metadata", where("gte", "2025-06"))
+        self.assertIn("document_metadata", where("exists", True))
+        self.assertIn("document_metadata", where("contains", "2025-06-01"))
+
+    def test_contains_filters_use_metadata_containment(self):
+        self.session.scalars.return_value.all.return_value = []
+        client = self.make_client()
+        client.search(
+            JournalSearchQuery(
+                metadata_filters=[
+                    MetadataFilter(
+                        field_name="references", condition="contains", value="cookout"
+                    ),
+                    MetadataFilter(
+                        field_name="tags", condition="contains", value="bbq"
+                    ),
+                ]
+            )
+        )
+
+        (statement,), _ = self.session.scalars.call_args
+        compiled = statement.compile(dialect=postgresql.dialect())
+        self.assertIn(
+            "WHERE logseq_journal.document_metadata @> %(document_metadata_1)s::JSONB "
+            "AND logseq_journal.document_metadata @> %(document_metadata_2)s::JSONB",
+            str(compiled),
+        )
+        self.assertEqual(
+            compiled.params["document_metadata_1"], {"references": ["cookout"]}
+        )
+        self.assertEqual(compiled.params["document_metadata_2"], {"tags": ["bbq"]})
+
+    def test_nested_contains_filter(self):
+        condition = self.make_client()._build_metadata_filter_where_condition(
+            MetadataFilter(field_name="page.aliases", condition="contains", value="x")
+        )
+        self.assertEqual(condition.right.value, {"page": {"aliases": ["x"]}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from unittest.mock import patch
+
+try:
+    from scripts.utils.bedrock_embedder import (
+        CohereEmbeddingProvider,
+        TitanEmbeddingProvider,
+    )
+    from scripts.utils.stub_bedrock_client import StubBedrockClient
+except ModuleNotFoundError as error:
+    # boto3 & python-dotenv come with the `scripts` & `test` extras
+    raise unittest.SkipTest(f"bedrock_embedder needs {error.name}") from error
+
+
+class TestCohereBatching(unittest.TestCase):
+    def setUp(self):
+        self.client = StubBedrockClient(dimensions=4)
+
+    def make_provider(self, **kwargs) -> CohereEmbeddingProvider:
+        return CohereEmbeddingProvider(
+            bedrock_client=self.client, output_dimension=256, **kwargs
+        )
+
+    def test_splits_at_96_texts(self):
+        provider = self.make_provider()
+        texts = [f"text {i}" for i in range(200)]
+
+        self.assertEqual(
+            [len(batch) for batch in provider._batch_texts(texts)], [96, 96, 8]
+        )
+        vectors = provider.embed_batch(texts)
+
+        self.assertEqual(self.client.calls, 3)
+        self.assertEqual(len(vectors), 200)
+        self.assertEqual(len(vectors[0]), 256)
+
+    def test_splits_at_char_budget(self):
+        provider = self.make_provider(max_batch_chars=10)
+        texts = ["aaaa", "bbbb", "cccc", "dddd", "eee"]
+
+        self.assertEqual(
+            list(provider._batch_texts(texts)),
+            [["aaaa", "bbbb"], ["cccc", "dddd"], ["eee"]],
+        )
+        provider.embed_batch(texts)
+        self.assertEqual(self.client.calls, 3)
+
+    def test_oversized_text_in_own_batch(self):
+        provider = self.make_provider(max_batch_chars=10)
+        texts = ["short", "x" * 50, "tail"]
+
+        self.assertEqual(
+            list(provider._batch_texts(texts)), [["short"], ["x" * 50], ["tail"]]
+        )
+        vectors = provider.embed_batch(texts)
+        self.assertEqual([vector[0] for vector in vectors], [5.0, 50.0, 4.0])
+
+    def test_response_count_mismatch_raises(self):
+        provider = self.make_provider()
+        with (
+            patch.object(
+                provider,
+                "_invoke_model",
+                return_value={"embeddings": {"float": [[1.0] * 256]}},
+            ),
+            self.assertRaises(ValueError),
+        ):
+            provider.embed_batch(["first", "second"])
+
+    def test_order_preserved_across_concurrent_batches(self):
+        self.client.latency = 0.01
+        provider = self.make_provider(max_batch_texts=3, max_concurrency=4)
+        texts = ["x" * length for length in range(1, 21)]
+
+        with provider:
+            vectors = provider.embed_batch(texts)
+
+        self.assertEqual(self.client.calls, 7)
+        self.assertEqual(
+            [vector[0] for vector in vectors], [float(len(text)) for text in texts]
+        )
+        # the executor's threads are stopped
+        with self.assertRaises(RuntimeError):
+            provider.embed_batch(texts)
+
+    def test_int8_vectors_are_floats(self):
+        provider = self.make_provider(embedding_type="int8")
+        (vector,) = provider.embed_batch(["abc"])
+        self.assertIsInstance(vector[0], float)
+
+
+class TestTitanFallback(unittest.TestCase):
+    def test_one_request_per_text(self):
+        client = StubBedrockClient()
+        provider = TitanEmbeddingProvider(bedrock_client=client)
+        texts = ["a", "bb", "ccc"]
+
+        self.assertEqual(list(provider._batch_texts(texts)), [["a"], ["bb"], ["ccc"]])
+        vectors = provider.embed_batch(texts)
+
+        self.assertEqual(client.calls, 3)
+        self.assertEqual([vector[0] for vector in vectors], [1.0, 2.0, 3.0])
+        self.assertEqual(len(vectors[0]), provider.get_dimensions())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import json
+import threading
+import time
+import unittest
+
+from scripts.utils.rate_control import (
+    AdaptiveExecutor,
+    AIMDConcurrencyLimit,
+    TokenBucket,
+    is_throttling_error,
+)
+from scripts.utils.stub_bedrock_client import StubBedrockClient, StubThrottlingError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_caps_rate_after_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, capacity=5, clock=clock, sleep=clock.sleep)
+        for _ in range(25):
+            bucket.acquire()
+        # 5 tokens of burst, then 20 tokens at 10 per second
+        self.assertAlmostEqual(clock.now, 2.0)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestAIMDConcurrencyLimit(unittest.TestCase):
+    def test_additive_increase(self):
+        limit = AIMDConcurrencyLimit(initial_limit=2, max_limit=4)
+        for _ in range(4):
+            limit.release(limit.acquire())
+        self.assertEqual(limit.limit, 3)
+        for _ in range(100):
+            limit.release(limit.acquire())
+        self.assertEqual(limit.limit, 4)
+
+    def test_multiplicative_decrease_once_per_window(self):
+        limit = AIMDConcurrencyLimit(initial_limit=8, max_limit=8)
+        sequences = [limit.acquire() for _ in range(4)]
+        for sequence in sequences:
+            limit.release(sequence, throttled=True)
+        self.assertEqual(limit.limit, 4)
+        limit.release(limit.acquire(), throttled=True)
+        self.assertEqual(limit.limit, 2)
+        limit.release(limit.acquire(), throttled=True)
+        limit.release(limit.acquire(), throttled=True)
+        self.assertEqual(limit.limit, 1)
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            AIMDConcurrencyLimit(initial_limit=4, max_limit=2)
+
+
+class TestAdaptiveExecutor(unittest.TestCase):
+    def test_map_preserves_order(self):
+        executor = AdaptiveExecutor(max_concurrency=4)
+        self.assertEqual(
+            executor.map(lambda x: x * 2, range(20)), list(range(0, 40, 2))
+        )
+        executor.close()
+
+    def test_context_manager_closes(self):
+        with AdaptiveExecutor(max_concurrency=2) as executor:
+            self.assertEqual(executor.map(str, [1, 2]), ["1", "2"])
+        with self.assertRaises(RuntimeError):
+            executor.map(str, [3])
+
+    def test_adapts_to_throttling_stub_client(self):
+        client = StubBedrockClient(latency=0.01, max_in_flight=3, dimensions=2)
+        executor = AdaptiveExecutor(
+            max_concurrency=8, initial_concurrency=8, backoff_base=0.001
+        )
+        texts = ["x" * i for i in range(40)]
+        responses = executor.map(
+            lambda text: client.invoke_model(
+                modelId="stub", body=json.dumps({"inputText": text})
+            ),
+            texts,
+        )
+        vectors = [json.loads(r["body"].read())["embedding"] for r in responses]
+        self.assertEqual(vectors, [client.vector(text) for text in texts])
+        self.assertGreater(client.throttled, 0)
+        self.assertEqual(executor.throttle_count, client.throttled)
+        self.assertLessEqual(client.peak_in_flight, 3)
+        self.assertLess(executor.limit.limit, 8)
+        executor.close()
+
+    def test_bounds_in_flight(self):
+        in_flight, peak = 0, 0
+        lock = threading.Lock()
+
+        def call(_):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.005)
+            with lock:
+                in_flight -= 1
+
+        executor = AdaptiveExecutor(max_concurrency=3, initial_concurrency=3)
+        executor.map(call, range(30))
+        self.assertLessEqual(peak, 3)
+        executor.close()
+
+    def test_gives_up_after_max_retries(self):
+        executor = AdaptiveExecutor(
+            max_concurrency=2, max_retries=2, sleep=lambda _: None
+        )
+        calls = []
+
+        def throttled(_):
+            calls.append(1)
+            raise StubThrottlingError()
+
+        with self.assertRaises(StubThrottlingError):
+            executor.call(throttled, None)
+        self.assertEqual(len(calls), 3)
+        executor.close()
+
+    def test_other_errors_not_retried(self):
+        executor = AdaptiveExecutor(max_concurrency=2)
+        with self.assertRaises(KeyError):
+            executor.call(lambda _: {}["missing"], None)
+        self.assertEqual(executor.limit.in_flight, 0)
+        executor.close()
+
+    def test_is_throttling_error(self):
+        self.assertTrue(is_throttling_error(StubThrottlingError()))
+        self.assertFalse(is_throttling_error(ValueError()))
+
+
+if __name__ == "__main__":
+    unittest.main()
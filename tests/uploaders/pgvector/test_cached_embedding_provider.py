@@ -0,0 +1,151 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from pgvector_template.core.embedder import BaseEmbeddingProvider
+
+from logseq_retriever.uploaders.pgvector.cached_embedding_provider import (
+    CachedEmbeddingProvider,
+)
+
+
+def make_provider(
+    input_type: str = "search_document", dimensions: int = 3, **config
+) -> Mock:
+    provider = Mock(spec=BaseEmbeddingProvider)
+    provider.model_id = "test-model"
+    provider.get_embedding_config.return_value = {
+        "model": "test-model",
+        "input_type": input_type,
+        **config,
+    }
+    provider.get_dimensions.return_value = dimensions
+    provider.embed_batch.side_effect = lambda texts: [
+        [float(len(text))] * dimensions for text in texts
+    ]
+    return provider
+
+
+class TestCachedEmbeddingProvider(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "embeddings.sqlite")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_misses_embedded_in_single_batch(self):
+        provider = make_provider()
+        cached = CachedEmbeddingProvider(provider, self.db_path)
+        vectors = cached.embed_batch(["a", "bb", "a"])
+        self.assertEqual(vectors, [[1.0] * 3, [2.0] * 3, [1.0] * 3])
+        provider.embed_batch.assert_called_once_with(["a", "bb"])
+
+    def test_hits_across_instances(self):
+        CachedEmbeddingProvider(make_provider(), self.db_path).embed_batch(["a", "bb"])
+
+        provider = make_provider()
+        cached = CachedEmbeddingProvider(provider, self.db_path)
+        vectors = cached.embed_batch(["bb", "ccc", "a"])
+        self.assertEqual(vectors, [[2.0] * 3, [3.0] * 3, [1.0] * 3])
+        provider.embed_batch.assert_called_once_with(["ccc"])
+        stats = cached.stats
+        self.assertEqual((stats.hits, stats.misses, stats.size), (2, 1, 3))
+        self.assertAlmostEqual(stats.hit_rate, 2 / 3)
+
+    def test_keyed_by_embedding_config_and_dimensions(self):
+        CachedEmbeddingProvider(make_provider(), self.db_path).embed_batch(["a"])
+        for provider in (
+            make_provider(input_type="search_query"),
+            make_provider(dimensions=2),
+            make_provider(embedding_type="int8"),
+        ):
+            CachedEmbeddingProvider(provider, self.db_path).embed_text("a")
+            provider.embed_batch.assert_called_once_with(["a"])
+
+    def test_keeps_other_tables(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("CREATE TABLE embeddings (text_hash TEXT)")
+            conn.execute("INSERT INTO embeddings VALUES ('a')")
+        CachedEmbeddingProvider(make_provider(), self.db_path).close()
+        with sqlite3.connect(self.db_path) as conn:
+            tables = {
+                name
+                for (name,) in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            }
+            rows = conn.execute("SELECT text_hash FROM embeddings").fetchall()
+        self.assertEqual(tables, {"embeddings", "embedding_cache"})
+        self.assertEqual(rows, [("a",)])
+
+    def test_stores_each_sub_batch_as_it_returns(self):
+        provider = make_provider()
+        embed = provider.embed_batch.side_effect
+
+        def fail_third_batch(texts):
+            if provider.embed_batch.call_count == 3:
+                raise RuntimeError("throttled")
+            return embed(texts)
+
+        provider.embed_batch.side_effect = fail_third_batch
+        cached = CachedEmbeddingProvider(provider, self.db_path, batch_size=2)
+
+        with self.assertRaises(RuntimeError):
+            cached.embed_batch(["a", "bb", "ccc", "dddd", "eeeee"])
+
+        self.assertEqual(
+            [call.args[0] for call in provider.embed_batch.call_args_list],
+            [["a", "bb"], ["ccc", "dddd"], ["eeeee"]],
+        )
+        self.assertEqual(cached.stats.size, 4)
+
+    def test_defaults_to_provider_batch_size(self):
+        provider = make_provider()
+        provider.max_batch_texts = 3
+        cached = CachedEmbeddingProvider(provider, self.db_path, max_concurrency=2)
+
+        vectors = cached.embed_batch(["a", "bb", "ccc", "dddd", "eeeee"])
+
+        self.assertEqual(vectors, [[float(n)] * 3 for n in range(1, 6)])
+        self.assertEqual(
+            sorted(len(call.args[0]) for call in provider.embed_batch.call_args_list),
+            [2, 3],
+        )
+
+    def test_evicts_least_recently_used(self):
+        provider = make_provider()
+        cached = CachedEmbeddingProvider(provider, self.db_path, max_entries=2)
+        cached.embed_batch(["a"])
+        cached.embed_batch(["bb"])
+        cached.embed_batch(["a"])  # "a" is now more recently used than "bb"
+        cached.embed_batch(["ccc"])
+        self.assertEqual(cached.stats.evictions, 1)
+        self.assertEqual(cached.stats.size, 2)
+
+        provider.embed_batch.reset_mock()
+        cached.embed_batch(["a", "bb"])
+        provider.embed_batch.assert_called_once_with(["bb"])
+
+    def test_passes_through_provider_config(self):
+        provider = make_provider()
+        cached = CachedEmbeddingProvider(provider, self.db_path)
+        self.assertEqual(cached.get_embedding_config(), provider.get_embedding_config())
+        self.assertEqual(cached.get_dimensions(), 3)
+        self.assertEqual(cached.model_id, "test-model")
+
+    def test_empty_batch(self):
+        provider = make_provider()
+        cached = CachedEmbeddingProvider(provider, self.db_path)
+        self.assertEqual(cached.embed_batch([]), [])
+        provider.embed_batch.assert_not_called()
+
+    def test_invalid_max_entries(self):
+        with self.assertRaises(ValueError):
+            CachedEmbeddingProvider(make_provider(), self.db_path, max_entries=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,35 @@
 import unittest
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock, MagicMock, patch
 from uuid import UUID
 from pathlib import Path
+from datetime import date
 
 from pgvector_template.core.embedder import BaseEmbeddingProvider
+from sqlalchemy.dialects import postgresql
 
+from logseq_retriever.models.journal_pgvector import (
+    JournalDocument,
+    VectorIndexConfig,
+)
 from logseq_retriever.uploaders.pgvector.journal_corpus_manager import (
+    JournalBulkInsertResult,
+    JournalCorpus,
     JournalCorpusManager,
     JournalCorpusManagerConfig,
+    JournalShard,
+    JournalSyncResult,
 )
 
 
+def upload_test_shard(shard: JournalShard) -> JournalBulkInsertResult:
+    """Stand-in for a shard upload, run in worker processes by `run_shards`."""
+    if shard.start_date == "2025-01-01":
+        raise RuntimeError("embedding quota exceeded")
+    return JournalBulkInsertResult(
+        corpora=shard.journals, rows=shard.bytes, embedded=0, reused=0, seconds=0.0
+    )
+
+
 class TestJournalCorpusManagerHelpers(unittest.TestCase):
     def setUp(self):
         mock_session = Mock()
@@ -33,6 +52,28 @@ class TestJournalCorpusManagerHelpers(unittest.TestCase):
         result = self.corpus_manager._split_corpus(content)
         self.assertEqual(result, ["Just some text without bullets"])
 
+    def test_split_corpus_max_chunk_length(self):
+        config = JournalCorpusManagerConfig(
+            embedding_provider=Mock(spec=BaseEmbeddingProvider), max_chunk_length=20
+        )
+        corpus_manager = JournalCorpusManager(Mock(), config)
+        content = "First line\n- Long bullet. With two sentences\n- Short"
+        result = corpus_manager._split_corpus(content)
+        self.assertEqual(
+            result, ["First line", "Long bullet.", "With two sentences", "Short"]
+        )
+
+    def test_split_corpus_min_chunk_length(self):
+        config = JournalCorpusManagerConfig(
+            embedding_provider=Mock(spec=BaseEmbeddingProvider),
+            max_chunk_length=100,
+            min_chunk_length=20,
+        )
+        corpus_manager = JournalCorpusManager(Mock(), config)
+        content = "First line\n- First bullet\n- Second bullet"
+        result = corpus_manager._split_corpus(content)
+        self.assertEqual(result, ["First line\n- First bullet", "Second bullet"])
+
     def test_extract_chunk_metadata(self):
         content = "This is a test chunk with five words"
         result = self.corpus_manager._extract_chunk_metadata(content)
@@ -42,6 +83,7 @@ class TestJournalCorpusManagerHelpers(unittest.TestCase):
                 "chunk_len": 36,
                 "word_count": 8,
                 "references": [],
+                "tags": [],
                 "anchor_ids": [],
             },
         )
@@ -55,6 +97,7 @@ class TestJournalCorpusManagerHelpers(unittest.TestCase):
                 "chunk_len": 0,
                 "word_count": 0,
                 "references": [],
+                "tags": [],
                 "anchor_ids": [],
             },
         )
@@ -93,29 +136,49 @@ class TestJournalCorpusManagerHelpers(unittest.TestCase):
 
     def test_extract_chunk_references_basic(self):
         split_content = ["this", "is", "#my", "test", "#script"]
-        result = self.corpus_manager._extract_chunk_references(split_content)
+        result = self.corpus_manager._extract_chunk_metadata(" ".join(split_content))[
+            "references"
+        ]
         self.assertEqual(result, ["my", "script"])
 
     def test_extract_chunk_references_complex(self):
         split_content = ["this", "is", "#my", "test", "#script'sfatal", "flaw", "#lol#"]
-        result = self.corpus_manager._extract_chunk_references(split_content)
+        result = self.corpus_manager._extract_chunk_metadata(" ".join(split_content))[
+            "references"
+        ]
         self.assertEqual(result, ["my", "script", "lol"])
 
     def test_extract_chunk_references_none(self):
         split_content = ["no", "references", "here"]
-        result = self.corpus_manager._extract_chunk_references(split_content)
+        result = self.corpus_manager._extract_chunk_metadata(" ".join(split_content))[
+            "references"
+        ]
         self.assertEqual(result, [])
 
     def test_extract_chunk_references_empty(self):
         split_content = []
-        result = self.corpus_manager._extract_chunk_references(split_content)
+        result = self.corpus_manager._extract_chunk_metadata(" ".join(split_content))[
+            "references"
+        ]
         self.assertEqual(result, [])
 
     def test_extract_chunk_references_dates(self):
         split_content = ["met", "with", "#2025-07-07", "about", "#cookout"]
-        result = self.corpus_manager._extract_chunk_references(split_content)
+        result = self.corpus_manager._extract_chunk_metadata(" ".join(split_content))[
+            "references"
+        ]
         self.assertEqual(result, ["2025-07-07", "cookout"])
 
+    def test_extract_chunk_references_include_page_links(self):
+        metadata = self.corpus_manager._extract_chunk_metadata(
+            "#cookout with #[[John Smith]], see [[Jul 7th, 2025]]"
+        )
+        # `references` are every page referenced: `#tag`s first, then `[[page links]]`
+        self.assertEqual(
+            metadata["references"], ["cookout", "John Smith", "Jul 7th, 2025"]
+        )
+        self.assertEqual(metadata["tags"], ["cookout", "John Smith"])
+
     def test_extract_chunk_metadata_with_references(self):
         content = "Met with team about #project-alpha and #2025-01-15"
         result = self.corpus_manager._extract_chunk_metadata(content)
@@ -125,6 +188,7 @@ class TestJournalCorpusManagerHelpers(unittest.TestCase):
                 "chunk_len": 50,
                 "word_count": 7,
                 "references": ["project-alpha", "2025-01-15"],
+                "tags": ["project-alpha", "2025-01-15"],
                 "anchor_ids": [],
             },
         )
@@ -138,6 +202,7 @@ class TestJournalCorpusManagerHelpers(unittest.TestCase):
                 "chunk_len": 43,
                 "word_count": 5,
                 "references": ["bug-fix", "feature@v2"],
+                "tags": ["bug-fix", "feature@v2"],
                 "anchor_ids": [],
             },
         )
@@ -151,6 +216,7 @@ class TestJournalCorpusManagerHelpers(unittest.TestCase):
                 "chunk_len": 46,
                 "word_count": 5,
                 "references": ["docs", "team-lead"],
+                "tags": ["docs", "team-lead"],
                 "anchor_ids": [],
             },
         )
@@ -164,6 +230,7 @@ class TestJournalCorpusManagerHelpers(unittest.TestCase):
                 "chunk_len": 37,  # note: special chars like \t & \n only count as 1 char each
                 "word_count": 5,
                 "references": ["urgent", "meeting-notes"],
+                "tags": ["urgent", "meeting-notes"],
                 "anchor_ids": [],
             },
         )
@@ -176,37 +243,47 @@ class TestJournalCorpusManagerHelpers(unittest.TestCase):
             "#quote'break",
             '#double"quote',
         ]
-        result = self.corpus_manager._extract_chunk_references(split_content)
+        result = self.corpus_manager._extract_chunk_metadata(" ".join(split_content))[
+            "references"
+        ]
         self.assertEqual(result, ["asdf", "test", "name", "quote", "double"])
 
     def test_extract_chunk_references_backslash_ignored(self):
         split_content = ["#asdf\\qwer", "#test\\\\path", "#name\\value"]
-        result = self.corpus_manager._extract_chunk_references(split_content)
+        result = self.corpus_manager._extract_chunk_metadata(" ".join(split_content))[
+            "references"
+        ]
         self.assertEqual(result, ["asdfqwer", "testpath", "namevalue"])
 
     def test_extract_chunk_references_mixed_special_chars(self):
         split_content = ["#tag\\with?break", "#path\\to:file", "#name'with\"quotes"]
-        result = self.corpus_manager._extract_chunk_references(split_content)
+        result = self.corpus_manager._extract_chunk_metadata(" ".join(split_content))[
+            "references"
+        ]
         self.assertEqual(result, ["tagwith", "pathto", "name"])
 
     def test_extract_chunk_references_multiple_hashes(self):
         split_content = ["###ref", "##tag", "####multiple"]
-        result = self.corpus_manager._extract_chunk_references(split_content)
+        result = self.corpus_manager._extract_chunk_metadata(" ".join(split_content))[
+            "references"
+        ]
         self.assertEqual(result, ["ref", "tag", "multiple"])
 
     def test_extract_chunk_references_trailing_hashes(self):
         split_content = ["#lol#", "#tag##", "#ref###"]
-        result = self.corpus_manager._extract_chunk_references(split_content)
+        result = self.corpus_manager._extract_chunk_metadata(" ".join(split_content))[
+            "references"
+        ]
         self.assertEqual(result, ["lol", "tag", "ref"])
 
     def test_extract_anchor_ids_single(self):
         content = "Some text\n  id:: 686f4ac0-e43b-4a15-940a-954f55e03bea\nMore text"
-        result = self.corpus_manager._extract_anchor_ids(content)
+        result = self.corpus_manager._extract_chunk_metadata(content)["anchor_ids"]
         self.assertEqual(result, ["686f4ac0-e43b-4a15-940a-954f55e03bea"])
 
     def test_extract_anchor_ids_multiple(self):
         content = "First id:: 686f4ac0-e43b-4a15-940a-954f55e03bea\nSecond id:: 12345678-1234-1234-1234-123456789abc"
-        result = self.corpus_manager._extract_anchor_ids(content)
+        result = self.corpus_manager._extract_chunk_metadata(content)["anchor_ids"]
         self.assertEqual(
             result,
             [
@@ -217,12 +294,12 @@ class TestJournalCorpusManagerHelpers(unittest.TestCase):
 
     def test_extract_anchor_ids_none(self):
         content = "No anchor IDs here, just regular text"
-        result = self.corpus_manager._extract_anchor_ids(content)
+        result = self.corpus_manager._extract_chunk_metadata(content)["anchor_ids"]
         self.assertEqual(result, [])
 
     def test_extract_anchor_ids_with_references(self):
         content = "Text with ((686f4ac0-e43b-4a15-940a-954f55e03bea)) reference but id:: 12345678-1234-1234-1234-123456789abc anchor"
-        result = self.corpus_manager._extract_anchor_ids(content)
+        result = self.corpus_manager._extract_chunk_metadata(content)["anchor_ids"]
         self.assertEqual(result, ["12345678-1234-1234-1234-123456789abc"])
 
     def test_extract_chunk_metadata_with_anchor_ids(self):
@@ -234,10 +311,603 @@ class TestJournalCorpusManagerHelpers(unittest.TestCase):
                 "chunk_len": 58,
                 "word_count": 5,
                 "references": ["tag"],
+                "tags": ["tag"],
                 "anchor_ids": ["686f4ac0-e43b-4a15-940a-954f55e03bea"],
             },
         )
 
+    def test_create_documents_trusted_metadata_matches_validated(self):
+        content = [
+            "First #tag [[page]]",
+            "Second id:: 550e8400-e29b-41d4-a716-446655440000",
+        ]
+        corpus_metadata = {"date_str": "2025-07-07"}
+        embedding_provider = Mock(spec=BaseEmbeddingProvider)
+        embedding_provider.get_embedding_config.return_value = {"model": "test"}
+
+        documents = {}
+        for validate_metadata in (True, False):
+            config = JournalCorpusManagerConfig(
+                embedding_provider=embedding_provider,
+                validate_metadata=validate_metadata,
+            )
+            documents[validate_metadata] = JournalCorpusManager(
+                Mock(), config
+            )._create_documents("2025-07-07", content, [[]] * 2, corpus_metadata, None)
+
+        self.assertEqual(
+            [d.document_metadata for d in documents[False]],
+            [d.document_metadata for d in documents[True]],
+        )
+        self.assertEqual(
+            documents[False][0].document_metadata["references"], ["tag", "page"]
+        )
+        self.assertEqual(
+            documents[False][0].document_metadata["document_type"], "logseq_journal"
+        )
+
+
+class TestJournalCorpusManagerSync(unittest.TestCase):
+    def setUp(self):
+        self.mock_session = MagicMock()
+        config = JournalCorpusManagerConfig(
+            embedding_provider=Mock(spec=BaseEmbeddingProvider)
+        )
+        self.corpus_manager = JournalCorpusManager(self.mock_session, config)
+        self.corpora = [
+            JournalCorpus("- unchanged", {"date_str": "2025-07-07"}),
+            JournalCorpus("- edited", {"date_str": "2025-07-08"}),
+            JournalCorpus("- new", {"date_str": "2025-07-09"}),
+        ]
+
+    def test_sync_only_inserts_changed_corpora(self):
+        stored_hashes = {
+            "2025-07-07": {self.corpus_manager.corpus_hash("- unchanged")},
+            "2025-07-08": {self.corpus_manager.corpus_hash("- original")},
+        }
+        with (
+            patch.object(
+                self.corpus_manager, "_load_corpus_hashes", return_value=stored_hashes
+            ) as mock_hashes,
+            patch.object(self.corpus_manager, "insert_corpus") as mock_insert,
+            patch.object(
+                self.corpus_manager, "_delete_missing_corpora", return_value=2
+            ) as mock_delete,
+        ):
+            result = self.corpus_manager.sync_corpora(
+                self.corpora, start_date="2025-07-01", end_date="2025-07-31"
+            )
+
+        self.assertEqual(result, JournalSyncResult(inserted=2, skipped=1, deleted=2))
+        mock_hashes.assert_called_once_with(["2025-07-07", "2025-07-08", "2025-07-09"])
+        self.assertEqual(
+            [call.kwargs["corpus_id"] for call in mock_insert.call_args_list],
+            ["2025-07-08", "2025-07-09"],
+        )
+        # the content hash is stored with the corpus metadata
+        self.assertEqual(
+            mock_insert.call_args_list[0].args[1],
+            {
+                "date_str": "2025-07-08",
+                "corpus_hash": self.corpus_manager.corpus_hash("- edited"),
+            },
+        )
+        mock_delete.assert_called_once_with(
+            "2025-07-01", "2025-07-31", {"2025-07-07", "2025-07-08", "2025-07-09"}
+        )
+
+    def test_sync_reinserts_partially_hashed_corpora(self):
+        """Test that a corpus is re-inserted if any of its chunks lacks the current hash."""
+        stored_hashes = {
+            "2025-07-07": {self.corpus_manager.corpus_hash("- unchanged"), None}
+        }
+        with (
+            patch.object(
+                self.corpus_manager, "_load_corpus_hashes", return_value=stored_hashes
+            ),
+            patch.object(self.corpus_manager, "insert_corpus") as mock_insert,
+        ):
+            result = self.corpus_manager.sync_corpora(self.corpora[:1])
+        self.assertEqual(result, JournalSyncResult(inserted=1, skipped=0, deleted=0))
+        mock_insert.assert_called_once()
+
+    def test_sync_streams_corpora_in_batches(self):
+        with (
+            patch.object(
+                self.corpus_manager, "_load_corpus_hashes", return_value={}
+            ) as mock_hashes,
+            patch.object(self.corpus_manager, "insert_corpus"),
+        ):
+            result = self.corpus_manager.sync_corpora(iter(self.corpora), batch_size=2)
+
+        self.assertEqual(result, JournalSyncResult(inserted=3, skipped=0, deleted=0))
+        self.assertEqual(
+            [call.args[0] for call in mock_hashes.call_args_list],
+            [["2025-07-07", "2025-07-08"], ["2025-07-09"]],
+        )
+
+    def test_sync_deletes_emptied_corpora(self):
+        config = JournalCorpusManagerConfig(
+            embedding_provider=Mock(spec=BaseEmbeddingProvider), collection_name="A"
+        )
+        corpus_manager = JournalCorpusManager(self.mock_session, config)
+        emptied = JournalCorpus("-\n-  ", {"date_str": "2025-07-07"})
+        stored_hashes = {"2025-07-07": {corpus_manager.corpus_hash("- unchanged")}}
+        with patch.object(
+            corpus_manager, "_load_corpus_hashes", return_value=stored_hashes
+        ):
+            result = corpus_manager.sync_corpora([emptied])
+
+        self.assertEqual(result, JournalSyncResult(inserted=0, skipped=0, deleted=1))
+        (_, collection_condition), _ = (
+            self.mock_session.query.return_value.filter.call_args
+        )
+        self.assertEqual(
+            str(collection_condition.compile(dialect=postgresql.dialect())),
+            "logseq_journal.collection = %(collection_1)s::VARCHAR",
+        )
+        self.mock_session.query.return_value.filter.return_value.delete.assert_called_once_with(
+            synchronize_session=False
+        )
+        self.mock_session.commit.assert_called_once()
+
+    def test_corpus_hash_covers_settings(self):
+        provider = Mock(spec=BaseEmbeddingProvider)
+        provider.get_embedding_config.return_value = {"model": "m"}
+
+        def corpus_hash(**config) -> str:
+            manager = JournalCorpusManager(
+                self.mock_session,
+                JournalCorpusManagerConfig(embedding_provider=provider, **config),
+            )
+            return manager.corpus_hash("- unchanged")
+
+        baseline = corpus_hash()
+        self.assertEqual(corpus_hash(), baseline)
+        self.assertNotEqual(corpus_hash(max_chunk_length=100), baseline)
+        self.assertNotEqual(corpus_hash(min_chunk_length=10), baseline)
+        provider.get_embedding_config.return_value = {
+            "model": "m",
+            "embedding_type": "int8",
+        }
+        self.assertNotEqual(corpus_hash(), baseline)
+
+    def test_hashes_and_deletes_scoped_to_collection(self):
+        config = JournalCorpusManagerConfig(
+            embedding_provider=Mock(spec=BaseEmbeddingProvider),
+            collection_name="Foo's Journal Collection",
+        )
+        corpus_manager = JournalCorpusManager(self.mock_session, config)
+        query = self.mock_session.query.return_value
+        rows = query.filter.return_value.distinct.return_value.all
+        rows.return_value = [("2025-07-10",)]
+        corpus_manager._delete_missing_corpora("2025-07-01", "2025-07-31", set())
+        rows.return_value = []
+        corpus_manager._load_corpus_hashes(["2025-07-07"])
+
+        self.assertEqual(query.filter.call_count, 3)
+
+        for call in query.filter.call_args_list:
+            self.assertIn(
+                "logseq_journal.collection = :collection_1",
+                [str(condition) for condition in call.args],
+            )
+
+    def test_delete_missing_corpora(self):
+        query = self.mock_session.query.return_value
+        query.filter.return_value.distinct.return_value.all.return_value = [
+            ("2025-07-07",),
+            ("2025-07-10",),
+        ]
+        deleted = self.corpus_manager._delete_missing_corpora(
+            "2025-07-01", "2025-07-31", {"2025-07-07"}
+        )
+        self.assertEqual(deleted, 1)
+        query.filter.return_value.delete.assert_called_once_with(
+            synchronize_session=False
+        )
+        self.mock_session.commit.assert_called_once()
+
+
+class TestJournalCorpusManagerBulkInsert(unittest.TestCase):
+    def setUp(self):
+        self.mock_session = MagicMock()
+        self.mock_embedding_provider = Mock(spec=BaseEmbeddingProvider)
+        self.mock_embedding_provider.get_embedding_config.return_value = {
+            "model": "test-model"
+        }
+        self.mock_embedding_provider.embed_batch.side_effect = lambda texts: [
+            [float(len(text))] * 3 for text in texts
+        ]
+        config = JournalCorpusManagerConfig(
+            embedding_provider=self.mock_embedding_provider
+        )
+        self.corpus_manager = JournalCorpusManager(self.mock_session, config)
+        self.corpora = [
+            JournalCorpus("- first\n- second", {"date_str": "2025-07-07"}),
+            JournalCorpus("- third", {"date_str": "2025-07-08"}),
+            JournalCorpus("", {"date_str": "2025-07-09"}),
+            JournalCorpus("- fourth\n- fifth", {"date_str": "2025-07-10"}),
+        ]
+
+    def test_insert_corpora_scoped_to_collection(self):
+        config = JournalCorpusManagerConfig(
+            embedding_provider=self.mock_embedding_provider, collection_name="A"
+        )
+        corpus_manager = JournalCorpusManager(self.mock_session, config)
+        query = self.mock_session.query.return_value
+        query.filter.return_value.all.return_value = []
+
+        corpus_manager.insert_corpora(self.corpora)
+
+        lookup, delete = (
+            [str(c.compile(dialect=postgresql.dialect())) for c in call.args]
+            for call in query.filter.call_args_list
+        )
+        self.assertIn("logseq_journal.collection = %(collection_1)s::VARCHAR", lookup)
+        self.assertIn("logseq_journal.collection = %(collection_1)s::VARCHAR", delete)
+        query.filter.return_value.delete.assert_called_once_with(
+            synchronize_session=False
+        )
+
+    def _inserted_batches(self) -> list[list[dict]]:
+        return [call.args[1] for call in self.mock_session.execute.call_args_list]
+
+    def test_insert_corpora_single_flush(self):
+        self.mock_session.query.return_value.filter.return_value.all.return_value = []
+
+        result = self.corpus_manager.insert_corpora(self.corpora)
+
+        self.assertIsInstance(result, JournalBulkInsertResult)
+        self.assertEqual((result.corpora, result.rows), (4, 5))
+        self.assertEqual((result.embedded, result.reused), (5, 0))
+        # one embedding request, one executemany & one commit of the insert transaction
+        self.mock_embedding_provider.embed_batch.assert_called_once()
+        (rows,) = self._inserted_batches()
+        self.assertEqual(
+            [(row["corpus_id"], row["chunk_index"]) for row in rows],
+            [
+                ("2025-07-07", 0),
+                ("2025-07-07", 1),
+                ("2025-07-08", 0),
+                ("2025-07-10", 0),
+                ("2025-07-10", 1),
+            ],
+        )
+        self.assertEqual(rows[0]["embedding"], [5.0] * 3)
+        self.assertEqual(rows[0]["embedding_bits"], "111")
+        self.assertEqual(rows[0]["journal_date"], date(2025, 7, 7))
+        self.assertEqual(
+            rows[0]["document_metadata"]["corpus_hash"],
+            self.corpus_manager.corpus_hash("- first\n- second"),
+        )
+        self.assertEqual(
+            self.mock_session.query.return_value.filter.return_value.delete.call_count,
+            1,
+        )
+        self.mock_session.rollback.assert_not_called()
+
+    def test_insert_corpora_flushes_every_n_rows_without_splitting_corpora(self):
+        self.mock_session.query.return_value.filter.return_value.all.return_value = []
+
+        result = self.corpus_manager.insert_corpora(self.corpora, commit_every=2)
+
+        self.assertEqual(result.rows, 5)
+        self.assertEqual(
+            [[row["corpus_id"] for row in rows] for rows in self._inserted_batches()],
+            [
+                ["2025-07-07", "2025-07-07"],
+                ["2025-07-08", "2025-07-10", "2025-07-10"],
+            ],
+        )
+        self.assertEqual(self.mock_embedding_provider.embed_batch.call_count, 2)
+
+    def test_insert_corpora_reuses_stored_vectors(self):
+        documents = self.corpus_manager._create_documents(
+            "2025-07-08", ["third"], [[]], {"date_str": "2025-07-08"}, None
+        )
+        self.mock_session.query.return_value.filter.return_value.all.return_value = [
+            (documents[0].content_hash, [9.0] * 3)
+        ]
+
+        result = self.corpus_manager.insert_corpora(self.corpora)
+
+        self.assertEqual((result.embedded, result.reused), (4, 1))
+        embedded_texts = self.mock_embedding_provider.embed_batch.call_args.args[0]
+        self.assertNotIn("third", embedded_texts)
+        (rows,) = self._inserted_batches()
+        self.assertEqual(rows[2]["embedding"], [9.0] * 3)
+
+    def test_insert_corpora_rolls_back_on_error(self):
+        self.mock_session.query.return_value.filter.return_value.all.return_value = []
+        self.mock_session.execute.side_effect = RuntimeError("insert failed")
+
+        with self.assertRaises(RuntimeError):
+            self.corpus_manager.insert_corpora(self.corpora)
+
+        self.mock_session.rollback.assert_called_once()
+
+    def test_backfill_embedding_bits(self):
+        self.mock_session.execute.return_value.rowcount = 7
+
+        self.assertEqual(self.corpus_manager.backfill_embedding_bits(), 7)
+
+        (statement,), _ = self.mock_session.execute.call_args
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        self.assertIn(
+            "SET embedding_bits=CAST(binary_quantize(logseq_journal.embedding) AS BIT(1024))",
+            sql,
+        )
+        self.assertIn("WHERE logseq_journal.embedding_bits IS NULL", sql)
+        self.mock_session.commit.assert_called_once()
+
+    def _executed_sql(self) -> list[str]:
+        return [
+            str(call.args[0].compile(dialect=postgresql.dialect())).strip()
+            for call in self.mock_session.execute.call_args_list
+        ]
+
+    def test_rebuild_vector_indexes(self):
+        declared = set(JournalDocument.__table__.indexes)
+        config = JournalCorpusManagerConfig(
+            embedding_provider=self.mock_embedding_provider,
+            vector_index=VectorIndexConfig(m=24, ef_construction=100),
+        )
+        JournalCorpusManager(self.mock_session, config).rebuild_vector_indexes()
+
+        sql = self._executed_sql()
+        self.assertEqual(
+            sql[:4],
+            [
+                f"DROP INDEX IF EXISTS logseq_journal_{column}_{method}_idx"
+                for method in ("hnsw", "ivfflat")
+                for column in ("embedding", "embedding_bits")
+            ],
+        )
+        self.assertEqual(
+            sql[4:],
+            [
+                (
+                    "CREATE INDEX logseq_journal_embedding_hnsw_idx ON logseq_journal "
+                    "USING hnsw (embedding vector_cosine_ops) WITH (m = 24, ef_construction = 100)"
+                ),
+                (
+                    "CREATE INDEX logseq_journal_embedding_bits_hnsw_idx ON logseq_journal "
+                    "USING hnsw (embedding_bits bit_hamming_ops) WITH (m = 24, ef_construction = 100)"
+                ),
+            ],
+        )
+        # the mapped table keeps its declared indexes
+        self.assertEqual(set(JournalDocument.__table__.indexes), declared)
+
+    def test_ensure_indexes_creates_missing(self):
+        declared = set(JournalDocument.__table__.indexes)
+        self.mock_session.execute.return_value.scalars.return_value = [
+            "logseq_journal_journal_date_idx"
+        ]
+
+        self.corpus_manager.ensure_indexes()
+
+        self.assertEqual(
+            self._executed_sql()[1:],
+            [
+                (
+                    "CREATE INDEX IF NOT EXISTS logseq_journal_metadata_path_gin_idx ON logseq_journal "
+                    "USING gin (document_metadata jsonb_path_ops)"
+                ),
+                (
+                    "CREATE INDEX IF NOT EXISTS logseq_journal_embedding_bits_hnsw_idx ON logseq_journal "
+                    "USING hnsw (embedding_bits bit_hamming_ops) WITH (m = 16, ef_construction = 64)"
+                ),
+            ],
+        )
+        self.mock_session.commit.assert_called_once()
+        self.assertEqual(set(JournalDocument.__table__.indexes), declared)
+
+    def test_rebuild_bits_index_only(self):
+        config = JournalCorpusManagerConfig(
+            embedding_provider=self.mock_embedding_provider,
+            vector_index=VectorIndexConfig(columns=("embedding_bits",)),
+        )
+        JournalCorpusManager(self.mock_session, config).rebuild_vector_indexes()
+
+        sql = self._executed_sql()
+        self.assertEqual(len(sql), 5)
+        self.assertEqual(
+            sql[4],
+            "CREATE INDEX logseq_journal_embedding_bits_hnsw_idx ON logseq_journal "
+            "USING hnsw (embedding_bits bit_hamming_ops) WITH (m = 16, ef_construction = 64)",
+        )
+
+    def test_ensure_indexes_drops_unwanted_embedding_index(self):
+        self.mock_session.execute.return_value.scalars.return_value = [
+            "logseq_journal_journal_date_idx",
+            "logseq_journal_metadata_path_gin_idx",
+            "logseq_journal_embedding_hnsw_idx",
+            "logseq_journal_embedding_bits_hnsw_idx",
+        ]
+        config = JournalCorpusManagerConfig(
+            embedding_provider=self.mock_embedding_provider,
+            vector_index=VectorIndexConfig(columns=("embedding_bits",)),
+        )
+
+        JournalCorpusManager(self.mock_session, config).ensure_indexes()
+
+        self.assertEqual(
+            self._executed_sql()[1:],
+            ["DROP INDEX IF EXISTS logseq_journal_embedding_hnsw_idx"],
+        )
+
+    def test_ensure_indexes_keeps_bits_index_of_other_method(self):
+        self.mock_session.execute.return_value.scalars.return_value = [
+            "logseq_journal_journal_date_idx",
+            "logseq_journal_metadata_path_gin_idx",
+            "logseq_journal_embedding_bits_ivfflat_idx",
+        ]
+
+        self.corpus_manager.ensure_indexes()
+
+        self.assertEqual(self.mock_session.execute.call_count, 1)
+        self.mock_session.commit.assert_not_called()
+
+    def test_insert_corpora_without_vector_indexes(self):
+        self.mock_session.query.return_value.filter.return_value.all.return_value = []
+
+        with self.corpus_manager.without_vector_indexes():
+            self.corpus_manager.insert_corpora(self.corpora)
+
+        sql = self._executed_sql()
+        self.assertTrue(sql[0].startswith("DROP INDEX"))
+        self.assertTrue(sql[4].startswith("INSERT INTO logseq_journal"))
+        self.assertTrue(sql[-1].startswith("CREATE INDEX"))
+
+    def test_vector_indexes_rebuilt_after_failed_insert(self):
+        self.mock_session.query.return_value.filter.return_value.all.return_value = []
+        self.mock_session.execute.side_effect = self.fail_insert
+
+        with (
+            self.assertRaises(RuntimeError),
+            self.corpus_manager.without_vector_indexes(),
+        ):
+            self.corpus_manager.insert_corpora(self.corpora)
+
+        self.assertTrue(self._executed_sql()[-1].startswith("CREATE INDEX"))
+
+    @staticmethod
+    def fail_insert(statement, *args) -> None:
+        if str(statement).startswith("INSERT"):
+            raise RuntimeError("insert failed")
+
+    def test_backfill_journal_dates(self):
+        self.mock_session.execute.return_value.rowcount = 3
+
+        self.assertEqual(self.corpus_manager.backfill_journal_dates(), 3)
+
+        (statement,), _ = self.mock_session.execute.call_args
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        self.assertIn(
+            "SET journal_date=CAST(logseq_journal.document_metadata ->> %(document_metadata_1)s::TEXT AS DATE)",
+            sql,
+        )
+        self.assertIn("WHERE logseq_journal.journal_date IS NULL", sql)
+        self.mock_session.commit.assert_called_once()
+
+    def test_backfill_tags(self):
+        rows = self.mock_session.query.return_value.filter.return_value.limit
+        rows.return_value.all.side_effect = [
+            [
+                (1, "#garden tomatoes", {"date_str": "2025-07-07"}),
+                (2, "[[Cookout]]", {"date_str": "2025-07-08"}),
+            ],
+            [],
+        ]
+
+        self.assertEqual(self.corpus_manager.backfill_tags(batch_size=2), 2)
+
+        rows.assert_called_with(2)
+        (statement, values), _ = self.mock_session.execute.call_args
+        self.assertIn(
+            "UPDATE logseq_journal",
+            str(statement.compile(dialect=postgresql.dialect())),
+        )
+        self.assertEqual(
+            values,
+            [
+                {
+                    "id": 1,
+                    "document_metadata": {
+                        "date_str": "2025-07-07",
+                        "references": ["garden"],
+                        "tags": ["garden"],
+                        "schema_version": "2026-10-16",
+                    },
+                },
+                {
+                    "id": 2,
+                    "document_metadata": {
+                        "date_str": "2025-07-08",
+                        "references": ["Cookout"],
+                        "tags": [],
+                        "schema_version": "2026-10-16",
+                    },
+                },
+            ],
+        )
+        self.mock_session.commit.assert_called_once()
+        (condition,), _ = self.mock_session.query.return_value.filter.call_args
+        self.assertIn(
+            "NOT (logseq_journal.document_metadata ?",
+            str(condition.compile(dialect=postgresql.dialect())),
+        )
+
+    def test_insert_corpora_rejects_invalid_commit_every(self):
+        with self.assertRaises(ValueError):
+            self.corpus_manager.insert_corpora(self.corpora, commit_every=0)
+
+
+class TestJournalCorpusManagerShards(unittest.TestCase):
+    def test_plan_shards_balances_bytes(self):
+        sizes = [
+            (date(2025, 1, day), size)
+            for day, size in [(1, 90), (2, 10), (3, 10), (4, 10), (5, 60), (6, 30)]
+        ]
+
+        shards = JournalCorpusManager.plan_shards(
+            sizes, 3, date(2024, 12, 1), date(2025, 1, 31)
+        )
+
+        # by day count, shards would hold 100, 20 & 90 bytes
+        self.assertEqual([shard.bytes for shard in shards], [90, 90, 30])
+        self.assertEqual(
+            [(shard.start_date, shard.end_date, shard.journals) for shard in shards],
+            [
+                ("2024-12-01", "2025-01-01", 1),
+                ("2025-01-02", "2025-01-05", 4),
+                ("2025-01-06", "2025-01-31", 1),
+            ],
+        )
+
+    def test_plan_shards_fewer_journals_than_shards(self):
+        sizes = [(date(2025, 1, 1), 10), (date(2025, 1, 10), 10)]
+
+        shards = JournalCorpusManager.plan_shards(
+            sizes, 8, date(2025, 1, 1), date(2025, 1, 31)
+        )
+
+        self.assertEqual(
+            [(shard.start_date, shard.end_date) for shard in shards],
+            [("2025-01-01", "2025-01-09"), ("2025-01-10", "2025-01-31")],
+        )
+        self.assertEqual(
+            JournalCorpusManager.plan_shards(
+                [], 8, date(2025, 1, 1), date(2025, 1, 31)
+            ),
+            [],
+        )
+
+    def test_run_shards_aggregates_results_and_errors(self):
+        shards = [
+            JournalShard("2025-01-01", "2025-01-31", journals=31, bytes=100),
+            JournalShard("2025-02-01", "2025-02-28", journals=28, bytes=200),
+            JournalShard("2025-03-01", "2025-03-31", journals=31, bytes=300),
+        ]
+
+        result = JournalCorpusManager.run_shards(shards, upload_test_shard, processes=2)
+
+        self.assertEqual((result.corpora, result.rows), (59, 500))
+        self.assertEqual(set(result.results), set(shards[1:]))
+        self.assertEqual(
+            result.errors, {shards[0]: "RuntimeError: embedding quota exceeded"}
+        )
+
+    def test_run_shards_rejects_overlapping_shards(self):
+        shards = [
+            JournalShard("2025-01-01", "2025-01-31", journals=31, bytes=100),
+            JournalShard("2025-01-31", "2025-02-28", journals=28, bytes=200),
+        ]
+        with self.assertRaises(ValueError):
+            JournalCorpusManager.run_shards(shards, upload_test_shard, processes=2)
+
 
 class TestJournalCorpusManagerE2E(unittest.TestCase):
     def setUp(self):
@@ -249,6 +919,11 @@ class TestJournalCorpusManagerE2E(unittest.TestCase):
             [0.3] * 1024,
             [0.4] * 1024,
         ]
+        self.mock_embedding_provider.get_embedding_config.return_value = {
+            "model": "test-model"
+        }
+        # no chunks stored yet
+        self.mock_session.query.return_value.options.return_value.filter.return_value.order_by.return_value.all.return_value = []
 
         config = JournalCorpusManagerConfig(
             embedding_provider=self.mock_embedding_provider
@@ -273,8 +948,9 @@ class TestJournalCorpusManagerE2E(unittest.TestCase):
             self.journal_content, corpus_metadata
         )
 
-        # Should return number of documents inserted
-        self.assertEqual(result, 4)
+        # Should report the number of documents embedded & inserted
+        self.assertEqual((result.embedded, result.reused, result.total), (4, 0, 4))
+        self.assertFalse(result.skipped)
 
         # Verify embedding provider was called with correct chunks
         self.mock_embedding_provider.embed_batch.assert_called_once()
@@ -283,7 +959,7 @@ class TestJournalCorpusManagerE2E(unittest.TestCase):
 
         # Verify session operations
         self.mock_session.add_all.assert_called_once()
-        self.mock_session.commit.assert_called_once()
+        self.mock_session.commit.assert_called()
 
         # Check that documents were created with correct structure
         added_docs = self.mock_session.add_all.call_args[0][0]
@@ -293,6 +969,50 @@ class TestJournalCorpusManagerE2E(unittest.TestCase):
         first_doc = added_docs[0]
         self.assertIn("cooked", first_doc.content)
         self.assertEqual(first_doc.chunk_index, 0)
+        self.assertEqual(first_doc.embedding_bits, "1" * 1024)
+        self.assertEqual(first_doc.journal_date, date(2025, 7, 9))
+
+    def test_insert_corpus_reuses_unchanged_chunk_embeddings(self):
+        """Test that re-inserting an edited day only embeds new chunks, even if they shift chunk_index."""
+        corpus_metadata = {"date_str": "2025-07-09"}
+        chunks = self.corpus_manager._split_corpus(self.journal_content)
+        embedding_config = self.mock_embedding_provider.get_embedding_config()
+        # every stored chunk is reusable, by content hash
+        stored_vectors = {
+            JournalDocument.compute_content_hash(chunk, embedding_config): [float(i)]
+            * 1024
+            for i, chunk in enumerate(chunks)
+        }
+        self.mock_embedding_provider.embed_batch.return_value = [[0.9] * 1024]
+
+        edited_content = "- a new first bullet\n" + self.journal_content
+        with (
+            patch.object(
+                self.corpus_manager,
+                "_load_existing_chunks",
+                return_value=[Mock(is_deleted=False)],
+            ),
+            patch.object(
+                self.corpus_manager,
+                "_load_reusable_vectors",
+                side_effect=lambda corpus_id, hashes: {
+                    h: v for h, v in stored_vectors.items() if h in hashes
+                },
+            ),
+        ):
+            result = self.corpus_manager.insert_corpus(
+                edited_content, corpus_metadata, corpus_id="2025-07-09"
+            )
+
+        self.assertEqual((result.embedded, result.reused, result.total), (1, 4, 5))
+        self.mock_embedding_provider.embed_batch.assert_called_once_with(
+            ["a new first bullet"]
+        )
+        added_docs = self.mock_session.add_all.call_args[0][0]
+        self.assertEqual([doc.chunk_index for doc in added_docs], list(range(5)))
+        self.assertEqual(added_docs[0].embedding, [0.9] * 1024)
+        # the previous first chunk moved to chunk_index 1, and kept its vector
+        self.assertEqual(added_docs[1].embedding, [0.0] * 1024)
 
     # def test_get_full_corpus_e2e(self):
     #     """Test corpus reconstruction from chunks"""
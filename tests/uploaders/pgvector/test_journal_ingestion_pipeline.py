@@ -0,0 +1,176 @@
+import threading
+import time
+import unittest
+from contextlib import contextmanager
+from unittest.mock import MagicMock, Mock
+
+from pgvector_template.core.embedder import BaseEmbeddingProvider
+
+from logseq_retriever.uploaders.pgvector.journal_corpus_manager import (
+    JournalCorpus,
+    JournalCorpusManager,
+    JournalCorpusManagerConfig,
+)
+from logseq_retriever.uploaders.pgvector.journal_ingestion_pipeline import (
+    JournalIngestionPipeline,
+    JournalIngestionPipelineConfig,
+)
+
+
+class TestJournalIngestionPipeline(unittest.TestCase):
+    def setUp(self):
+        self.mock_session = MagicMock()
+        self.mock_embedding_provider = Mock(spec=BaseEmbeddingProvider)
+        self.mock_embedding_provider.get_embedding_config.return_value = {
+            "model": "test-model"
+        }
+        self.mock_embedding_provider.embed_batch.side_effect = lambda texts: [
+            [float(len(text))] * 3 for text in texts
+        ]
+        self.corpus_manager = JournalCorpusManager(
+            self.mock_session,
+            JournalCorpusManagerConfig(embedding_provider=self.mock_embedding_provider),
+        )
+        self.corpora = [
+            JournalCorpus(
+                f"- day {day}\n- second {day}", {"date_str": f"2025-07-{day:02d}"}
+            )
+            for day in range(1, 21)
+        ]
+
+    def _inserted_rows(self, session: MagicMock) -> list[dict]:
+        return [row for call in session.execute.call_args_list for row in call.args[1]]
+
+    def test_run_writes_every_corpus(self):
+        pipeline = JournalIngestionPipeline(
+            self.corpus_manager,
+            JournalIngestionPipelineConfig(
+                split_workers=2, embed_workers=3, embed_batch_size=5, queue_size=2
+            ),
+        )
+
+        result = pipeline.run(
+            iter(self.corpora + [JournalCorpus("", {"date_str": "2025-07-21"})])
+        )
+
+        self.assertEqual((result.corpora, result.rows, result.embedded), (21, 40, 40))
+        rows = self._inserted_rows(self.mock_session)
+        self.assertEqual(
+            sorted((row["corpus_id"], row["chunk_index"]) for row in rows),
+            sorted((f"2025-07-{day:02d}", i) for day in range(1, 21) for i in range(2)),
+        )
+        self.assertTrue(all(row["embedding"] for row in rows))
+        # batches of >= 5 chunks hold whole corpora: 3 corpora (6 chunks) each, then the remainder
+        batch_sizes = sorted(
+            len(call.args[0])
+            for call in self.mock_embedding_provider.embed_batch.call_args_list
+        )
+        self.assertEqual(batch_sizes, [4] + [6] * 6)
+
+    def test_run_reuses_stored_vectors(self):
+        first_chunk = self.corpus_manager._prepare_corpus(self.corpora[0])[0]
+        self.mock_session.query.return_value.filter.return_value.all.return_value = [
+            (first_chunk.content_hash, [9.0] * 3)
+        ]
+
+        result = JournalIngestionPipeline(self.corpus_manager).run(self.corpora)
+
+        self.assertEqual((result.rows, result.embedded, result.reused), (40, 39, 1))
+        embedded_texts = [
+            text
+            for call in self.mock_embedding_provider.embed_batch.call_args_list
+            for text in call.args[0]
+        ]
+        self.assertNotIn("day 1", embedded_texts)
+        (reused_row,) = [
+            row
+            for row in self._inserted_rows(self.mock_session)
+            if row["content_hash"] == first_chunk.content_hash
+        ]
+        self.assertEqual(reused_row["embedding"], [9.0] * 3)
+
+    def test_run_bounds_items_in_flight(self):
+        """A slow writer blocks upstream stages instead of letting work pile up."""
+        embedded_ahead = []
+        written = [0]
+
+        def embed_batch(texts):
+            embedded_ahead.append(
+                self.mock_embedding_provider.embed_batch.call_count - written[0]
+            )
+            return [[1.0] * 3 for _ in texts]
+
+        def slow_execute(*args, **kwargs):
+            time.sleep(0.01)
+            written[0] += 1
+
+        self.mock_embedding_provider.embed_batch.side_effect = embed_batch
+        self.mock_session.execute.side_effect = slow_execute
+        pipeline = JournalIngestionPipeline(
+            self.corpus_manager,
+            JournalIngestionPipelineConfig(embed_batch_size=1, queue_size=1),
+        )
+
+        pipeline.run(self.corpora)
+
+        # at most: 1 being written, 1 queued for writing, 1 being embedded, + 1 of slack
+        self.assertLessEqual(max(embedded_ahead), 4)
+
+    def test_run_raises_first_error_and_stops(self):
+        self.mock_embedding_provider.embed_batch.side_effect = RuntimeError("throttled")
+        pipeline = JournalIngestionPipeline(
+            self.corpus_manager,
+            JournalIngestionPipelineConfig(embed_batch_size=1, queue_size=1),
+        )
+
+        with self.assertRaisesRegex(RuntimeError, "throttled"):
+            pipeline.run(self.corpora)
+        self.mock_session.execute.assert_not_called()
+
+    def test_workers_use_own_sessions(self):
+        sessions = []
+        lock = threading.Lock()
+
+        @contextmanager
+        def session_factory():
+            session = MagicMock()
+            with lock:
+                sessions.append(session)
+            yield session
+
+        pipeline = JournalIngestionPipeline(
+            self.corpus_manager,
+            JournalIngestionPipelineConfig(write_workers=3, embed_batch_size=2),
+            session_factory=session_factory,
+        )
+
+        result = pipeline.run(self.corpora)
+
+        # 2 embed workers, for stored-vector lookups, & 3 write workers
+        self.assertEqual(len(sessions), 5)
+        self.assertEqual(result.rows, 40)
+        self.assertEqual(sum(len(self._inserted_rows(s)) for s in sessions), 40)
+        self.mock_session.execute.assert_not_called()
+
+    def test_run_reports_committed_corpora(self):
+        committed = []
+        lock = threading.Lock()
+
+        def on_commit(corpus_ids):
+            with lock:
+                committed.extend(corpus_ids)
+
+        corpora = self.corpora + [JournalCorpus("", {"date_str": "2025-07-21"})]
+        JournalIngestionPipeline(self.corpus_manager).run(corpora, on_commit=on_commit)
+
+        self.assertEqual(sorted(committed), [c.corpus_id for c in corpora])
+
+    def test_write_workers_require_session_factory(self):
+        with self.assertRaises(ValueError):
+            JournalIngestionPipeline(
+                self.corpus_manager, JournalIngestionPipelineConfig(write_workers=2)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, Mock
+
+from pgvector_template.core.embedder import BaseEmbeddingProvider
+
+from logseq_retriever.uploaders.pgvector.cached_embedding_provider import (
+    CachedEmbeddingProvider,
+)
+from logseq_retriever.uploaders.pgvector.journal_corpus_manager import (
+    JournalCorpus,
+    JournalCorpusManager,
+    JournalCorpusManagerConfig,
+)
+from logseq_retriever.uploaders.pgvector.upload_checkpoint import UploadCheckpoint
+
+
+def make_provider() -> Mock:
+    provider = Mock(spec=BaseEmbeddingProvider)
+    provider.model_id = "test-model"
+    provider.get_embedding_config.return_value = {"model": "test-model"}
+    provider.get_dimensions.return_value = 3
+    provider.embed_batch.side_effect = lambda texts: [
+        [float(len(text))] * 3 for text in texts
+    ]
+    return provider
+
+
+class TestUploadCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "checkpoint.sqlite")
+        self.corpora = [
+            JournalCorpus(f"- day {day}", {"date_str": f"2025-07-{day:02d}"})
+            for day in range(1, 5)
+        ]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_resume_skips_completed_corpora(self):
+        checkpoint = UploadCheckpoint(self.path)
+        pending = checkpoint.pending(self.corpora)
+        next(pending), next(pending)
+        checkpoint.mark_complete(["2025-07-01", "2025-07-02"])
+        checkpoint.close()
+
+        resumed = UploadCheckpoint(self.path)
+        remaining = [c.corpus_id for c in resumed.pending(self.corpora)]
+
+        self.assertEqual(remaining, ["2025-07-03", "2025-07-04"])
+        self.assertEqual(resumed.skipped, 2)
+        self.assertEqual(resumed.completed_count, 2)
+
+    def test_resume_redoes_changed_corpora(self):
+        checkpoint = UploadCheckpoint(self.path)
+        list(checkpoint.pending(self.corpora))
+        checkpoint.mark_complete(c.corpus_id for c in self.corpora)
+
+        self.corpora[1] = JournalCorpus("- edited", {"date_str": "2025-07-02"})
+        remaining = [c.corpus_id for c in checkpoint.pending(self.corpora)]
+
+        self.assertEqual(remaining, ["2025-07-02"])
+
+    def test_resume_redoes_corpora_hashed_with_other_settings(self):
+        checkpoint = UploadCheckpoint(self.path)
+        list(checkpoint.pending(self.corpora))
+        checkpoint.mark_complete(c.corpus_id for c in self.corpora)
+
+        remaining = checkpoint.pending(
+            self.corpora,
+            lambda content: JournalCorpusManager.hash_corpus(content, "int8"),
+        )
+
+        self.assertEqual(len(list(remaining)), 4)
+
+    def test_mark_complete_ignores_unknown_corpora(self):
+        checkpoint = UploadCheckpoint(self.path)
+        checkpoint.mark_complete(["2025-07-01"])
+        self.assertEqual(checkpoint.completed_count, 0)
+
+    def test_reset(self):
+        checkpoint = UploadCheckpoint(self.path)
+        list(checkpoint.pending(self.corpora))
+        checkpoint.mark_complete(["2025-07-01"])
+        checkpoint.reset()
+        self.assertEqual(len(list(checkpoint.pending(self.corpora))), 4)
+
+    def test_embeddings_persist_across_runs(self):
+        checkpoint = UploadCheckpoint(self.path)
+        checkpoint.embedding_provider(make_provider()).embed_batch(["a", "bb"])
+
+        provider = make_provider()
+        cached = UploadCheckpoint(self.path).embedding_provider(provider)
+        self.assertEqual(cached.embed_batch(["bb"]), [[2.0] * 3])
+        provider.embed_batch.assert_not_called()
+
+    def test_embedding_provider_keeps_existing_cache(self):
+        cached = CachedEmbeddingProvider(make_provider(), self.path)
+        self.assertIs(UploadCheckpoint(self.path).embedding_provider(cached), cached)
+
+    def test_resume_after_failed_bulk_insert(self):
+        """Corpora committed before a failure are skipped on resume, and nothing is embedded twice."""
+        provider = make_provider()
+        checkpoint = UploadCheckpoint(self.path)
+        session = MagicMock()
+        session.query.return_value.filter.return_value.all.return_value = []
+        session.execute.side_effect = [None, ConnectionError("server closed")]
+        manager = JournalCorpusManager(
+            session,
+            JournalCorpusManagerConfig(
+                embedding_provider=checkpoint.embedding_provider(provider)
+            ),
+        )
+        with self.assertRaises(ConnectionError):
+            manager.insert_corpora(
+                checkpoint.pending(self.corpora),
+                commit_every=2,
+                on_commit=checkpoint.mark_complete,
+            )
+        self.assertEqual(provider.embed_batch.call_count, 2)
+
+        provider = make_provider()
+        checkpoint = UploadCheckpoint(self.path)
+        session = MagicMock()
+        session.query.return_value.filter.return_value.all.return_value = []
+        manager = JournalCorpusManager(
+            session,
+            JournalCorpusManagerConfig(
+                embedding_provider=checkpoint.embedding_provider(provider)
+            ),
+        )
+        result = manager.insert_corpora(
+            checkpoint.pending(self.corpora),
+            commit_every=2,
+            on_commit=checkpoint.mark_complete,
+        )
+
+        self.assertEqual((result.corpora, checkpoint.skipped), (2, 2))
+        # the failed batch was embedded before the failure, so its vectors are reused
+        provider.embed_batch.assert_not_called()
+        self.assertEqual(checkpoint.completed_count, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()